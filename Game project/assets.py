@@ -0,0 +1,119 @@
+import pygame
+from collections import OrderedDict
+from typing import Optional, Tuple
+from atlas import texture_atlas
+from bake import baked_store, cover_geometry
+
+# 默认缓存上限（字节），超过后按最近最少使用淘汰
+DEFAULT_CACHE_BYTES = 64 * 1024 * 1024
+
+
+# 图片缓存类，整个进程共用一份
+class SurfaceCache:
+    """按 (路径, 目标尺寸, 透明模式, 缩放方式) 缓存解码并缩放好的图片，LRU 淘汰并限制总字节数"""
+
+    def __init__(self, max_bytes: int = DEFAULT_CACHE_BYTES):
+        self.max_bytes = max_bytes
+        self.total_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()  # key -> (surface, 字节数)
+
+    # 获取图片，size 为 None 时返回原始尺寸
+    def get(self, path: str, size: Optional[Tuple[int, int]] = None, alpha: bool = True, smooth: bool = True) -> pygame.Surface:
+        """返回缓存的图片；调用方共享同一个 Surface，不能直接修改它（需要修改请先 copy）"""
+        if size is not None:
+            size = (int(size[0]), int(size[1]))
+        # 原始尺寸的图片与缩放方式无关
+        key = (path, size, alpha, smooth if size is not None else None)
+        entry = self._entries.get(key)
+        if entry is not None:
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+        self.misses += 1
+        if size is None:
+            surface = self._decode(path, alpha)
+        else:
+            # 优先使用预烘焙好的同尺寸像素，省去解码和缩放
+            surface = baked_store.get(path, size, alpha, "smooth" if smooth else "fast")
+            if surface is not None:
+                self._store(key, surface)
+                return surface
+            original = self.get(path, None, alpha)
+            if original.get_size() == size:
+                return original
+            if smooth:
+                surface = pygame.transform.smoothscale(original, size)
+            else:
+                surface = pygame.transform.scale(original, size)
+        self._store(key, surface)
+        return surface
+
+    # 原始图片尺寸（图集中的图片可能已被缩小，按原始尺寸计算比例才能与直接读文件一致）
+    def original_size(self, path: str, alpha: bool = True) -> Tuple[int, int]:
+        return texture_atlas.original_size(path) or self.get(path, None, alpha).get_size()
+
+    # 按原始比例缩放到不超过 max_size 的尺寸
+    def fit(self, path: str, max_size: Tuple[int, int], alpha: bool = True, smooth: bool = True) -> pygame.Surface:
+        """按原始比例缩放图像，使其适应最大尺寸"""
+        original_width, original_height = self.original_size(path, alpha)
+        ratio = min(max_size[0] / original_width, max_size[1] / original_height)
+        return self.get(path, (int(original_width * ratio), int(original_height * ratio)), alpha, smooth)
+
+    # 按比例放大铺满目标区域并居中裁剪（用于背景图）
+    def cover(self, path: str, size: Tuple[int, int], alpha: bool = False) -> pygame.Surface:
+        key = (path, tuple(size), alpha, "cover")
+        entry = self._entries.get(key)
+        if entry is not None:
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+        self.misses += 1
+        surface = baked_store.get(path, size, alpha, "cover")
+        if surface is None:
+            # 原图和放大后的中间结果只在这里用一次，不放进缓存
+            original = self._decode(path, alpha)
+            scaled_size, offset = cover_geometry(original.get_size(), size)
+            scaled = pygame.transform.scale(original, scaled_size)
+            surface = scaled.subsurface((*offset, *size)).copy()
+        self._store(key, surface)
+        return surface
+
+    # 移除某个文件的所有缓存（所有尺寸）
+    def evict(self, path: str):
+        for key in [key for key in self._entries if key[0] == path]:
+            _, size_bytes = self._entries.pop(key)
+            self.total_bytes -= size_bytes
+
+    # 清空缓存
+    def clear(self):
+        self._entries.clear()
+        self.total_bytes = 0
+
+    # 解码图片：优先从图集取子图，否则读取单独的文件
+    def _decode(self, path: str, alpha: bool) -> pygame.Surface:
+        if alpha:
+            surface = texture_atlas.get(path)
+            if surface is not None:
+                return surface
+        surface = pygame.image.load(path)
+        # 没有设置显示模式时（例如无窗口运行）无法 convert，直接使用解码结果
+        if pygame.display.get_surface() is None:
+            return surface
+        return surface.convert_alpha() if alpha else surface.convert()
+
+    # 存入缓存并按字节上限淘汰最久未使用的条目
+    def _store(self, key, surface: pygame.Surface):
+        size_bytes = surface.get_width() * surface.get_height() * surface.get_bytesize()
+        self._entries[key] = (surface, size_bytes)
+        self.total_bytes += size_bytes
+        while self.total_bytes > self.max_bytes and len(self._entries) > 1:
+            _, (_, evicted_bytes) = self._entries.popitem(last=False)
+            self.total_bytes -= evicted_bytes
+
+
+# 全局图片缓存
+surface_cache = SurfaceCache()
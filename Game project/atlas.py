@@ -0,0 +1,204 @@
+import pygame
+import argparse
+import json
+import os
+import sys
+from typing import Dict, List, Optional, Tuple
+
+# 定义 resource_path 函数
+def resource_path(relative_path):
+    try:
+        base_path = sys._MEIPASS
+    except AttributeError:
+        base_path = os.path.abspath(".")
+    return os.path.join(base_path, relative_path)
+
+# 图集相关路径与参数
+IMAGE_ROOT = "resource/image"
+ATLAS_DIR = "resource/atlas"
+ATLAS_INDEX = "atlas.json"
+ATLAS_SOURCE_DIRS = ["skins", "icons", "item", "obstacle", "platform"]  # 打包进图集的目录（背景图不打包）
+ATLAS_VERSION = 1
+MAX_SHEET_SIZE = 2048   # 单张图集最大边长
+MAX_IMAGE_SIZE = 512    # 单张图片打包时的最大边长，超过则等比缩小（皮肤、图标、道具和障碍物在游戏内都画得比这小）
+UNCAPPED_DIRS = ["platform"]    # 不缩小的目录：平台图会被拉伸到整个平台的大小（最宽 800 像素）
+PADDING = 1
+
+
+# 将资源路径转换为图集索引中的名称，例如 "skins/default_idle.png"
+def atlas_name(path: str) -> Optional[str]:
+    image_root = os.path.abspath(resource_path(IMAGE_ROOT))
+    relative = os.path.relpath(os.path.abspath(path), image_root)
+    if relative.startswith(".."):
+        return None
+    return relative.replace(os.sep, "/")
+
+
+# 运行时图集类：一张图集只解码一次，按名称返回子图
+class TextureAtlas:
+    def __init__(self, atlas_dir: str = ATLAS_DIR):
+        self.atlas_dir = resource_path(atlas_dir)
+        self._index = None      # 名称 -> (图集编号, x, y, w, h, 原始宽, 原始高)
+        self._sheet_files = []
+        self._sheets = {}       # 图集编号 -> 解码后的 Surface
+        self._built_at = 0
+
+    # 延迟读取索引，索引不存在时图集不可用
+    def _load_index(self):
+        if self._index is not None:
+            return
+        self._index = {}
+        index_path = os.path.join(self.atlas_dir, ATLAS_INDEX)
+        try:
+            with open(index_path, "r", encoding="utf-8") as file:
+                data = json.load(file)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return
+        if data.get("v") != ATLAS_VERSION:
+            return
+        self._sheet_files = data["sheets"]
+        self._index = {name: tuple(entry) for name, entry in data["images"].items()}
+        self._built_at = os.path.getmtime(index_path)
+
+    # 查找图片在图集中的记录，源文件比图集新时视为过期
+    def lookup(self, path: str) -> Optional[Tuple[int, ...]]:
+        self._load_index()
+        if not self._index:
+            return None
+        name = atlas_name(path)
+        entry = self._index.get(name) if name else None
+        if entry is None:
+            return None
+        try:
+            if os.path.getmtime(path) > self._built_at:
+                return None
+        except OSError:
+            pass
+        return entry
+
+    # 原始图片尺寸（图集中可能已缩小）
+    def original_size(self, path: str) -> Optional[Tuple[int, int]]:
+        entry = self.lookup(path)
+        return (entry[5], entry[6]) if entry else None
+
+    # 返回图集中的子图，不在图集中时返回 None
+    def get(self, path: str) -> Optional[pygame.Surface]:
+        entry = self.lookup(path)
+        if entry is None:
+            return None
+        sheet_index, x, y, w, h = entry[:5]
+        sheet = self._sheets.get(sheet_index)
+        if sheet is None:
+            try:
+                sheet = pygame.image.load(os.path.join(self.atlas_dir, self._sheet_files[sheet_index]))
+            except (FileNotFoundError, pygame.error):
+                return None
+            if pygame.display.get_surface() is not None:
+                sheet = sheet.convert_alpha()
+            self._sheets[sheet_index] = sheet
+        return sheet.subsurface((x, y, w, h))
+
+    # 释放已解码的图集
+    def unload(self):
+        self._sheets.clear()
+
+
+# 收集需要打包的图片
+def collect_sources() -> List[str]:
+    sources = []
+    for directory in ATLAS_SOURCE_DIRS:
+        folder = resource_path(os.path.join(IMAGE_ROOT, directory))
+        if not os.path.isdir(folder):
+            continue
+        for file_name in sorted(os.listdir(folder)):
+            if file_name.lower().endswith(".png"):
+                sources.append(os.path.join(folder, file_name))
+    return sources
+
+
+# 读取图片并统一为 RGBA，过大的图片等比缩小（max_image_size 为 None 时保持原尺寸）
+def _prepare_image(path: str, max_image_size: Optional[int]) -> Tuple[pygame.Surface, Tuple[int, int]]:
+    image = pygame.image.load(path)
+    original_size = image.get_size()
+    image = pygame.image.frombytes(pygame.image.tobytes(image, "RGBA"), original_size, "RGBA")
+    if max_image_size is None:
+        return image, original_size
+    ratio = min(1.0, max_image_size / max(original_size))
+    if ratio < 1.0:
+        image = pygame.transform.smoothscale(image, (max(1, int(original_size[0] * ratio)), max(1, int(original_size[1] * ratio))))
+    return image, original_size
+
+
+# 货架式装箱：按高度从大到小逐行摆放，放不下时开新图集
+def pack(sizes: Dict[str, Tuple[int, int]], max_sheet_size: int = MAX_SHEET_SIZE, padding: int = PADDING):
+    placements = {}
+    sheet_sizes = []
+    sheet, shelf_x, shelf_y, shelf_height, used_width = 0, 0, 0, 0, 0
+    for name in sorted(sizes, key=lambda n: (-sizes[n][1], -sizes[n][0], n)):
+        w, h = sizes[name]
+        if shelf_x + w > max_sheet_size:
+            shelf_x, shelf_y, shelf_height = 0, shelf_y + shelf_height + padding, 0
+        if shelf_y + h > max_sheet_size:
+            sheet_sizes.append((used_width, shelf_y))
+            sheet, shelf_x, shelf_y, shelf_height, used_width = sheet + 1, 0, 0, 0, 0
+        placements[name] = (sheet, shelf_x, shelf_y)
+        shelf_x += w + padding
+        shelf_height = max(shelf_height, h)
+        used_width = max(used_width, shelf_x - padding)
+    sheet_sizes.append((used_width, shelf_y + shelf_height))
+    return placements, sheet_sizes
+
+
+# 构建图集：输出若干 PNG 图集和一个 JSON 索引
+def build_atlas(output_dir: str = ATLAS_DIR, max_sheet_size: int = MAX_SHEET_SIZE, max_image_size: int = MAX_IMAGE_SIZE):
+    images = {}
+    original_sizes = {}
+    for path in collect_sources():
+        name = atlas_name(path)
+        uncapped = name.split("/", 1)[0] in UNCAPPED_DIRS
+        image, original_size = _prepare_image(path, None if uncapped else max_image_size)
+        images[name] = image
+        original_sizes[name] = original_size
+
+    placements, sheet_sizes = pack({name: image.get_size() for name, image in images.items()}, max_sheet_size)
+
+    output_dir = resource_path(output_dir)
+    os.makedirs(output_dir, exist_ok=True)
+    sheets = [pygame.Surface(size, pygame.SRCALPHA) for size in sheet_sizes]
+    for sheet in sheets:
+        sheet.fill((0, 0, 0, 0))
+    index = {}
+    for name, image in images.items():
+        sheet_index, x, y = placements[name]
+        # 用 BLEND_RGBA_MAX 原样拷贝像素（包括透明度），避免与透明底色混合
+        sheets[sheet_index].blit(image, (x, y), special_flags=pygame.BLEND_RGBA_MAX)
+        index[name] = [sheet_index, x, y, image.get_width(), image.get_height(), *original_sizes[name]]
+
+    sheet_files = []
+    for i, sheet in enumerate(sheets):
+        file_name = f"atlas_{i}.png"
+        pygame.image.save(sheet, os.path.join(output_dir, file_name))
+        sheet_files.append(file_name)
+
+    with open(os.path.join(output_dir, ATLAS_INDEX), "w", encoding="utf-8") as file:
+        json.dump({"v": ATLAS_VERSION, "sheets": sheet_files, "images": index}, file, separators=(",", ":"))
+
+    print(f"已打包 {len(index)} 张图片到 {len(sheet_files)} 张图集: {output_dir}")
+
+
+# 全局图集
+texture_atlas = TextureAtlas()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="图集打包工具")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    build_parser = subparsers.add_parser("build", help="把图标、道具、障碍物、平台和皮肤图片打包成图集")
+    build_parser.add_argument("--output", default=ATLAS_DIR, help="输出目录")
+    build_parser.add_argument("--max-sheet-size", type=int, default=MAX_SHEET_SIZE, help="单张图集最大边长")
+    build_parser.add_argument("--max-image-size", type=int, default=MAX_IMAGE_SIZE, help="单张图片最大边长")
+    args = parser.parse_args()
+
+    if args.command == "build":
+        pygame.init()
+        build_atlas(args.output, args.max_sheet_size, args.max_image_size)
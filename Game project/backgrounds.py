@@ -0,0 +1,36 @@
+import pygame
+from typing import Iterable, Optional
+from assets import surface_cache
+from category import SCREEN_WIDTH, SCREEN_HEIGHT
+
+
+# 背景图服务：按比例缩放并居中裁剪成屏幕大小，结果直接可用于 blit
+class BackgroundService:
+    """缩放结果由 surface_cache 缓存，这里只记住加载失败的路径，避免每帧重复尝试"""
+
+    def __init__(self):
+        self._failed = set()
+
+    # 获取背景图，加载失败返回 None
+    def get(self, path: str) -> Optional[pygame.Surface]:
+        if path in self._failed:
+            return None
+        try:
+            return surface_cache.cover(path, (SCREEN_WIDTH, SCREEN_HEIGHT))
+        except (pygame.error, FileNotFoundError) as e:
+            print(f"加载背景图失败: {e}")
+            self._failed.add(path)
+            return None
+
+    # 提前加载背景图，之后切换界面时不再有解码开销
+    def warm(self, paths: Iterable[str]):
+        for path in paths:
+            self.get(path)
+
+    # 清空加载失败记录，之后会重新尝试加载
+    def clear(self):
+        self._failed.clear()
+
+
+# 全局背景图服务
+backgrounds = BackgroundService()
@@ -0,0 +1,268 @@
+import pygame
+import argparse
+import hashlib
+import json
+import mmap
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional, Tuple
+
+# 定义 resource_path 函数
+def resource_path(relative_path):
+    try:
+        base_path = sys._MEIPASS
+    except AttributeError:
+        base_path = os.path.abspath(".")
+    return os.path.join(base_path, relative_path)
+
+# 预烘焙输出路径与参数
+BAKED_DIR = "resource/baked"
+MANIFEST_FILE = "manifest.json"
+BLOB_FILE = "pixels.bin"
+BAKED_VERSION = 1
+RESOURCE_ROOT = "resource"
+
+# 游戏里实际使用的尺寸
+SCREEN_SIZE = (800, 600)
+PLAYER_HEIGHT = 50
+SKIN_PREVIEW_SIZE = (100, 100)
+SKILL_ICON_SIZE = (50, 50)
+ITEM_BOX = (40, 40)
+COIN_SIZE = (15, 15)
+GOAL_SIZE = (40, 40)
+
+
+# 生成烘焙条目的键：资源名@宽x高:像素格式:缩放方式
+def baked_key(name: str, size: Tuple[int, int], alpha: bool, mode: str) -> str:
+    return f"{name}@{size[0]}x{size[1]}:{'rgba' if alpha else 'rgb'}:{mode}"
+
+
+# 将资源路径转换为清单中的名称，例如 "image/icons/coin.png"
+def resource_name(path: str) -> Optional[str]:
+    root = os.path.abspath(resource_path(RESOURCE_ROOT))
+    relative = os.path.relpath(os.path.abspath(path), root)
+    if relative.startswith(".."):
+        return None
+    return relative.replace(os.sep, "/")
+
+
+# 计算铺满屏幕（居中裁剪）时的缩放尺寸和裁剪偏移，与游戏内背景算法一致
+def cover_geometry(source_size: Tuple[int, int], target_size: Tuple[int, int]):
+    bg_ratio = source_size[0] / source_size[1]
+    screen_ratio = target_size[0] / target_size[1]
+    if bg_ratio > screen_ratio:
+        new_height = target_size[1]
+        new_width = int(new_height * bg_ratio)
+    else:
+        new_width = target_size[0]
+        new_height = int(new_width / bg_ratio)
+    x_offset = (new_width - target_size[0]) // 2
+    y_offset = (new_height - target_size[1]) // 2
+    return (new_width, new_height), (x_offset, y_offset)
+
+
+# 运行时读取烘焙结果：像素数据通过 mmap 映射，不再经过图片解码
+class BakedStore:
+    def __init__(self, baked_dir: str = BAKED_DIR):
+        self.baked_dir = resource_path(baked_dir)
+        self._entries = None    # 键 -> (偏移, 宽, 高, 源文件名)
+        self._sources = {}      # 源文件名 -> 烘焙时的大小、修改时间和哈希
+        self._valid = {}        # 源文件名 -> 是否与当前文件一致
+        self._blob = None
+        self._blob_file = None
+
+    # 延迟打开清单和像素文件，不存在时烘焙数据不可用
+    def _open(self):
+        if self._entries is not None:
+            return
+        self._entries = {}
+        try:
+            with open(os.path.join(self.baked_dir, MANIFEST_FILE), "r", encoding="utf-8") as file:
+                manifest = json.load(file)
+            if manifest.get("v") != BAKED_VERSION:
+                return
+            self._blob_file = open(os.path.join(self.baked_dir, manifest["blob"]), "rb")
+            self._blob = mmap.mmap(self._blob_file.fileno(), 0, access=mmap.ACCESS_READ)
+        except (OSError, ValueError, KeyError):
+            return
+        self._sources = manifest["sources"]
+        self._entries = {key: tuple(entry) for key, entry in manifest["entries"].items()}
+
+    # 大小和修改时间都与清单一致时直接认为有效，否则按内容哈希判断源文件是否变化
+    def _is_fresh(self, name: str) -> bool:
+        valid = self._valid.get(name)
+        if valid is None:
+            source = self._sources.get(name)
+            path = resource_path(os.path.join(RESOURCE_ROOT, name))
+            try:
+                stat = os.stat(path)
+                if source is None:
+                    valid = False
+                elif stat.st_size == source.get("size") and stat.st_mtime == source.get("mtime"):
+                    valid = True
+                else:
+                    valid = _source_info(path)["sha1"] == source.get("sha1")
+            except OSError:
+                valid = False
+            self._valid[name] = valid
+        return valid
+
+    # 按路径和目标尺寸查找烘焙好的图片，找不到返回 None
+    def get(self, path: str, size: Tuple[int, int], alpha: bool, mode: str) -> Optional[pygame.Surface]:
+        self._open()
+        if not self._entries:
+            return None
+        name = resource_name(path)
+        entry = self._entries.get(baked_key(name, size, alpha, mode)) if name else None
+        if entry is None or not self._is_fresh(entry[3]):
+            return None
+        offset, width, height = entry[:3]
+        pixel_format = "RGBA" if alpha else "RGB"
+        length = width * height * len(pixel_format)
+        surface = pygame.image.frombuffer(memoryview(self._blob)[offset:offset + length], (width, height), pixel_format)
+        # 转换成显示格式（同时复制出 mmap），之后绘制更快
+        if pygame.display.get_surface() is not None:
+            return surface.convert_alpha() if alpha else surface.convert()
+        return surface.copy()
+
+
+# 收集需要烘焙的任务：(源文件, 操作, 目标尺寸参数, 是否带透明度, 缩放方式)
+def collect_jobs() -> List[tuple]:
+    from category import Player, Item, Obstacle, Coin
+
+    jobs = []
+    background_dir = resource_path("resource/image/background")
+    for file_name in sorted(os.listdir(background_dir)):
+        if file_name.lower().endswith(".webp"):
+            jobs.append((os.path.join(background_dir, file_name), "cover", SCREEN_SIZE, False, "cover"))
+
+    skin_paths = []
+    for skin_data in Player.SKIN_PATHS.values():
+        for paths in (skin_data["idle"], skin_data["move"]):
+            skin_paths.extend(paths if isinstance(paths, list) else [paths])
+    for path in skin_paths:
+        jobs.append((path, "height", PLAYER_HEIGHT, True, "fast"))
+        jobs.append((path, "size", SKIN_PREVIEW_SIZE, True, "fast"))
+    for skin_data in Player.SKIN_PATHS.values():
+        if "skill" in skin_data:
+            jobs.append((skin_data["skill"]["icon"], "size", SKILL_ICON_SIZE, True, "fast"))
+
+    for path in list(Item.ITEM_TYPES.values()) + list(Obstacle.OBSTACLE_TYPES.values()):
+        jobs.append((path, "fit", ITEM_BOX, True, "smooth"))
+    jobs.append((Coin.COIN_ICON_PATH, "size", COIN_SIZE, True, "smooth"))
+    jobs.append((resource_path("resource/image/icons/goal.png"), "size", GOAL_SIZE, True, "smooth"))
+    return [job for job in jobs if os.path.exists(job[0])]
+
+
+# 在子进程中解码并缩放一张图片，返回 (键, 宽, 高, 像素数据)
+def bake_image(job: tuple):
+    path, operation, target, alpha, mode = job
+    image = pygame.image.load(path)
+    width, height = image.get_size()
+    if operation == "cover":
+        scaled_size, offset = cover_geometry((width, height), target)
+        image = pygame.transform.scale(image, scaled_size).subsurface((*offset, *target))
+    else:
+        if operation == "height":
+            size = (int(target * (width / height if height else 1)), target)
+        elif operation == "fit":
+            ratio = min(target[0] / width, target[1] / height)
+            size = (int(width * ratio), int(height * ratio))
+        else:
+            size = target
+        if mode == "smooth":
+            if image.get_bitsize() < 24:
+                image = pygame.image.frombytes(pygame.image.tobytes(image, "RGBA"), (width, height), "RGBA")
+            image = pygame.transform.smoothscale(image, size)
+        else:
+            image = pygame.transform.scale(image, size)
+    size = image.get_size()
+    return baked_key(resource_name(path), size, alpha, mode), size, pygame.image.tobytes(image, "RGBA" if alpha else "RGB")
+
+
+# 计算源文件的大小、修改时间和哈希
+def _source_info(path: str) -> Dict:
+    with open(path, "rb") as file:
+        digest = hashlib.sha1(file.read()).hexdigest()
+    stat = os.stat(path)
+    return {"size": stat.st_size, "mtime": stat.st_mtime, "sha1": digest}
+
+
+# 任务标识：同一源文件、同一操作参数的任务在源文件内容不变时可以直接复用上次的结果
+def job_id(job: tuple) -> str:
+    path, operation, target, alpha, mode = job
+    return f"{resource_name(path)}|{operation}|{target}|{int(alpha)}|{mode}"
+
+
+# 读取上一次烘焙的结果
+def _load_previous(baked_dir: str):
+    try:
+        with open(os.path.join(baked_dir, MANIFEST_FILE), "r", encoding="utf-8") as file:
+            manifest = json.load(file)
+        with open(os.path.join(baked_dir, manifest["blob"]), "rb") as file:
+            blob = file.read()
+    except (OSError, ValueError, KeyError):
+        return None, b""
+    if manifest.get("v") != BAKED_VERSION:
+        return None, b""
+    return manifest, blob
+
+
+# 烘焙所有图片：进程池并行解码缩放，结果写入一个像素文件和一个清单
+def bake_all(output_dir: str = BAKED_DIR, workers: Optional[int] = None, force: bool = False):
+    output_dir = resource_path(output_dir)
+    os.makedirs(output_dir, exist_ok=True)
+    jobs = collect_jobs()
+
+    sources = {}
+    for path in sorted({job[0] for job in jobs}):
+        sources[resource_name(path)] = _source_info(path)
+
+    previous, previous_blob = (None, b"") if force else _load_previous(output_dir)
+    results = {}    # 任务标识 -> (键, 尺寸, 像素数据)
+    pending = []
+    for job in jobs:
+        name = resource_name(job[0])
+        if previous and previous["sources"].get(name, {}).get("sha1") == sources[name]["sha1"]:
+            key = previous["jobs"].get(job_id(job))
+            if key in previous["entries"]:
+                offset, width, height = previous["entries"][key][:3]
+                length = width * height * (4 if job[3] else 3)
+                results[job_id(job)] = (key, (width, height), previous_blob[offset:offset + length])
+                continue
+        pending.append(job)
+    reused = len(results)
+
+    if pending:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            for job, result in zip(pending, executor.map(bake_image, pending)):
+                results[job_id(job)] = result
+
+    entries = {}
+    offset = 0
+    with open(os.path.join(output_dir, BLOB_FILE), "wb") as blob:
+        for key, size, pixels in sorted(set(results.values())):
+            blob.write(pixels)
+            entries[key] = [offset, size[0], size[1], key.split("@", 1)[0]]
+            offset += len(pixels)
+    job_keys = {identifier: result[0] for identifier, result in results.items()}
+
+    with open(os.path.join(output_dir, MANIFEST_FILE), "w", encoding="utf-8") as file:
+        json.dump({"v": BAKED_VERSION, "blob": BLOB_FILE, "sources": sources, "jobs": job_keys, "entries": entries},
+                  file, ensure_ascii=False, indent=1)
+
+    print(f"烘焙完成: {len(entries)} 张图片（新处理 {len(pending)}，复用 {reused}），共 {offset / 1024 / 1024:.1f} MB")
+
+
+# 全局烘焙数据
+baked_store = BakedStore()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="图片预烘焙工具：把图片解码缩放成游戏使用的尺寸并保存为原始像素")
+    parser.add_argument("--output", default=BAKED_DIR, help="输出目录")
+    parser.add_argument("--workers", type=int, default=None, help="进程数，默认等于 CPU 核心数")
+    parser.add_argument("--force", action="store_true", help="忽略上一次的结果，全部重新烘焙")
+    args = parser.parse_args()
+    bake_all(args.output, args.workers, args.force)
@@ -0,0 +1,88 @@
+import os
+import argparse
+import random
+import time
+
+# 无窗口运行
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+import pygame
+from category import Player, Obstacle, SCREEN_WIDTH, SCREEN_HEIGHT
+from level import Level
+from simulation import World, bitmask_of
+from hazards import HazardField, np
+
+FRAME_BUDGET_MS = 1000 / 60
+DEFAULT_COUNTS = [4, 32, 100, 1000]
+MOVE_PATTERNS = [None, "horizontal", "vertical"]
+
+
+# 随机摆放 count 个障碍物（固定随机种子，每次运行布局相同），use_numpy 决定使用数组还是列表
+def make_field(count: int, use_numpy: bool, seed: int = 0) -> HazardField:
+    rng = random.Random(seed)
+    types = list(Obstacle.OBSTACLE_TYPES)
+    field = HazardField(use_numpy)
+    for _ in range(count):
+        obstacle = Obstacle(rng.randrange(0, SCREEN_WIDTH - Obstacle.MAX_WIDTH), rng.randrange(0, SCREEN_HEIGHT - Obstacle.MAX_HEIGHT),
+                            rng.choice(types), rng.choice(MOVE_PATTERNS))
+        field.add(obstacle.rect, obstacle.obstacle_type, bitmask_of(obstacle.mask), obstacle.move_pattern,
+                  obstacle.move_speed, obstacle.move_distance)
+    field.pack(min_hazards=0)
+    return field
+
+
+# 单项计时的 (平均, P99) 微秒
+def _summary(timings):
+    timings = sorted(timings)
+    return sum(timings) / len(timings) * 1e6, timings[max(0, int(len(timings) * 0.99) - 1)] * 1e6
+
+
+# 危险物基准：在 World 中放入 count 个障碍物，让玩家扫过整个屏幕，
+# 分别统计每步的移动（HazardField.step）、矩形粗筛（overlapping）和完整检测（World._check_hazards）的耗时
+def run_benchmark(level_num: int, counts, steps: int, skin: str):
+    pygame.init()
+    pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
+    level = Level(level_num)
+    positions = [(x, y) for y in range(0, SCREEN_HEIGHT, 10) for x in range(0, SCREEN_WIDTH, 10)]
+    paths = [("列表", False)] + ([("NumPy", True)] if np is not None else [])
+    print(f"皮肤 {skin}，每种配置 {steps} 步，帧预算 {FRAME_BUDGET_MS:.1f} ms")
+    print(f"{'障碍物':>6} {'实现':>6} {'移动':>10} {'粗筛':>10} {'移动+粗筛':>12} {'完整检测 (P99)':>20} {'占帧预算':>10}")
+    for count in counts:
+        for name, use_numpy in paths:
+            world = World.from_level(level, Player(level.player_start_x, level.player_start_y, skin))
+            world.hazards = make_field(count, use_numpy)
+            hazards = world.hazards
+            box = world.player.box
+            move, broadphase, check = [], [], []
+            for step in range(steps):
+                box.x, box.y = positions[step % len(positions)]
+                world.player.facing_right = step % 2 == 0
+
+                start = time.perf_counter()
+                hazards.step()
+                moved = time.perf_counter()
+                hazards.overlapping(box.x, box.y, box.w, box.h)
+                filtered = time.perf_counter()
+                world._check_hazards()
+                checked = time.perf_counter()
+
+                move.append(moved - start)
+                broadphase.append(filtered - moved)
+                check.append(checked - filtered)
+                world.outcome = None
+            move_us = _summary(move)[0]
+            broadphase_us = _summary(broadphase)[0]
+            check_us, check_p99 = _summary(check)
+            budget = (move_us + check_us) / 1000 / FRAME_BUDGET_MS * 100
+            print(f"{count:>9} {name:>8} {move_us:>9.1f}µs {broadphase_us:>9.1f}µs {move_us + broadphase_us:>13.1f}µs "
+                  f"{check_us:>12.1f}µs ({check_p99:.1f}) {budget:>11.3f}%")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="危险物移动与碰撞检测基准（列表与 NumPy 两种实现）")
+    parser.add_argument("--level", type=int, default=9, help="提供平台和玩家的关卡编号")
+    parser.add_argument("--counts", type=int, nargs="+", default=DEFAULT_COUNTS, help="障碍物数量")
+    parser.add_argument("--steps", type=int, default=5000, help="每种配置模拟的步数")
+    parser.add_argument("--skin", default="default", help="玩家皮肤")
+    args = parser.parse_args()
+    run_benchmark(args.level, args.counts, args.steps, args.skin)
@@ -3,6 +3,9 @@ import json
 import os
 import sys
 from typing import List, Dict, Tuple, Optional
+from assets import surface_cache
+from skins import SkinLibrary
+from simulation import SIM_HZ
 
 # 定义 resource_path 函数
 def resource_path(relative_path):
@@ -15,6 +18,8 @@ def resource_path(relative_path):
 # 游戏常量
 SCREEN_WIDTH = 800
 SCREEN_HEIGHT = 600
+FPS = 60
+MAX_FRAME_TIME = 0.25   # 单帧最多补算的时间（秒）
 WHITE = (255, 255, 255)
 BLACK = (0, 0, 0)
 RED = (255, 0, 0)
@@ -22,7 +27,7 @@ GREEN = (0, 255, 0)
 BLUE = (0, 0, 255)
 YELLOW = (255, 255, 0)
 
-# 玩家类，在此处设置皮肤路径
+# 玩家类，在此处设置皮肤路径；物理、道具和碰撞规则都在模拟核心 World 中，玩家精灵只负责绘制，由 sync 同步状态
 class Player(pygame.sprite.Sprite):
     # 皮肤数据
     SKIN_PATHS = {
@@ -47,7 +52,19 @@ class Player(pygame.sprite.Sprite):
         },
         "皮肤3": {
             "idle": resource_path("resource/image/skins/skin_3_idle.png"),
-            "move": resource_path("resource/image/skins/skin_3_move.png")  # 修改为单个图片路径
+            "move": resource_path("resource/image/skins/skin_3_move.png"),  # 修改为单个图片路径
+            # 主动技能：图标、技能动画帧，持续和冷却的步数，以及技能期间不受伤害的障碍物（不受耄耋伤害）
+            "skill": {
+                "icon": resource_path("resource/image/skins/skin_3_jineng.png"),
+                "frames": [
+                    resource_path("resource/image/skins/skin_3_move_1.png"),
+                    resource_path("resource/image/skins/skin_3_move_2.png"),
+                    resource_path("resource/image/skins/skin_3_move_3.png"),
+                ],
+                "duration": 300,            # 技能持续步数（5 秒）
+                "cooldown": 1200,           # 从释放到可以再次释放的步数（20 秒）
+                "immune": ["obstacle_1"],
+            },
         },
     }
 
@@ -56,8 +73,8 @@ class Player(pygame.sprite.Sprite):
         super().__init__()
         self.height = 50                # 预设高度
         self.speed = 4                  # 默认速度
-        self.speed_up_timer = 0         # 加速计时器
         self.skin_name = skin_name
+        self.skill = self.SKIN_PATHS.get(skin_name, {}).get("skill")  # 主动技能配置，没有时为 None
         self.facing_right = True
         self.move_frame = 0             # 移动帧索引
         self.move_animation_speed = 10  # 移动动画速度
@@ -69,11 +86,12 @@ class Player(pygame.sprite.Sprite):
         self.has_card = False
 
         # 尝试加载皮肤图片
-        self.idle_image, self.move_images, self.width = self._load_skin(skin_name)
-        self.image = self.idle_image
+        self.frames = skin_library.load(skin_name, self.height)
+        self.width = self.frames.width
+        self.image = self.frames.idle.images[True][False]
 
         self.rect = self.image.get_rect()
-        self.mask = pygame.mask.from_surface(self.image)    #遮罩
+        self.mask = self.frames.idle.masks[True]    #遮罩，随当前帧更新
         self.rect.x = x
         self.rect.y = y
         self.vel_x = 0
@@ -82,214 +100,27 @@ class Player(pygame.sprite.Sprite):
         self.gravity = 0.68
         self.on_ground = False
 
-    # 加载皮肤
-    def _load_skin(self, skin_name):
-        """加载皮肤并按原始比例调整尺寸"""
-        skin_data = self.SKIN_PATHS.get(skin_name, self.SKIN_PATHS["default"])
-
-        # 加载静止图片
-        try:
-            idle_image = pygame.image.load(skin_data["idle"]).convert_alpha()
-        except:
-            try:
-                default_idle = pygame.image.load(self.SKIN_PATHS["default"]["idle"]).convert_alpha()
-                original_width, original_height = default_idle.get_size()
-                if original_height == 0:  # 防止除零错误
-                    ratio = 1
-                else:
-                    ratio = original_width / original_height
-                new_width = int(self.height * ratio)
-                idle_image = pygame.Surface((new_width, self.height))
-                idle_image.fill((255, 100, 100))  # 默认颜色
-            except:
-                idle_image = pygame.Surface((30, self.height))
-                idle_image.fill((255, 100, 100))  # 默认颜色
-
-        # 加载移动图片
-        move_images = []
-        try:
-            # 检查移动资源是单个路径还是路径列表
-            if isinstance(skin_data["move"], list):
-                # 处理路径列表
-                for path in skin_data["move"]:
-                    try:
-                        move_image = pygame.image.load(path).convert_alpha()
-                        original_width, original_height = move_image.get_size()
-                        if original_height == 0:
-                            ratio = 1
-                        else:
-                            ratio = original_width / original_height
-                        new_width = int(self.height * ratio)
-                        scaled_move_image = pygame.transform.scale(move_image, (new_width, self.height))
-                        move_images.append(scaled_move_image)
-                    except Exception as e:
-                        print(f"加载移动动画帧失败: {e}")
-                        # 如果加载失败，创建一个默认帧
-                        default_frame = pygame.Surface((30, self.height))
-                        default_frame.fill((255, 100, 100))
-                        move_images.append(default_frame)
-            else:
-                # 处理单个路径
-                move_image = pygame.image.load(skin_data["move"]).convert_alpha()
-                original_width, original_height = move_image.get_size()
-                if original_height == 0:
-                    ratio = 1
-                else:
-                    ratio = original_width / original_height
-                new_width = int(self.height * ratio)
-                scaled_move_image = pygame.transform.scale(move_image, (new_width, self.height))
-                move_images.append(scaled_move_image)
-        except Exception as e:
-            print(f"加载移动图片失败: {e}")
-            # 如果加载失败，创建一个默认帧
-            default_frame = pygame.Surface((30, self.height))
-            default_frame.fill((255, 100, 100))
-            move_images.append(default_frame)
-
-        # 获取原始图像宽高比
-        original_width, original_height = idle_image.get_size()
-        if original_height == 0:  # 防止除零错误
-            ratio = 1
-        else:
-            ratio = original_width / original_height
-
-        # 根据比例和预设高度计算新宽度
-        new_width = int(self.height * ratio)
-
-        # 缩放静止图像
-        idle_image = pygame.transform.scale(idle_image, (new_width, self.height))
-
-        return idle_image, move_images, new_width
-
-    # 更新玩家状态
-    def update(self, platforms: pygame.sprite.Group, coins: pygame.sprite.Group):
-        # 处理冻结计时器
-        if self.freeze_timer > 0:
-            self.freeze_timer -= 1
-            if self.freeze_timer == 0:
-                self.freeze_duration = 0  # 重置冻结总时长        
-
-        # 只有在非冻结状态下才处理移动
-        if self.freeze_timer <= 0:
-            # 应用重力
-            self.vel_y += self.gravity
-            if self.vel_y > 20:  # 限制最大下落速度
-                self.vel_y = 20
-
-            # 移动并检测平台碰撞
-            self.rect.x += self.vel_x
-            self.check_collision(self.vel_x, 0, platforms)
-
-            self.rect.y += self.vel_y
-            self.on_ground = False
-            self.check_collision(0, self.vel_y, platforms)
-
-        # 检测金币碰撞
-        pygame.sprite.spritecollide(self, coins, True)
-
-        # 处理加速计时器
-        if self.speed_up_timer > 0:
-            self.speed_up_timer -= 1
-            if self.speed_up_timer == 0:
-                self.speed = 4  # 恢复默认速度
-
-        # 处理无敌计时器
-        if self.invincible_timer > 0:
-            self.invincible_timer -= 1
-            if self.invincible_timer == 0:
-                self.invincible = False  # 取消无敌状态
-
-        # 更新动画
-        self.update_animation()
-
-    # 更新动画
-    def update_animation(self):
-        if self.vel_x != 0:
-            # 移动状态
-            if len(self.move_images) > 1:
-                # 有多个移动帧，播放动画
-                self.move_frame = (self.move_frame + 1) % (len(self.move_images) * self.move_animation_speed)
-                frame_index = self.move_frame // self.move_animation_speed
-                self.image = self.move_images[frame_index]
-            else:
-                # 只有一个移动帧，显示移动图片
-                self.image = self.move_images[0]
-
-            if not self.facing_right:
-                self.image = pygame.transform.flip(self.image, True, False)
-        else:
-            # 静止状态
-            self.image = self.idle_image
-            if not self.facing_right:
-                self.image = pygame.transform.flip(self.image, True, False)
-
-        # 无敌特效展示：闪烁
-        if self.invincible and self.invincible_timer % 10 < 5:
-            self.image.set_alpha(128)
-        else:
-            self.image.set_alpha(255)
-
-    # 检测与平台的碰撞
-    def check_collision(self, vel_x: int, vel_y: int, platforms: pygame.sprite.Group):
-        for platform in platforms:
-            if self.rect.colliderect(platform.rect):
-                if vel_x > 0:  # 向右移动
-                    self.rect.right = platform.rect.left
-                    self.vel_x = 0
-                if vel_x < 0:  # 向左移动
-                    self.rect.left = platform.rect.right
-                    self.vel_x = 0
-                if vel_y > 0:  # 向下移动
-                    self.rect.bottom = platform.rect.top
-                    self.vel_y = 0
-                    self.on_ground = True
-                if vel_y < 0:  # 向上移动
-                    self.rect.top = platform.rect.bottom
-                    self.vel_y = 0
-
-    # 执行跳跃
-    def jump(self):
-        if self.on_ground:
-            self.vel_y = self.jump_strength
-            if self.skin_name== "皮肤1":
-                sound2 = pygame.mixer.Sound(resource_path("resource/sound/manbo.mp3"))
-                sound2.play()
-
-    # 向左移动
-    def move_left(self):
-        self.vel_x = -self.speed
-        self.facing_right = False
-
-    # 向右移动
-    def move_right(self):
-        self.vel_x = self.speed
-        self.facing_right = True
-
-    # 停止水平移动
-    def stop(self):
-        self.vel_x = 0
-
-    # 应用道具
-    def apply_item_effect(self, item):
-        if item.item_type == "speed_up":
-            self.speed = 8  # 加速
-            self.speed_up_timer = 300  # 5 秒（60 帧/秒）
-            item.kill()
-        elif item.item_type == "invincible":
-            self.invincible = True
-            self.invincible_timer = 300  # 5 秒（60 帧/秒）
-            item.kill()
-        elif item.item_type == "kunge":
-            kunge_sound = pygame.mixer.Sound(resource_path("resource/sound/ji.mp3"))
-            kunge_sound.play()
-            item.kill()
-        elif item.item_type == "canteen":  
-            self.freeze_timer = 300  # 5秒 (60帧/秒)
-            self.freeze_duration = 300
-            item.kill()
-        elif item.item_type == "card":  # 新增校卡效果
-            self.has_card = True
-            item.kill()
+    # 按模拟核心中的玩家记录更新位置、状态和当前帧（游戏界面由模拟核心驱动）
+    def sync(self, state):
+        self.rect.topleft = (state.box.x, state.box.y)
+        self.vel_x = state.vel_x
+        self.vel_y = state.vel_y
+        self.speed = state.speed
+        self.on_ground = state.on_ground
+        self.facing_right = state.facing_right
+        self.move_frame = state.move_frame
+        self.invincible = state.invincible
+        self.invincible_timer = state.invincible_timer
+        self.freeze_timer = state.freeze_timer
+        self.freeze_duration = state.freeze_duration
+        self.has_card = state.has_card
+        frame = self.frames.idle if state.frame_index < 0 else self.frames.move[state.frame_index]
+        blink = self.invincible and self.invincible_timer % 10 < 5
+        self.image = frame.images[self.facing_right][blink]
+        self.mask = frame.masks[self.facing_right]
+
+# 皮肤资源库（只加载选中的皮肤）
+skin_library = SkinLibrary(Player.SKIN_PATHS)
 
 # 技能动画精灵类
 class SkillAnimation(pygame.sprite.Sprite):
@@ -334,8 +165,7 @@ class Platform(pygame.sprite.Sprite):
             if platform_type:
                 icon_path = self.PLATFORM_TYPES.get(platform_type)
                 if icon_path:
-                    original_image = pygame.image.load(icon_path).convert_alpha()
-                    self.image = pygame.transform.smoothscale(original_image, (width, height))  # 设置图片尺寸
+                    self.image = surface_cache.get(icon_path, (width, height))  # 设置图片尺寸
                 else:
                     # 如果类型不存在，使用默认的简单图形
                     self.image = pygame.Surface((width, height))
@@ -362,8 +192,7 @@ class Coin(pygame.sprite.Sprite):
         super().__init__()
         try:
             # 尝试加载金币图标
-            original_image = pygame.image.load(self.COIN_ICON_PATH).convert_alpha()
-            self.image = pygame.transform.smoothscale(original_image, (15, 15))  # 设置图片尺寸15*15
+            self.image = surface_cache.get(self.COIN_ICON_PATH, (15, 15))  # 设置图片尺寸15*15
         except FileNotFoundError:
             # 如果图片不存在，绘制一个15*15的简单图形
             self.image = pygame.Surface((15, 15), pygame.SRCALPHA)
@@ -385,6 +214,9 @@ class Obstacle(pygame.sprite.Sprite):
     MAX_WIDTH = 40
     MAX_HEIGHT = 40
 
+    # 每种障碍物的遮罩只生成一次
+    MASKS = {}
+
     def __init__(self, x: int, y: int, obstacle_type: str, move_pattern=None):
         super().__init__()
         self.obstacle_type = obstacle_type
@@ -398,8 +230,7 @@ class Obstacle(pygame.sprite.Sprite):
             # 根据障碍物类型加载对应的图标
             icon_path = self.OBSTACLE_TYPES.get(obstacle_type)
             if icon_path:
-                original_image = pygame.image.load(icon_path).convert_alpha()
-                self.image = self._scale_with_aspect_ratio(original_image)
+                self.image = surface_cache.fit(icon_path, (self.MAX_WIDTH, self.MAX_HEIGHT))
             else:
                 # 如果类型不存在，使用默认的简单图形
                 self.image = self._create_default_icon()
@@ -408,47 +239,28 @@ class Obstacle(pygame.sprite.Sprite):
             self.image = self._create_default_icon()
             
         self.rect = self.image.get_rect()
-        self.mask = pygame.mask.from_surface(self.image)    #遮罩
+        self.mask = self.MASKS.get(obstacle_type)    #遮罩
+        if self.mask is None or self.mask.get_size() != self.image.get_size():
+            self.mask = pygame.mask.from_surface(self.image)
+            self.MASKS[obstacle_type] = self.mask
         self.rect.x = x
         self.rect.y = y
         self.original_x = x  # 原始x坐标
         self.original_y = y  # 原始y坐标
+        self.field = None  # 所属的障碍物数组（HazardField）
+        self.index = -1
+
+    # 绑定到障碍物数组：位置和巡逻状态由数组统一更新，精灵只读取结果
+    def bind(self, field, index: int):
+        self.field = field
+        self.index = index
 
     def update(self):
-        """更新障碍物位置（如果设置了移动模式）"""
-        if self.move_pattern == "horizontal":
-            # 水平移动
-            self.rect.x += self.move_speed * self.move_direction
-            self.move_counter += self.move_speed
-            
-            if abs(self.move_counter) >= self.move_distance:
-                self.move_direction *= -1  # 反向移动
-                self.move_counter = 0
-                
-        elif self.move_pattern == "vertical":
-            # 垂直移动
-            self.rect.y += self.move_speed * self.move_direction
-            self.move_counter += self.move_speed
-            
-            if abs(self.move_counter) >= self.move_distance:
-                self.move_direction *= -1  # 反向移动
-                self.move_counter = 0
+        """从障碍物数组中读取位置（未绑定时保持不动）"""
+        if self.field is not None:
+            self.rect.topleft = self.field.position(self.index)
 
     # 其他方法保持不变...
-    def _scale_with_aspect_ratio(self, image):
-        """按原始比例缩放图像，使其适应最大尺寸"""
-        original_width, original_height = image.get_size()
-        
-        # 计算宽高比
-        ratio = min(self.MAX_WIDTH / original_width, self.MAX_HEIGHT / original_height)
-        
-        # 根据比例计算新尺寸
-        new_width = int(original_width * ratio)
-        new_height = int(original_height * ratio)
-        
-        # 缩放图像
-        return pygame.transform.smoothscale(image, (new_width, new_height))
-
     def _create_default_icon(self):
         """创建默认图标（绿色矩形带边框）"""
         surface = pygame.Surface((self.MAX_WIDTH, self.MAX_HEIGHT), pygame.SRCALPHA)
@@ -479,8 +291,7 @@ class Item(pygame.sprite.Sprite):
             # 根据道具类型加载对应的图标
             icon_path = self.ITEM_TYPES.get(item_type)
             if icon_path:
-                original_image = pygame.image.load(icon_path).convert_alpha()
-                self.image = self._scale_with_aspect_ratio(original_image)
+                self.image = surface_cache.fit(icon_path, (self.MAX_WIDTH, self.MAX_HEIGHT))
             else:
                 # 如果类型不存在，使用默认的简单图形
                 self.image = self._create_default_icon()
@@ -493,21 +304,6 @@ class Item(pygame.sprite.Sprite):
         self.rect.y = y
         self.item_type = item_type
 
-    #按原始比例缩放图像           
-    def _scale_with_aspect_ratio(self, image):
-        """按原始比例缩放图像，使其适应最大尺寸"""
-        original_width, original_height = image.get_size()
-        
-        # 计算宽高比
-        ratio = min(self.MAX_WIDTH / original_width, self.MAX_HEIGHT / original_height)
-        
-        # 根据比例计算新尺寸
-        new_width = int(original_width * ratio)
-        new_height = int(original_height * ratio)
-        
-        # 缩放图像
-        return pygame.transform.smoothscale(image, (new_width, new_height))
-
     #创建默认图标    
     def _create_default_icon(self):
         """创建默认图标（黄色矩形带边框）"""
@@ -524,8 +320,7 @@ class Goal(pygame.sprite.Sprite):
         super().__init__()
         try:
             # 加载自定义的终点图标
-            original_image = pygame.image.load(resource_path("resource/image/icons/goal.png")).convert_alpha()
-            self.image = pygame.transform.smoothscale(original_image, (40, 40)) #设置图片尺寸40*40
+            self.image = surface_cache.get(resource_path("resource/image/icons/goal.png"), (40, 40)) #设置图片尺寸40*40
         except FileNotFoundError:
             # 如果图片不存在，绘制一个40*40的简单图形
             self.image = pygame.Surface((40, 40))
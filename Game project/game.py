@@ -1,8 +1,20 @@
 import pygame
 import os
 import sys
-from category import Player, GameState, SCREEN_WIDTH, SCREEN_HEIGHT, WHITE, BLACK, RED, GREEN, BLUE, YELLOW,SkillAnimation
+import time
+from category import Player, GameState, skin_library, SCREEN_WIDTH, SCREEN_HEIGHT, SIM_HZ, FPS, MAX_FRAME_TIME, WHITE, BLACK, RED, GREEN, BLUE, YELLOW,SkillAnimation
 from level import Level
+from assets import surface_cache
+from backgrounds import backgrounds
+from sound import sound_bank
+from music import music_player
+from replay import Recording, last_run_path
+from simulation import World, INPUT_LEFT, INPUT_RIGHT, INPUT_JUMP, INPUT_SKILL
+from render import DirtyRenderer, LAYER_PICKUPS, LAYER_HAZARDS, LAYER_PLAYER, LAYER_EFFECTS, LAYER_HUD
+from hud import GameHud, SkillHud
+from glyphs import glyph_font
+from widgets import ButtonMenu, button_column, dim_overlay, ROUNDED_STYLE
+from level_select import LevelTiles, LevelSelectView, back_button_images, gradient_background
 
 
 
@@ -19,8 +31,19 @@ def resource_path(relative_path):
     return os.path.join(base_path, relative_path)
 
 class Game:
+    # 各界面使用的背景图
+    SCREEN_BACKGROUNDS = {
+        "menu": resource_path("resource/image/background/menu.webp"),
+        "level_select": resource_path("resource/image/background/background4.webp"),
+        "skins": resource_path("resource/image/background/background1.webp"),
+        "stats": resource_path("resource/image/background/background1.webp"),
+        "pause": resource_path("resource/image/background/background9.webp"),
+        "game_over": resource_path("resource/image/background/background5.webp"),
+        "level_complete": resource_path("resource/image/background/background6.webp"),
+    }
+
     #初始化游戏类，设置游戏窗口、字体、游戏状态、设置主菜单背景图
-    def __init__(self):
+    def __init__(self, render_fps: int = FPS):
         pygame.init()
         pygame.font.init()
         self.screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
@@ -29,7 +52,13 @@ class Game:
         self.game_state = GameState()
         self.running = True
         self.current_screen = "menu"
-        self.bo=0
+        self.sim_hz = SIM_HZ            # 游戏内物理模拟频率（物理参数按每步设定，不可调）
+        self.render_fps = render_fps    # 游戏画面的帧率上限（0 为不限制）
+        self.replay = None              # 下一局要回放的录像（Recording），为 None 时读取键盘
+        self.turbo = False              # 快进模式：不等待时钟，每帧模拟一步
+        self.turbo_render = False       # 快进模式下是否绘制画面
+        self.last_world = None          # 最近一局结束时的模拟状态
+        self.dirty_rendering = True     # 游戏画面只重画有变化的区域（False 时每帧整屏重画）
         # 确保皮肤目录存在
         if not os.path.exists(resource_path("resource/image/skins")):
             os.makedirs(resource_path("resource/image/skins"))
@@ -61,30 +90,33 @@ class Game:
                 self.font = pygame.font.SysFont(None, 24)
                 self.large_font = pygame.font.SysFont(None, 48)
 
+        # 菜单按钮：三种状态的图片只画一次
+        self.menu_buttons = {
+            "menu": button_column([("开始游戏", 220, "level_select"), ("选择皮肤", 300, "skins"),
+                                   ("游戏统计", 380, "stats"), ("退出游戏", 460, "quit")],
+                                  self.font, (220, 60), SCREEN_WIDTH, ROUNDED_STYLE),
+            "pause": button_column([("继续游戏", 300, "continue"), ("重新开始", 370, "restart"), ("返回主菜单", 440, "quit")],
+                                   self.font, (200, 50), SCREEN_WIDTH),
+            "game_over": button_column([("重新开始", 350, "restart"), ("返回主菜单", 420, "menu")],
+                                       self.font, (200, 50), SCREEN_WIDTH),
+            "level_complete": button_column([("下一关", 400, "next"), ("返回主菜单", 470, "menu")],
+                                            self.font, (200, 50), SCREEN_WIDTH),
+        }
+        self.pause_frame = None         # 暂停界面的底图（背景、遮罩和标题），第一次暂停时合成
+        self.level_tiles = None         # 关卡选择界面的按钮图片，第一次进入时生成
+
+        # 游戏中的 HUD 文字用字形图集拼出，数字和常用字预先渲染，游戏中不再调用 FreeType
+        self.hud_font = glyph_font(self.font)
+
         #加载菜单背景，这里采用保持原比例，填充空白，知道怎么改图片即可
-        try:
-            # 加载原始背景图
-            original_bg = pygame.image.load(resource_path("resource/image/background/menu.webp")).convert()  #这边切换路径
-            # 计算缩放比例（保持宽高比）
-            bg_ratio = original_bg.get_width() / original_bg.get_height()
-            screen_ratio = SCREEN_WIDTH / SCREEN_HEIGHT           
-            if bg_ratio > screen_ratio:
-                # 以高度为基准缩放
-                new_height = SCREEN_HEIGHT
-                new_width = int(new_height * bg_ratio)
-            else:
-                # 以宽度为基准缩放
-                new_width = SCREEN_WIDTH
-                new_height = int(new_width / bg_ratio)                
-            # 缩放图片
-            scaled_bg = pygame.transform.scale(original_bg, (new_width, new_height))
-            # 居中裁剪
-            x_offset = (new_width - SCREEN_WIDTH) // 2
-            y_offset = (new_height - SCREEN_HEIGHT) // 2
-            self.menu_background = scaled_bg.subsurface((x_offset, y_offset, SCREEN_WIDTH, SCREEN_HEIGHT))
-        except:
+        self.menu_background = backgrounds.get(self.SCREEN_BACKGROUNDS["menu"])
+        if self.menu_background is None:
             print("背景加载失败")
-            self.menu_background = None
+        # 提前加载其余界面的背景图，切换界面和暂停时不再解码
+        backgrounds.warm(self.SCREEN_BACKGROUNDS.values())
+
+        # 预先解码音效，游戏中播放时不再读取文件
+        sound_bank.preload()
 
         # 确保保存数据的文件夹存在
         if not os.path.exists(resource_path("saves")):
@@ -93,6 +125,8 @@ class Game:
     #游戏主循环
     def run(self):
         while self.running:
+            # 切换到当前界面的背景音乐
+            music_player.play_for_screen(self.current_screen)
             if self.current_screen == "menu":
                 self.menu_screen()
             elif self.current_screen == "game":
@@ -111,272 +145,106 @@ class Game:
     #主菜单界面，显示游戏标题和选项按钮，背景图在init里设置
     def menu_screen(self):
         """主菜单界面"""
-        while self.current_screen == "menu":
-            self.screen.fill(BLACK)
+        # 背景、标题和统计文字不变，合成一张底图；按钮状态变化时才重画
+        frame = self._screen_frame(self.menu_background)
+        title_text = self.large_font.render("跑酷闯关游戏", True, WHITE)
+        frame.blit(title_text, title_text.get_rect(center=(SCREEN_WIDTH // 2, 150)))
+        stats_text = self.font.render(f"总积分: {self.game_state.total_score}   总金币: {self.game_state.total_coins}", True, WHITE)
+        frame.blit(stats_text, stats_text.get_rect(center=(SCREEN_WIDTH // 2, 550)))
+        menu = ButtonMenu(frame, self.menu_buttons["menu"])
 
-            # 绘制背景
-            if self.menu_background:
-                self.screen.blit(self.menu_background, (0, 0))
-            else:
-                self.screen.fill(BLACK)  # 如果背景图加载失败，使用黑色背景                                    
-                        
-            # 绘制标题
-            title_text = self.large_font.render("跑酷闯关游戏", True, WHITE)
-            title_rect = title_text.get_rect(center=(SCREEN_WIDTH // 2, 150))
-            self.screen.blit(title_text, title_rect)
-            
-            # 绘制按钮
-            button_width, button_height = 220, 60  # 增大按钮尺寸
-            button_radius = 12  # 圆角半径
-            buttons = [
-                {"text": "开始游戏", "y": 220, "action": "level_select"},
-                {"text": "选择皮肤", "y": 300, "action": "skins"},  # 调整按钮间距
-                {"text": "游戏统计", "y": 380, "action": "stats"},
-                {"text": "退出游戏", "y": 460, "action": "quit"}
-            ]
-
-            for button in buttons:
-                button_x = (SCREEN_WIDTH - button_width) // 2
-                button_y = button["y"]
-                rect = pygame.Rect(button_x, button_y, button_width, button_height)
-                
-                # 按钮状态检测
-                is_hovered = rect.collidepoint(pygame.mouse.get_pos())
-                is_clicked = pygame.mouse.get_pressed()[0] and is_hovered
-                
-                # 根据按钮状态选择颜色
-                if is_clicked:
-                    button_color = (40, 110, 200)  # 点击时的深蓝色
-                    text_color = (230, 230, 230)  # 点击时的文本颜色
-                    border_color = (255, 255, 255)  # 点击时的边框颜色
-                    shadow_color = (0, 0, 0, 0)  # 点击时不显示阴影
-                elif is_hovered:
-                    button_color = (70, 140, 240)  # 悬停时的亮蓝色
-                    text_color = WHITE
-                    border_color = (255, 255, 255)
-                    shadow_color = (0, 0, 0, 60)  # 悬停时的半透明阴影
+        while self.current_screen == "menu":
+            # 绘制按钮并检查点击
+            clicked = menu.update(self.screen, pygame.mouse.get_pos(), pygame.mouse.get_pressed()[0])
+            if clicked:
+                pygame.time.delay(200)  # 防止重复点击
+                if clicked.action == "quit":
+                    self.running = False
+                    self.current_screen = None
                 else:
-                    button_color = (50, 120, 220)  # 默认蓝色
-                    text_color = WHITE
-                    border_color = (220, 220, 220)
-                    shadow_color = (0, 0, 0, 40)  # 默认半透明阴影
-                
-                # 绘制按钮阴影
-                shadow_rect = pygame.Rect(button_x + 3, button_y + 3, button_width, button_height)
-                pygame.draw.rect(self.screen, shadow_color, shadow_rect, border_radius=button_radius)
-                
-                # 绘制按钮主体
-                pygame.draw.rect(self.screen, button_color, rect, border_radius=button_radius)
-                
-                # 绘制按钮边框
-                pygame.draw.rect(self.screen, border_color, rect, 2, border_radius=button_radius)
-                
-                # 绘制按钮文本
-                text = self.font.render(button["text"], True, text_color)
-                text_rect = text.get_rect(center=rect.center)
-                self.screen.blit(text, text_rect)
-                
-                # 检查点击
-                if is_clicked:
-                    pygame.time.delay(200)  # 防止重复点击
-                    if button["action"] == "quit":
-                        self.running = False
-                        self.current_screen = None
-                    else:
-                        self.current_screen = button["action"]    
+                    self.current_screen = clicked.action
 
-            # 显示总积分和金币
-            stats_text = self.font.render(f"总积分: {self.game_state.total_score}   总金币: {self.game_state.total_coins}", True, WHITE)
-            stats_rect = stats_text.get_rect(center=(SCREEN_WIDTH // 2, 550))
-            self.screen.blit(stats_text, stats_rect)
-
-            pygame.display.flip()
             self.clock.tick(60)
+            music_player.update()
 
             for event in pygame.event.get():
                 if event.type == pygame.QUIT:
                     self.running = False
                     self.current_screen = None
+                elif event.type == pygame.WINDOWEXPOSED:
+                    menu.invalidate()
+
+    # 界面底图：背景图（加载失败时为黑色）的一份拷贝，标题等不变的内容画在上面
+    def _screen_frame(self, background) -> pygame.Surface:
+        frame = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT)).convert()
+        if background:
+            frame.blit(background, (0, 0))
+        else:
+            frame.fill(BLACK)
+        return frame
 
     #关卡选择界面，显示可选的关卡和锁定状态，在这里面设置背景图
     def level_select_screen(self):
         """关卡选择界面 - 10关，每行5个，固定总背景图"""
-        level_buttons = []
-        for i in range(10):  # 10个关卡
-            level_buttons.append({
-                "hover": False,
-                "scale": 1.0
-            })
-        
-        # 加载背景图
-        background = None
-        try:
-            original_bg = pygame.image.load(resource_path("resource/image/background/background4.webp")).convert()  # 背景图
-            bg_ratio = original_bg.get_width() / original_bg.get_height()
-            screen_ratio = SCREEN_WIDTH / SCREEN_HEIGHT
-            new_width = SCREEN_WIDTH if bg_ratio <= screen_ratio else int(SCREEN_HEIGHT * bg_ratio)
-            new_height = SCREEN_HEIGHT if bg_ratio >= screen_ratio else int(SCREEN_WIDTH / bg_ratio)
-            scaled_bg = pygame.transform.scale(original_bg, (new_width, new_height))
-            x_offset = (new_width - SCREEN_WIDTH) // 2
-            y_offset = (new_height - SCREEN_HEIGHT) // 2
-            background = scaled_bg.subsurface((x_offset, y_offset, SCREEN_WIDTH, SCREEN_HEIGHT))
-        except Exception as e:
-            print(f"加载背景图失败: {e}")
-        
-        star_img = None
-        try:
-            star_img = pygame.image.load(resource_path("resource/image/icons/star.png")).convert_alpha()
-            star_img = pygame.transform.scale(star_img, (20, 20))
-        except:
-            pass
-        
-        lock_img = None
-        try:
-            lock_img = pygame.image.load(resource_path("resource/image/icons/lock.png")).convert_alpha()
-            lock_img = pygame.transform.scale(lock_img, (50, 50))
-        except:
-            pass
+        # 加载背景图（保持原比例，填充空白）
+        background = backgrounds.get(self.SCREEN_BACKGROUNDS["level_select"])
+
+        # 按钮图片（各缩放档位的底板、文字、星星和锁）在第一次进入时画好，之后复用
+        if self.level_tiles is None:
+            star_img = None
+            try:
+                star_img = surface_cache.get(resource_path("resource/image/icons/star.png"), (20, 20), smooth=False)
+            except (pygame.error, FileNotFoundError):
+                pass
+
+            lock_img = None
+            try:
+                lock_img = surface_cache.get(resource_path("resource/image/icons/lock.png"), (50, 50), smooth=False)
+            except (pygame.error, FileNotFoundError):
+                pass
+            self.level_tiles = LevelTiles(self.large_font, self.font, star_img, lock_img)
+
+        # 底图：背景（加载失败时为渐变）、标题和未解锁的关卡
+        frame = self._screen_frame(background or gradient_background())
+        title_text = self.large_font.render("选择关卡", True, WHITE)
+        title_shadow = self.large_font.render("选择关卡", True, (100, 100, 100))
+        title_rect = title_text.get_rect(center=(SCREEN_WIDTH // 2, 80))
+        frame.blit(title_shadow, (title_rect.x + 3, title_rect.y + 3))
+        frame.blit(title_text, title_rect)
+        for level in range(self.game_state.current_level + 1, 10):
+            self.level_tiles.draw_locked(frame, level)
+
+        # 星级
+        stars = {level: min(3, stats["score"] // 1000) for level, stats in self.game_state.level_stats.items()}
+        view = LevelSelectView(self.level_tiles, frame, self.game_state.current_level, stars,
+                               back_button_images(self.font, frame))
 
         while self.current_screen == "level_select":
-            self.screen.fill(BLACK)
-            # 显示固定的总背景图
-            if background:
-                self.screen.blit(background, (0, 0))
-            else:
-                # 渐变背景 fallback（保持原逻辑）
-                for y in range(SCREEN_HEIGHT):
-                    color = (0, 0, max(50, int(150 * y / SCREEN_HEIGHT)))
-                    pygame.draw.line(self.screen, color, (0, y), (SCREEN_WIDTH, y))
-            
-            # 绘制标题（保持原逻辑）
-            title_text = self.large_font.render("选择关卡", True, WHITE)
-            title_shadow = self.large_font.render("选择关卡", True, (100, 100, 100))
-            title_rect = title_text.get_rect(center=(SCREEN_WIDTH // 2, 80))
-            self.screen.blit(title_shadow, (title_rect.x + 3, title_rect.y + 3))
-            self.screen.blit(title_text, title_rect)
-            
-            # 按钮布局：每行5个，共2行（0-4第一行，5-9第二行）
-            button_size = 90
-            margin = 20
-            start_x = (SCREEN_WIDTH - (5 * button_size + 4 * margin)) // 2
-            start_y = 160
-            
-            mouse_pos = pygame.mouse.get_pos()
-            
-            for level in range(10):
-                row = level // 5  # 0: 第一行，1: 第二行
-                col = level % 5
-                x = start_x + col * (button_size + margin)
-                y = start_y + row * (button_size + margin)
-                
-                rect = pygame.Rect(x, y, button_size, button_size)
-                
-                # 更新悬停状态（移除背景索引切换逻辑）
-                if level <= self.game_state.current_level:
-                    level_buttons[level]["hover"] = rect.collidepoint(mouse_pos)
-                else:
-                    level_buttons[level]["hover"] = False
-                
-                # 平滑缩放动画（保持原逻辑）
-                target_scale = 1.1 if level_buttons[level]["hover"] else 1.0
-                level_buttons[level]["scale"] = max(1.0, min(1.1, level_buttons[level]["scale"] + (target_scale - level_buttons[level]["scale"]) * 0.1))
-                scale = level_buttons[level]["scale"]
-                scaled_size = int(button_size * scale)
-                scale_offset = (scaled_size - button_size) // 2
-                
-                if level <= self.game_state.current_level:
-                    # 已解锁关卡绘制（保持原逻辑）
-                    button_color = (50, 150, 255) if level_buttons[level]["hover"] else (30, 100, 200)
-                    border_color = (200, 200, 0) if level == self.game_state.current_level else (200, 200, 200)
-                    
-                    button_surf = pygame.Surface((scaled_size, scaled_size), pygame.SRCALPHA)
-                    pygame.draw.rect(button_surf, (*button_color, 200), (0, 0, scaled_size, scaled_size), border_radius=15)
-                    pygame.draw.rect(button_surf, border_color, (0, 0, scaled_size, scaled_size), width=3, border_radius=15)
-                    self.screen.blit(button_surf, (x - scale_offset, y - scale_offset))
-                    
-                    # 关卡文字
-                    level_text = self.large_font.render("教程关" if level == 0 else str(level), True, WHITE)
-                    scaled_text = pygame.transform.scale(level_text, (int(level_text.get_width() * scale), int(level_text.get_height() * scale)))
-                    text_rect = scaled_text.get_rect(center=(x + button_size // 2, y + button_size // 2 - 15))
-                    self.screen.blit(scaled_text, text_rect)
-                    
-                    # 星级显示
-                    if level in self.game_state.level_stats and star_img:
-                        stars = min(3, self.game_state.level_stats[level]["score"] // 1000)
-                        for s in range(stars):
-                            star_x = x + button_size // 2 - 30 + s * 20
-                            star_y = y + button_size // 2 + 15
-                            self.screen.blit(star_img, (star_x, star_y))
-                    
-                    # 点击事件
-                    if pygame.mouse.get_pressed()[0] and rect.collidepoint(mouse_pos):
-                        pygame.time.delay(100)
-                        self.current_level = level
-                        self.current_screen = "game"
-                else:
-                    # 未解锁关卡绘制（保持原逻辑）
-                    button_surf = pygame.Surface((button_size, button_size), pygame.SRCALPHA)
-                    pygame.draw.rect(button_surf, (50, 50, 50, 200), (0, 0, button_size, button_size), border_radius=15)
-                    pygame.draw.rect(button_surf, (100, 100, 100), (0, 0, button_size, button_size), width=2, border_radius=15)
-                    self.screen.blit(button_surf, (x, y))
-                    
-                    # 锁图标
-                    if lock_img:
-                        lock_rect = lock_img.get_rect(center=(x + button_size // 2, y + button_size // 2))
-                        self.screen.blit(lock_img, lock_rect)
-                    else:
-                        lock_text = self.font.render("🔒", True, WHITE)
-                        lock_rect = lock_text.get_rect(center=(x + button_size // 2, y + button_size // 2))
-                        self.screen.blit(lock_text, lock_rect)
-                    
-                    # 解锁提示
-                    unlock_text = self.font.render(f"关卡{level + 1}", True, WHITE)
-                    unlock_rect = unlock_text.get_rect(center=(x + button_size // 2, y + button_size + 15))
-                    self.screen.blit(unlock_text, unlock_rect)
-            
-            # 返回按钮（保持原逻辑）
-            back_button = pygame.Rect(SCREEN_WIDTH // 2 - 75, SCREEN_HEIGHT - 80, 150, 50)
-            back_color = (200, 50, 50) if back_button.collidepoint(mouse_pos) else (150, 40, 40)
-            for i in range(back_button.height):
-                shade = max(0, min(255, back_color[0] + (i * 10 // back_button.height)))
-                pygame.draw.rect(self.screen, (shade, back_color[1], back_color[2]), (back_button.x, back_button.y + i, back_button.width, 1))
-            pygame.draw.rect(self.screen, (255, 255, 255), back_button, 2, border_radius=5)
-            back_text = self.font.render("返回", True, WHITE)
-            self.screen.blit(back_text, back_text.get_rect(center=back_button.center))
-            
-            if pygame.mouse.get_pressed()[0] and back_button.collidepoint(mouse_pos):
+            clicked = view.update(self.screen, pygame.mouse.get_pos(), pygame.mouse.get_pressed()[0])
+            if clicked == "back":
                 pygame.time.delay(200)
                 self.current_screen = "menu"
-            
-            pygame.display.flip()
+            elif clicked is not None:
+                pygame.time.delay(100)
+                self.current_level = clicked
+                self.current_screen = "game"
+
             self.clock.tick(60)
-            
+            music_player.update()
+
             for event in pygame.event.get():
                 if event.type == pygame.QUIT:
                     self.running = False
-                    self.current_screen = None   
+                    self.current_screen = None
+                elif event.type == pygame.WINDOWEXPOSED:
+                    view.invalidate()
 
     #皮肤选择界面，显示可用的皮肤和解锁条件，在这里面设置背景图
     def skins_screen(self):
         """皮肤选择界面"""
         
         # 加载背景图（保持原比例，填充空白）
-        try:
-            original_bg = pygame.image.load(resource_path("resource/image/background/background1.webp")).convert()
-            bg_ratio = original_bg.get_width() / original_bg.get_height()
-            screen_ratio = SCREEN_WIDTH / SCREEN_HEIGHT
-            if bg_ratio > screen_ratio:
-                new_height = SCREEN_HEIGHT
-                new_width = int(new_height * bg_ratio)
-            else:
-                new_width = SCREEN_WIDTH
-                new_height = int(new_width / bg_ratio)
-            scaled_bg = pygame.transform.scale(original_bg, (new_width, new_height))
-            x_offset = (new_width - SCREEN_WIDTH) // 2
-            y_offset = (new_height - SCREEN_HEIGHT) // 2
-            background = scaled_bg.subsurface((x_offset, y_offset, SCREEN_WIDTH, SCREEN_HEIGHT))
-        except:
-            background = None
+        background = backgrounds.get(self.SCREEN_BACKGROUNDS["skins"])
 
         # 皮肤文案解释
         skin_descriptions = {
@@ -389,25 +257,6 @@ class Game:
 
         skin_names = list(Player.SKIN_PATHS.keys())
         current_index = 0
-        
-        # 为每个皮肤创建预览图像
-        skin_previews = {}
-        for skin_name in skin_names:
-            try:
-                # 尝试加载静止图像作为预览
-                skin_data = Player.SKIN_PATHS[skin_name]
-                if isinstance(skin_data["idle"], str):
-                    preview_image = pygame.image.load(resource_path(skin_data["idle"])).convert_alpha()
-                else:
-                    preview_image = pygame.image.load(resource_path(skin_data["idle"][0])).convert_alpha()
-                skin_previews[skin_name] = preview_image
-            except:
-                # 如果加载失败，创建一个彩色矩形作为预览
-                preview_image = pygame.Surface((120, 120))
-                colors = [(255, 100, 100), (100, 255, 100), (100, 100, 255), (255, 255, 100)]
-                color_index = skin_names.index(skin_name) % len(colors)
-                preview_image.fill(colors[color_index])
-                skin_previews[skin_name] = preview_image
 
         button_width, button_height = 120, 120  # 保持按钮尺寸
         margin = 60  # 增加皮肤之间的间距
@@ -417,44 +266,11 @@ class Game:
         left_button = pygame.Rect(30, SCREEN_HEIGHT // 2 - 30, 60, 60)
         right_button = pygame.Rect(SCREEN_WIDTH - 90, SCREEN_HEIGHT // 2 - 30, 60, 60)
         
-        # 动画相关变量
-        animation_frames = {}  # 存储每个皮肤的动画帧
+        # 动画相关变量（预览帧只在皮肤显示出来时才加载）
+        preview_size = (button_width - 20, button_height - 20)
         animation_index = 0    # 当前动画帧索引
         animation_speed = 10   # 动画速度（数值越小，速度越快）
         frame_counter = 0      # 帧计数器
-        
-        # 初始化动画帧
-        for skin_name in skin_names:
-            skin_data = Player.SKIN_PATHS[skin_name]
-            frames = []
-            
-            # 检查移动资源是单张图片还是列表
-            if isinstance(skin_data["move"], list):
-                # 有多个移动帧，加载所有帧
-                for path in skin_data["move"]:
-                    try:
-                        frame = pygame.image.load(resource_path(path)).convert_alpha()
-                        frame = pygame.transform.scale(frame, (button_width - 20, button_height - 20))
-                        frames.append(frame)
-                    except:
-                        pass  # 如果加载失败，跳过该帧
-            
-            if not frames:
-                # 如果没有动画帧或加载失败，使用静止图像或默认图像
-                try:
-                    if isinstance(skin_data["idle"], str):
-                        frame = pygame.image.load(resource_path(skin_data["idle"])).convert_alpha()
-                    else:
-                        frame = pygame.image.load(resource_path(skin_data["idle"][0])).convert_alpha()
-                    frame = pygame.transform.scale(frame, (button_width - 20, button_height - 20))
-                    frames.append(frame)
-                except:
-                    # 创建默认帧
-                    frame = pygame.Surface((button_width - 20, button_height - 20))
-                    frame.fill((255, 100, 100))
-                    frames.append(frame)
-            
-            animation_frames[skin_name] = frames
 
         while self.current_screen == "skins":
             self.screen.fill(BLACK)
@@ -485,7 +301,7 @@ class Game:
             frame_counter += 1
             if frame_counter >= animation_speed:
                 frame_counter = 0
-                animation_index = (animation_index + 1) % max(len(frames) for frames in animation_frames.values())
+                animation_index += 1
 
             # 绘制当前显示的两个皮肤
             start_x = (SCREEN_WIDTH - (buttons_per_row * button_width + (buttons_per_row - 1) * margin)) // 2
@@ -505,7 +321,7 @@ class Game:
                         # 绘制皮肤图片
                         try:
                             # 使用当前动画帧
-                            frames = animation_frames[skin_name]
+                            frames = skin_library.preview_frames(skin_name, preview_size)
                             current_frame = frames[animation_index % len(frames)]
                             self.screen.blit(current_frame, (x + 10, y + 10))
                         except:
@@ -609,6 +425,7 @@ class Game:
 
             pygame.display.flip()
             self.clock.tick(60)
+            music_player.update()
 
             for event in pygame.event.get():
                 if event.type == pygame.QUIT:
@@ -624,27 +441,15 @@ class Game:
                         pygame.time.delay(200)
                         current_index += 2
 
+        # 离开皮肤界面，释放没有选中的皮肤的预览图
+        skin_library.release_previews(keep=[self.game_state.selected_skin])
+
     #游戏统计界面，显示游戏进度和成就，在这里面设置背景图
     def stats_screen(self):
         """游戏统计界面"""
         
         # 加载背景图（保持原比例，填充空白）
-        try:
-            original_bg = pygame.image.load(resource_path("resource/image/background/background1.webp")).convert()
-            bg_ratio = original_bg.get_width() / original_bg.get_height()
-            screen_ratio = SCREEN_WIDTH / SCREEN_HEIGHT
-            if bg_ratio > screen_ratio:
-                new_height = SCREEN_HEIGHT
-                new_width = int(new_height * bg_ratio)
-            else:
-                new_width = SCREEN_WIDTH
-                new_height = int(new_width / bg_ratio)
-            scaled_bg = pygame.transform.scale(original_bg, (new_width, new_height))
-            x_offset = (new_width - SCREEN_WIDTH) // 2
-            y_offset = (new_height - SCREEN_HEIGHT) // 2
-            background = scaled_bg.subsurface((x_offset, y_offset, SCREEN_WIDTH, SCREEN_HEIGHT))
-        except:
-            background = None
+        background = backgrounds.get(self.SCREEN_BACKGROUNDS["stats"])
 
         while self.current_screen == "stats":
             self.screen.fill(BLACK)
@@ -703,6 +508,7 @@ class Game:
 
             pygame.display.flip()
             self.clock.tick(60)
+            music_player.update()
 
             for event in pygame.event.get():
                 if event.type == pygame.QUIT:
@@ -719,75 +525,71 @@ class Game:
         level = Level(self.current_level)
         total_coins_in_level = len(level.coins)  # 关卡初始金币总数
 
-        # 加载关卡背景
-        level_background = level.load_background()
-
         # 创建玩家（使用选中的皮肤）
         player = Player(level.player_start_x, level.player_start_y, self.game_state.selected_skin)
 
-        # 创建精灵组
-        all_sprites = pygame.sprite.Group()
-        all_sprites.add(player)
-        all_sprites.add(level.platforms)
-        all_sprites.add(level.coins)
-        all_sprites.add(level.obstacles)
-        if hasattr(level, 'items'):
-            all_sprites.add(level.items)
-        if level.goal:
-            all_sprites.add(level.goal)
-
-        # 游戏计时器
-        start_time = pygame.time.get_ticks()
+        # 游戏逻辑由模拟核心计算，精灵只负责绘制
+        world = World.from_level(level, player)
+        self.last_world = world
+
+        # 背景、平台和终点由关卡合成一张静态图（加载时生成一次）；其余精灵按层绘制
+        renderer = DirtyRenderer(self.screen, level.static_layer())
+        static_version = level.static_version
+        renderer.add(level.coins, LAYER_PICKUPS)
+        renderer.add(level.items, LAYER_PICKUPS)
+        renderer.add(level.obstacles, LAYER_HAZARDS)
+        renderer.add(player, LAYER_PLAYER)
+
+        # HUD 文字：只有显示的值变化时才换图，没变化的帧不重画
+        # 提前放入本关会用到的字：关卡描述、技能提示，以及冻结提示用的红色字
+        self.hud_font.preload(level.level_description + "点击释放技能")
+        self.hud_font.atlas(RED)
+        hud = GameHud(self.hud_font, self.current_level, level.level_description, (SCREEN_WIDTH, SCREEN_HEIGHT))
+        renderer.add(hud.widgets(), LAYER_HUD)
+
+        # 游戏计时器：关卡时间按模拟步数计算，渲染掉帧或暂停都不会影响游戏时间
+        step_time = 1 / self.sim_hz         # 每步模拟的时长（秒）
+        accumulator = 0.0                   # 还没有模拟的时间（秒）
+        last_time = time.perf_counter()
         game_time = 0
         coins_collected = 0
+        jump_requested = False              # 按键和点击先记下来，在下一步模拟时处理
+        skill_requested = False
+
+        # 录像：记录每一步的输入；设置了 self.replay 时改为回放录像中的输入
+        recording = Recording(self.current_level, self.game_state.selected_skin, self.sim_hz)
+        playback = self.replay.inputs() if self.replay else None
+        self.replay = None
 
         # 新增玩法相关变量
-        skill_image = None
-        skill_available = True
-        skill_start_time = 0
-        skill_duration = 5000  # 技能持续时间（毫秒）
-        skill_cooldown = 20000  # 技能冷却时间（毫秒）
         skill_rect = pygame.Rect(SCREEN_WIDTH - 60, SCREEN_HEIGHT // 2 - 25, 50, 50)  # 技能图标位置
+        skill_hud = None
+        skill_frames = []
         
         # 技能动画精灵
         skill_animation = None
         
-        # 玩家原始图像备份
-        player_original_image = None
-        
-        # 加载技能资源
-        if self.game_state.selected_skin == "皮肤3":
+        # 加载技能资源（皮肤数据中配置了主动技能时）；图标的进度帧在这里一次画好
+        skill_config = player.skill
+        if skill_config:
             try:
-                # 加载技能图标
-                skill_image = pygame.image.load(resource_path("resource/image/skins/skin_3_jineng.png")).convert_alpha()
-                skill_image = pygame.transform.scale(skill_image, (50, 50))
-                
-                # 加载技能动画帧
-                skill_frames = []
-                for i in range(1, 4):
-                    img_path = resource_path(f"resource/image/skins/skin_3_move_{i}.png")
-                    img = pygame.image.load(img_path).convert_alpha()
-                    img = pygame.transform.scale(img, (player.rect.width, player.rect.height))
-                    skill_frames.append(img)
-                    
-                print(f"成功加载皮肤3技能资源: {len(skill_frames)}帧")
+                skill_image = surface_cache.get(skill_config["icon"], skill_rect.size, smooth=False)
+                skill_frames = [surface_cache.get(path, (player.rect.width, player.rect.height), smooth=False)
+                                for path in skill_config["frames"]]
+                skill_hud = SkillHud(self.hud_font, skill_image, skill_rect,
+                                     world.skill.duration, world.skill.cooldown, self.sim_hz)
+                renderer.add(skill_hud.widgets(), LAYER_HUD)
+                print(f"成功加载{self.game_state.selected_skin}技能资源: {len(skill_frames)}帧")
             except Exception as e:
-                print(f"加载皮肤3技能图片时出错: {e}")
+                print(f"加载{self.game_state.selected_skin}技能图片时出错: {e}")
                 skill_frames = []
-                skill_image = None
+                skill_hud = None
 
-        # 游戏循环
+        # 游戏循环：固定步长模拟，渲染时在上一步和当前步之间插值
         running = True
+        previous_pos = player.rect.topleft
+        render = not self.turbo or self.turbo_render
         while running:
-            # 绘制背景
-            if level_background:
-                self.screen.blit(level_background, (0, 0))
-            else:
-                self.screen.fill(BLACK)
-
-            # 计算游戏时间
-            game_time = (pygame.time.get_ticks() - start_time) / 1000
-
             # 事件处理
             for event in pygame.event.get():
                 if event.type == pygame.QUIT:
@@ -803,166 +605,132 @@ class Game:
                         elif result == "restart":
                             running = False
                             self.game_screen()
+                        # 暂停的时间不计入模拟；暂停界面覆盖了整个屏幕，下一帧整屏重画
+                        last_time = time.perf_counter()
+                        renderer.invalidate()
                     if event.key == pygame.K_SPACE:
-                        player.jump()
+                        jump_requested = True
                 if event.type == pygame.MOUSEBUTTONDOWN:
                     # 技能触发逻辑
-                    if (self.game_state.selected_skin == "皮肤3" and 
+                    if (skill_hud and 
                         skill_rect.collidepoint(event.pos) and 
-                        skill_available and 
+                        world.skill_ready and 
                         skill_frames):
-                        skill_start_time = pygame.time.get_ticks()
-                        skill_available = False
+                        skill_requested = True
+
+            # 累积这一帧经过的时间，过长时截断，避免卡顿后一次补算太多步（快进模式每帧固定一步）
+            if self.turbo:
+                accumulator += step_time
+            else:
+                now = time.perf_counter()
+                accumulator += min(now - last_time, MAX_FRAME_TIME)
+                last_time = now
+
+            while running and accumulator >= step_time:
+                accumulator -= step_time
+                previous_pos = player.rect.topleft
+
+                # 玩家输入
+                if playback is not None:
+                    inputs = next(playback, None)
+                    if inputs is None:
+                        # 录像放完了
+                        running = False
+                        self.current_screen = "menu"
+                        break
+                else:
+                    inputs = 0
+                    keys = pygame.key.get_pressed()
+                    if keys[pygame.K_LEFT]:
+                        inputs |= INPUT_LEFT
+                    elif keys[pygame.K_RIGHT]:
+                        inputs |= INPUT_RIGHT
+                    if jump_requested:
+                        inputs |= INPUT_JUMP
+                        jump_requested = False
+                    if skill_requested:
+                        inputs |= INPUT_SKILL
+                        skill_requested = False
+                recording.append(inputs)
+
+                # 推进一步模拟，再把结果同步到精灵上
+                world.step(inputs)
+                game_time = world.game_time
+                coins_collected = world.coins_collected
+                player.sync(world.player)
+                for sprite in world.removed:
+                    sprite.kill()
+
+                # 音效
+                for event in world.events:
+                    if event == "jump" and self.game_state.selected_skin == "皮肤1":
+                        sound_bank.play("manbo")
+                    elif event == "push":
+                        sound_bank.play("dayun")
+                    elif event == "item:kunge":
+                        sound_bank.play("ji")
+                    elif event == "skill":
                         print("技能已激活")
                         
-                        # 备份玩家原始图像并隐藏玩家
-                        player_original_image = player.image
+                        # 技能期间隐藏玩家，由技能动画代替
                         player.visible = False
                         
                         # 创建技能动画精灵
                         skill_animation = SkillAnimation(skill_frames, player.rect)
-                        all_sprites.add(skill_animation)
-
-            # 玩家移动控制
-            keys = pygame.key.get_pressed()
-            if keys[pygame.K_LEFT]:
-                player.move_left()
-            elif keys[pygame.K_RIGHT]:
-                player.move_right()
-            else:
-                player.stop()
-
-            # 更新玩家状态
-            player.update(level.platforms, level.coins)
-
-            # 更新已收集金币数
-            coins_collected = total_coins_in_level - len(level.coins)
-
-            # 障碍物碰撞处理
-            collided_obstacles = pygame.sprite.spritecollide(player, level.obstacles, False)
-            for obstacle in collided_obstacles:
-                if self.game_state.selected_skin == "皮肤2" and obstacle.obstacle_type == "obstacle_2":
-                    obstacle.rect.x += 50
-                    sound1 = pygame.mixer.Sound(resource_path("resource/sound/dayun.mp3"))
-                    sound1.play()
-                    if obstacle.rect.x > SCREEN_WIDTH:
-                        level.obstacles.remove(obstacle)
-                        all_sprites.remove(obstacle)
-                elif self.game_state.selected_skin=="皮肤3" and obstacle.obstacle_type=="obstacle_1" and self.bo==1:
-                    pass
-                elif not player.invincible:
+                        renderer.add(skill_animation, LAYER_EFFECTS)
+
+                # 结局
+                if world.outcome:
+                    if world.outcome == "level_complete":
+                        self.level_complete_coins = coins_collected
+                        self.level_complete_time = game_time
                     running = False
-                    self.current_screen = "game_over"
-
-            # 道具碰撞处理
-            if hasattr(level, 'items'):
-                for item in pygame.sprite.spritecollide(player, level.items, True):
-                    player.apply_item_effect(item)
-
-            # 到达终点
-            if level.goal and player.rect.colliderect(level.goal.rect):
-                self.level_complete_coins = coins_collected
-                self.level_complete_time = game_time
-                running = False
-                self.current_screen = "level_complete"
-
-            # 超时或掉落处理
-            if game_time > level.time_limit or player.rect.y > SCREEN_HEIGHT:
-                running = False
-                self.current_screen = "game_over"
-
-            # 绘制所有元素和UI
-            for sprite in all_sprites:
-                if hasattr(sprite, 'visible') and not sprite.visible:
-                    continue
-                self.screen.blit(sprite.image, sprite.rect)
-                
-            time_text = self.font.render(f"时间: {max(0, level.time_limit - game_time):.1f}秒", True, WHITE)
-            coin_text = self.font.render(f"金币: {coins_collected}/{total_coins_in_level}", True, WHITE)
-            level_text = self.font.render(f"关卡 {self.current_level}", True, WHITE)
-            desc_text = self.font.render(level.level_description, True, WHITE)
-
-            self.screen.blit(time_text, (20, 20))
-            self.screen.blit(coin_text, (20, 50))
-            self.screen.blit(level_text, (SCREEN_WIDTH - 120, 20))
-
-            # 显示无敌时间
-            if player.invincible:
-                invincible_text = self.font.render(f"无敌时间: {player.invincible_timer / 60:.1f}秒", True, WHITE)
-                self.screen.blit(invincible_text, (20, 80))
-            
-            # 显示冻结剩余时间
-            if player.freeze_timer > 0:
-                freeze_text = self.font.render(f"吃饭中: {player.freeze_timer / 60:.1f}秒", True, RED)
-                self.screen.blit(freeze_text, (20, 110 if player.invincible else 80))
-            
-            # 在屏幕底部显示关卡描述
-            self.screen.blit(desc_text, (20, SCREEN_HEIGHT - 40)) 
-
-            # 技能系统逻辑
-            current_time = pygame.time.get_ticks()
-            
-            # 更新技能动画（如果存在）
-            if skill_animation and current_time - skill_start_time < skill_duration:
-                skill_animation.update(player.rect, player.facing_right)
-                self.bo=1
-            elif skill_animation:
-                # 技能结束，移除动画精灵并恢复玩家图像
-                all_sprites.remove(skill_animation)
-                self.bo=0
-                if player_original_image:
-                    player.image = player_original_image
+                    self.current_screen = world.outcome
+                    # 保存本关最近一次游戏的录像（回放时不覆盖）
+                    if playback is None:
+                        try:
+                            recording.save(last_run_path(self.current_level))
+                        except OSError as e:
+                            print(f"保存录像失败: {e}")
+
+                # 更新技能动画（如果存在）
+                if skill_animation and world.skill_active:
+                    skill_animation.update(player.rect, player.facing_right)
+                elif skill_animation:
+                    # 技能结束，移除动画精灵并重新显示玩家
+                    skill_animation.kill()
                     player.visible = True
-                    player_original_image = None
-                skill_animation = None
-
-            # 绘制技能图标
-            if self.game_state.selected_skin == "皮肤3" and skill_image:
-                if not skill_available:
-                    if current_time - skill_start_time < skill_duration:
-                        # 技能播放中
-                        progress = (current_time - skill_start_time) / skill_duration
-                        progress_rect = pygame.Rect(skill_rect.x, skill_rect.y, 
-                                                int(skill_rect.width * progress), skill_rect.height)
-                        skill_icon_copy = skill_image.copy()
-                        pygame.draw.rect(skill_icon_copy, (100, 100, 100), progress_rect)
-                        self.screen.blit(skill_icon_copy, skill_rect)
-                        self.bo=1
-                        
-                        # 显示技能倒计时
-                        skill_time_text = self.font.render(f"{(skill_duration - (current_time - skill_start_time)) // 1000 + 1}", 
-                                                        True, WHITE)
-                        self.screen.blit(skill_time_text, (skill_rect.centerx - 5, skill_rect.centery - 8))
-                    else:
-                        # 技能冷却中
-                        cooldown_progress = (current_time - skill_start_time - skill_duration) / (skill_cooldown - skill_duration)
-                        grayed_skill_image = skill_image.copy()
-                        pygame.transform.grayscale(grayed_skill_image)
-                        self.bo=0
-                        # 显示冷却进度条
-                        cooldown_rect = pygame.Rect(0, 0, 
-                                                skill_rect.width, skill_rect.height * (1 - cooldown_progress))
-                        pygame.draw.rect(grayed_skill_image, (100, 100, 100), cooldown_rect)
-                        self.screen.blit(grayed_skill_image, skill_rect)
-                        
-                        # 显示冷却剩余时间
-                        cooldown_text = self.font.render(f"{int((skill_cooldown - (current_time - skill_start_time)) // 1000 + 1)}", 
-                                                    True, WHITE)
-                        self.screen.blit(cooldown_text, (skill_rect.centerx - 5, skill_rect.centery - 8))
-                        
-                        # 检查冷却是否结束
-                        if current_time - skill_start_time >= skill_cooldown:
-                            skill_available = True
-                else:
-                    # 技能可用 - 正常显示图标
-                    self.screen.blit(skill_image, skill_rect)
-                    # 添加提示文字
-                    hint_text = self.font.render("点击释放技能", True, WHITE)
-                    hint_rect = hint_text.get_rect(midleft=(skill_rect.right + 10, skill_rect.centery))
-                    self.screen.blit(hint_text, hint_rect)
-
-            pygame.display.flip()
-            self.clock.tick(60)
+                    skill_animation = None
+
+            if not render:
+                continue
+
+            # 玩家（以及跟随玩家的技能动画）按剩余时间在两步之间插值绘制
+            alpha = accumulator / step_time
+            offset_x = round((previous_pos[0] - player.rect.x) * (1 - alpha))
+            offset_y = round((previous_pos[1] - player.rect.y) * (1 - alpha))
+
+            # 障碍物精灵从障碍物数组中读取位置
+            level.obstacles.update()
+
+            # 绘制动态精灵和UI（只重画有变化的区域）；关卡几何改变后换用新的静态图并整屏重画
+            if level.static_version != static_version:
+                static_version = level.static_version
+                renderer.invalidate(level.static_layer())
+            elif not self.dirty_rendering:
+                renderer.invalidate()
+            # 时间、金币、无敌和冻结剩余时间（按 0.1 秒的显示精度更新）
+            hud.update(level.time_limit - game_time, coins_collected, total_coins_in_level,
+                       player.invincible_timer if player.invincible else 0, player.freeze_timer, self.sim_hz)
+            # 技能图标：按技能计时（模拟步数）从预先画好的进度帧中选一张
+            if skill_hud:
+                skill_hud.update(world.skill_ready, world.tick - world.skill_start)
+            renderer.draw_sprites({player: (offset_x, offset_y), skill_animation: (offset_x, offset_y)})
+
+            renderer.present()
+            if not self.turbo:
+                self.clock.tick(self.render_fps)
+            music_player.update()
         # 技能动画精灵类
 
     #暂停菜单
@@ -971,23 +739,18 @@ class Game:
         paused = True
         result = None
 
-        # 加载背景图（保持原比例，填充空白）
-        try:
-            original_bg = pygame.image.load(resource_path("resource/image/background/background9.webp")).convert()
-            bg_ratio = original_bg.get_width() / original_bg.get_height()
-            screen_ratio = SCREEN_WIDTH / SCREEN_HEIGHT
-            if bg_ratio > screen_ratio:
-                new_height = SCREEN_HEIGHT
-                new_width = int(new_height * bg_ratio)
-            else:
-                new_width = SCREEN_WIDTH
-                new_height = int(new_width / bg_ratio)
-            scaled_bg = pygame.transform.scale(original_bg, (new_width, new_height))
-            x_offset = (new_width - SCREEN_WIDTH) // 2
-            y_offset = (new_height - SCREEN_HEIGHT) // 2
-            background = scaled_bg.subsurface((x_offset, y_offset, SCREEN_WIDTH, SCREEN_HEIGHT))
-        except:
-            background = None
+        # 背景、半透明遮罩和标题合成一张底图，只在第一次暂停时生成
+        if self.pause_frame is None:
+            frame = self._screen_frame(backgrounds.get(self.SCREEN_BACKGROUNDS["pause"]))
+            frame.blit(dim_overlay((SCREEN_WIDTH, SCREEN_HEIGHT)), (0, 0))
+            # 标题（添加阴影效果）
+            title_text = self.large_font.render("暂停", True, WHITE)
+            title_shadow = self.large_font.render("暂停", True, (100, 100, 100))
+            title_rect = title_text.get_rect(center=(SCREEN_WIDTH // 2, 200))
+            frame.blit(title_shadow, (title_rect.x + 3, title_rect.y + 3))
+            frame.blit(title_text, title_rect)
+            self.pause_frame = frame
+        menu = ButtonMenu(self.pause_frame, self.menu_buttons["pause"])
 
         while paused:
             for event in pygame.event.get():
@@ -1001,127 +764,50 @@ class Game:
                         paused = False
                         return "continue"
 
-            # 鼠标位置
-            mouse_pos = pygame.mouse.get_pos()
-
-            # 绘制背景
-            if background:
-                self.screen.blit(background, (0, 0))
-            else:
-                self.screen.fill(BLACK)
-
-            # 绘制半透明背景
-            s = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT), pygame.SRCALPHA)
-            s.fill((0, 0, 0, 180))
-            self.screen.blit(s, (0, 0))
-
-            # 绘制标题（添加阴影效果）
-            title_text = self.large_font.render("暂停", True, WHITE)
-            title_shadow = self.large_font.render("暂停", True, (100, 100, 100))
-            title_rect = title_text.get_rect(center=(SCREEN_WIDTH // 2, 200))
-            self.screen.blit(title_shadow, (title_rect.x+3, title_rect.y+3))
-            self.screen.blit(title_text, title_rect)
-
-            # 绘制按钮
-            button_width, button_height = 200, 50
-            buttons = [
-                {"text": "继续游戏", "y": 300, "action": "continue"},
-                {"text": "重新开始", "y": 370, "action": "restart"},
-                {"text": "返回主菜单", "y": 440, "action": "quit"}
-            ]
-
-            for button in buttons:
-                rect = pygame.Rect((SCREEN_WIDTH - button_width) // 2, button["y"], button_width, button_height)
-                color = BLUE if rect.collidepoint(mouse_pos) else GREEN
+                if event.type == pygame.WINDOWEXPOSED:
+                    menu.invalidate()
 
-                pygame.draw.rect(self.screen, color, rect)
-                pygame.draw.rect(self.screen, WHITE, rect, 2)
-
-                text = self.font.render(button["text"], True, WHITE)
-                text_rect = text.get_rect(center=rect.center)
-                self.screen.blit(text, text_rect)
-
-                # 检查点击
-                if pygame.mouse.get_pressed()[0] and rect.collidepoint(mouse_pos):
-                    pygame.time.delay(200)
-                    paused = False
-                    result = button["action"]
+            # 绘制按钮并检查点击
+            clicked = menu.update(self.screen, pygame.mouse.get_pos(), pygame.mouse.get_pressed()[0])
+            if clicked:
+                pygame.time.delay(200)
+                paused = False
+                result = clicked.action
 
-            pygame.display.flip()
             self.clock.tick(60)
+            music_player.update()
 
         return result
 
     #游戏结束界面，显示失败信息和选项，在这里面设置背景图
     def game_over_screen(self):
         """游戏结束界面"""
-        # 加载背景图（保持原比例，填充空白）
-        try:
-            original_bg = pygame.image.load(resource_path("resource/image/background/background5.webp")).convert()
-            bg_ratio = original_bg.get_width() / original_bg.get_height()
-            screen_ratio = SCREEN_WIDTH / SCREEN_HEIGHT
-            if bg_ratio > screen_ratio:
-                new_height = SCREEN_HEIGHT
-                new_width = int(new_height * bg_ratio)
-            else:
-                new_width = SCREEN_WIDTH
-                new_height = int(new_width / bg_ratio)
-            scaled_bg = pygame.transform.scale(original_bg, (new_width, new_height))
-            x_offset = (new_width - SCREEN_WIDTH) // 2
-            y_offset = (new_height - SCREEN_HEIGHT) // 2
-            background = scaled_bg.subsurface((x_offset, y_offset, SCREEN_WIDTH, SCREEN_HEIGHT))
-        except:
-            background = None
-        while self.current_screen == "game_over":
-            # 绘制背景
-            if background:
-                self.screen.blit(background, (0, 0))
-            else:
-                self.screen.fill(BLACK)
+        # 背景、标题和提示合成一张底图；按钮状态变化时才重画
+        frame = self._screen_frame(backgrounds.get(self.SCREEN_BACKGROUNDS["game_over"]))
+        title_text = self.large_font.render("游戏结束", True, RED)
+        frame.blit(title_text, title_text.get_rect(center=(SCREEN_WIDTH // 2, 150)))
+        prompt_text = self.font.render("按ESC返回主菜单，按R重新开始", True, WHITE)
+        frame.blit(prompt_text, prompt_text.get_rect(center=(SCREEN_WIDTH // 2, 250)))
+        menu = ButtonMenu(frame, self.menu_buttons["game_over"])
 
-            # 绘制标题
-            title_text = self.large_font.render("游戏结束", True, RED)
-            title_rect = title_text.get_rect(center=(SCREEN_WIDTH // 2, 150))
-            self.screen.blit(title_text, title_rect)
-
-            # 绘制提示
-            prompt_text = self.font.render("按ESC返回主菜单，按R重新开始", True, WHITE)
-            prompt_rect = prompt_text.get_rect(center=(SCREEN_WIDTH // 2, 250))
-            self.screen.blit(prompt_text, prompt_rect)
-
-            # 绘制按钮
-            button_width, button_height = 200, 50
-            buttons = [
-                {"text": "重新开始", "y": 350, "action": "restart"},
-                {"text": "返回主菜单", "y": 420, "action": "menu"}
-            ]
-
-            mouse_pos = pygame.mouse.get_pos()
-            for button in buttons:
-                rect = pygame.Rect((SCREEN_WIDTH - button_width) // 2, button["y"], button_width, button_height)
-                color = BLUE if rect.collidepoint(mouse_pos) else GREEN
-
-                pygame.draw.rect(self.screen, color, rect)
-                pygame.draw.rect(self.screen, WHITE, rect, 2)
-
-                text = self.font.render(button["text"], True, WHITE)
-                text_rect = text.get_rect(center=rect.center)
-                self.screen.blit(text, text_rect)
-
-                if pygame.mouse.get_pressed()[0] and rect.collidepoint(mouse_pos):
-                    pygame.time.delay(200)
-                    if button["action"] == "restart":
-                        self.current_screen = "game"
-                    else:
-                        self.current_screen = "menu"
+        while self.current_screen == "game_over":
+            clicked = menu.update(self.screen, pygame.mouse.get_pos(), pygame.mouse.get_pressed()[0])
+            if clicked:
+                pygame.time.delay(200)
+                if clicked.action == "restart":
+                    self.current_screen = "game"
+                else:
+                    self.current_screen = "menu"
 
-            pygame.display.flip()
             self.clock.tick(60)
+            music_player.update()
 
             for event in pygame.event.get():
                 if event.type == pygame.QUIT:
                     self.running = False
                     self.current_screen = None
+                elif event.type == pygame.WINDOWEXPOSED:
+                    menu.invalidate()
                 elif event.type == pygame.KEYDOWN:
                     if event.key == pygame.K_ESCAPE:
                         self.current_screen = "menu"
@@ -1131,24 +817,6 @@ class Game:
     #关卡完成界面，显示通关信息和统计，在这里面设置背景图
     def level_complete_screen(self):
         """关卡完成界面"""
-        # 加载背景图（保持原比例，填充空白）
-        try:
-            original_bg = pygame.image.load(resource_path("resource/image/background/background6.webp")).convert()
-            bg_ratio = original_bg.get_width() / original_bg.get_height()
-            screen_ratio = SCREEN_WIDTH / SCREEN_HEIGHT
-            if bg_ratio > screen_ratio:
-                new_height = SCREEN_HEIGHT
-                new_width = int(new_height * bg_ratio)
-            else:
-                new_width = SCREEN_WIDTH
-                new_height = int(new_width / bg_ratio)
-            scaled_bg = pygame.transform.scale(original_bg, (new_width, new_height))
-            x_offset = (new_width - SCREEN_WIDTH) // 2
-            y_offset = (new_height - SCREEN_HEIGHT) // 2
-            background = scaled_bg.subsurface((x_offset, y_offset, SCREEN_WIDTH, SCREEN_HEIGHT))
-        except:
-            background = None
-
         # 更新游戏状态
         self.game_state.update_level_stats(
             self.current_level,
@@ -1161,65 +829,40 @@ class Game:
             self.game_state.current_level = self.current_level + 1
             self.game_state.save_game_data()
 
-        while self.current_screen == "level_complete":
-            # 绘制背景
-            if background:
-                self.screen.blit(background, (0, 0))
-            else:
-                self.screen.fill(BLACK)
-            
-            # 绘制标题
-            title_text = self.large_font.render("关卡完成!", True, GREEN)
-            title_rect = title_text.get_rect(center=(SCREEN_WIDTH//2, 150))
-            self.screen.blit(title_text, title_rect)
-            
-            # 绘制统计信息
-            stats = [
-                f"收集金币: {self.level_complete_coins}",
-                f"用时: {self.level_complete_time:.1f}秒",
-                f"得分: {self.game_state.calculate_score(self.current_level, self.level_complete_coins, self.level_complete_time)}"
-            ]
-            
-            for i, stat in enumerate(stats):
-                text = self.font.render(stat, True, WHITE)
-                text_rect = text.get_rect(center=(SCREEN_WIDTH//2, 250 + i*40))
-                self.screen.blit(text, text_rect)
-            
-            # 绘制按钮
-            button_width, button_height = 200, 50
-            buttons = [
-                {"text": "下一关", "y": 400, "action": "next"},
-                {"text": "返回主菜单", "y": 470, "action": "menu"}
-            ]
-
-            mouse_pos = pygame.mouse.get_pos()
-            for button in buttons:
-                rect = pygame.Rect((SCREEN_WIDTH - button_width) // 2, button["y"], button_width, button_height)
-                color = BLUE if rect.collidepoint(mouse_pos) else GREEN
+        # 背景、标题和统计信息合成一张底图；按钮状态变化时才重画
+        frame = self._screen_frame(backgrounds.get(self.SCREEN_BACKGROUNDS["level_complete"]))
+        title_text = self.large_font.render("关卡完成!", True, GREEN)
+        frame.blit(title_text, title_text.get_rect(center=(SCREEN_WIDTH//2, 150)))
+        stats = [
+            f"收集金币: {self.level_complete_coins}",
+            f"用时: {self.level_complete_time:.1f}秒",
+            f"得分: {self.game_state.calculate_score(self.current_level, self.level_complete_coins, self.level_complete_time)}"
+        ]
+        for i, stat in enumerate(stats):
+            text = self.font.render(stat, True, WHITE)
+            frame.blit(text, text.get_rect(center=(SCREEN_WIDTH//2, 250 + i*40)))
+        menu = ButtonMenu(frame, self.menu_buttons["level_complete"])
 
-                pygame.draw.rect(self.screen, color, rect)
-                pygame.draw.rect(self.screen, WHITE, rect, 2)
-
-                text = self.font.render(button["text"], True, WHITE)
-                text_rect = text.get_rect(center=rect.center)
-                self.screen.blit(text, text_rect)
-
-                if pygame.mouse.get_pressed()[0] and rect.collidepoint(mouse_pos):
-                    pygame.time.delay(200)
-                    if button["action"] == "next" and self.current_level < 9:  # 假设总共有10个关卡
-                        self.current_level += 1
-                        self.game_state.current_level = self.current_level  # 更新 game_state 的当前关卡
-                        self.current_screen = "game"
-                    else:
-                        self.current_screen = "menu"
+        while self.current_screen == "level_complete":
+            clicked = menu.update(self.screen, pygame.mouse.get_pos(), pygame.mouse.get_pressed()[0])
+            if clicked:
+                pygame.time.delay(200)
+                if clicked.action == "next" and self.current_level < 9:  # 假设总共有10个关卡
+                    self.current_level += 1
+                    self.game_state.current_level = self.current_level  # 更新 game_state 的当前关卡
+                    self.current_screen = "game"
+                else:
+                    self.current_screen = "menu"
 
-            pygame.display.flip()
             self.clock.tick(60)
+            music_player.update()
 
             for event in pygame.event.get():
                 if event.type == pygame.QUIT:
                     self.running = False
                     self.current_screen = None
+                elif event.type == pygame.WINDOWEXPOSED:
+                    menu.invalidate()
                 elif event.type == pygame.KEYDOWN:
                     if event.key == pygame.K_ESCAPE:
                         self.current_screen = "menu"
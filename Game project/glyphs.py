@@ -0,0 +1,128 @@
+import pygame
+from typing import Dict, Iterable, Optional, Tuple
+
+# 每页图集的尺寸
+ATLAS_PAGE_SIZE = (512, 512)
+
+# 计数器和计时器用到的字符，创建字体时就放进图集，游戏中不再调用 FreeType
+DIGITS = "0123456789"
+PUNCTUATION = " .:/-+%()"
+# 界面常用的中文字
+UI_GLYPHS = "时间秒金币关卡积分无敌吃饭中"
+
+
+# 一种颜色的字形图集：每个字只用 FreeType 渲染一次，按行排进图集页
+class GlyphAtlas:
+    def __init__(self, font: pygame.font.Font, color: Tuple[int, int, int]):
+        self.font = font
+        self.color = color
+        self.height = font.get_height()
+        self.pages = []
+        self.glyphs = {}        # 字符 -> (图集页, 区域, 前进宽度)
+        self._cursor = (0, 0)   # 当前页的下一个空位
+        self._new_page()
+
+    def _new_page(self):
+        self.pages.append(pygame.Surface(ATLAS_PAGE_SIZE, pygame.SRCALPHA))
+        self._cursor = (0, 0)
+
+    # 取一个字的字形，没有时渲染并放进图集
+    def glyph(self, char: str):
+        glyph = self.glyphs.get(char)
+        if glyph is None:
+            glyph = self._add(char)
+        return glyph
+
+    def _add(self, char: str):
+        image = self.font.render(char, True, self.color)
+        metrics = self.font.metrics(char)
+        advance = metrics[0][4] if metrics and metrics[0] else image.get_width()
+        width, height = image.get_size()
+        page_width, page_height = ATLAS_PAGE_SIZE
+        x, y = self._cursor
+        if x + width > page_width:
+            x, y = 0, y + self.height
+        if y + max(height, self.height) > page_height:
+            self._new_page()
+            x, y = 0, 0
+        page = self.pages[-1]
+        page.blit(image, (x, y), special_flags=pygame.BLEND_RGBA_MAX)
+        glyph = (page, pygame.Rect(x, y, width, height), advance)
+        self.glyphs[char] = glyph
+        self._cursor = (x + width, y)
+        return glyph
+
+    # 预先放入一组字符
+    def preload(self, chars: Iterable[str]):
+        for char in chars:
+            if char not in self.glyphs:
+                self._add(char)
+
+
+# 用字形图集拼字的字体，接口与 pygame.font.Font.render 相同，可以直接替换
+class GlyphFont:
+    def __init__(self, font: pygame.font.Font, preload: str = DIGITS + PUNCTUATION + UI_GLYPHS):
+        self.font = font
+        self.preload_chars = preload
+        self._atlases = {}      # 颜色 -> GlyphAtlas
+
+    # 某种颜色的图集（第一次使用时预先放入数字、标点和常用字）
+    def atlas(self, color) -> GlyphAtlas:
+        color = tuple(color)
+        atlas = self._atlases.get(color)
+        if atlas is None:
+            atlas = GlyphAtlas(self.font, color)
+            atlas.preload(self.preload_chars)
+            self._atlases[color] = atlas
+        return atlas
+
+    # 提前放入一段文字用到的字（例如关卡描述），游戏中显示时不再渲染字形
+    def preload(self, text: str, color=(255, 255, 255)):
+        self.atlas(color).preload(text)
+
+    # 文字的尺寸
+    def size(self, text: str, color=(255, 255, 255)) -> Tuple[int, int]:
+        atlas = self.atlas(color)
+        return sum(atlas.glyph(char)[2] for char in text), atlas.height
+
+    # 拼出一行文字：逐字从图集中复制字形（antialias 参数只为与 Font.render 兼容，字形总是抗锯齿的）
+    def render(self, text: str, antialias: bool, color, background: Optional[Tuple[int, int, int]] = None) -> pygame.Surface:
+        atlas = self.atlas(color)
+        # 快速路径：数字、标点和常用字已经在图集里，直接查表
+        try:
+            glyphs = [atlas.glyphs[char] for char in text]
+        except KeyError:
+            glyphs = [atlas.glyph(char) for char in text]
+        width = sum(glyph[2] for glyph in glyphs)
+        # 最后一个字的字形可能比前进宽度宽
+        if glyphs:
+            width = max(width, width - glyphs[-1][2] + glyphs[-1][1].width)
+        surface = pygame.Surface((max(width, 1), atlas.height), pygame.SRCALPHA)
+        x = 0
+        sequence = []
+        for page, area, advance in glyphs:
+            sequence.append((page, (x, 0), area, pygame.BLEND_RGBA_MAX))
+            x += advance
+        surface.blits(sequence, doreturn=False)
+        if background is not None:
+            filled = pygame.Surface(surface.get_size())
+            filled.fill(background)
+            filled.blit(surface, (0, 0))
+            return filled
+        return surface
+
+    def get_linesize(self) -> int:
+        return self.font.get_linesize()
+
+
+# 每个 pygame 字体对应的图集字体
+_glyph_fonts: Dict[pygame.font.Font, GlyphFont] = {}
+
+
+# 获取（或创建）字体对应的图集字体
+def glyph_font(font: pygame.font.Font) -> GlyphFont:
+    glyph = _glyph_fonts.get(font)
+    if glyph is None:
+        glyph = GlyphFont(font)
+        _glyph_fonts[font] = glyph
+    return glyph
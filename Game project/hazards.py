@@ -0,0 +1,115 @@
+from typing import List, Optional, Tuple
+
+# NumPy 为可选依赖：没有安装时使用纯 Python 的实现，结果完全一致
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# 移动方向轴
+AXIS_NONE = 0
+AXIS_HORIZONTAL = 1
+AXIS_VERTICAL = 2
+
+MOVE_AXES = {
+    None: AXIS_NONE,
+    "horizontal": AXIS_HORIZONTAL,
+    "vertical": AXIS_VERTICAL,
+}
+
+# 障碍物少于这个数量时纯 Python 循环更快，不转换成数组
+NUMPY_MIN_HAZARDS = 128
+
+# 按列存放的数值字段
+COLUMNS = ("x", "y", "w", "h", "origin_x", "origin_y", "speed", "distance", "counter", "direction", "axis", "alive")
+
+
+# 障碍物数组（按列存放）：所有障碍物的位置和巡逻状态在一次向量化运算中更新，
+# 精灵只是读取这些数组的视图
+class HazardField:
+    def __init__(self, use_numpy: bool = True):
+        self.use_numpy = use_numpy and np is not None
+        for column in COLUMNS:
+            setattr(self, column, [])
+        self.types = []         # 障碍物类型
+        self.masks = []         # 碰撞遮罩（BitMask）
+        self.refs = []          # 对应的精灵（核心不访问）
+        self._packed = False
+
+    def __len__(self):
+        return len(self.types)
+
+    # 加入一个障碍物，返回它的下标（加入完成后调用 pack()）
+    def add(self, rect, obstacle_type: str, mask, move_pattern: Optional[str] = None, speed: int = 2, distance: int = 100, ref=None) -> int:
+        if self._packed:
+            self._unpack()
+        x, y, w, h = rect
+        for column, value in zip(COLUMNS, (x, y, w, h, x, y, speed, distance, 0, 1, MOVE_AXES.get(move_pattern, AXIS_NONE), 1)):
+            getattr(self, column).append(value)
+        self.types.append(obstacle_type)
+        self.masks.append(mask)
+        self.refs.append(ref)
+        return len(self.types) - 1
+
+    # 把各列转换成 NumPy 数组（障碍物少于 min_hazards 个时保持列表）
+    def pack(self, min_hazards: int = NUMPY_MIN_HAZARDS):
+        if self._packed or not self.use_numpy or len(self.types) < min_hazards:
+            return
+        for column in COLUMNS:
+            setattr(self, column, np.array(getattr(self, column), dtype=np.int64))
+        self._packed = True
+
+    def _unpack(self):
+        for column in COLUMNS:
+            setattr(self, column, getattr(self, column).tolist())
+        self._packed = False
+
+    # 所有巡逻中的障碍物前进一步，到达巡逻距离后掉头
+    def step(self):
+        if self._packed:
+            moving = self.axis != AXIS_NONE
+            delta = self.speed * self.direction
+            self.x += np.where(self.axis == AXIS_HORIZONTAL, delta, 0)
+            self.y += np.where(self.axis == AXIS_VERTICAL, delta, 0)
+            self.counter += np.where(moving, self.speed, 0)
+            turn = moving & (np.abs(self.counter) >= self.distance)
+            self.direction[turn] *= -1
+            self.counter[turn] = 0
+            return
+        x, y, axis, speed, direction, counter, distance = self.x, self.y, self.axis, self.speed, self.direction, self.counter, self.distance
+        for i in range(len(axis)):
+            if axis[i] == AXIS_NONE:
+                continue
+            if axis[i] == AXIS_HORIZONTAL:
+                x[i] += speed[i] * direction[i]
+            else:
+                y[i] += speed[i] * direction[i]
+            counter[i] += speed[i]
+            if abs(counter[i]) >= distance[i]:
+                direction[i] *= -1
+                counter[i] = 0
+
+    # 矩形与 (x, y, w, h) 重叠的障碍物下标（按加入顺序）
+    def overlapping(self, x: int, y: int, w: int, h: int) -> List[int]:
+        if self._packed:
+            hits = (self.alive != 0) & (self.x < x + w) & (x < self.x + self.w) & (self.y < y + h) & (y < self.y + self.h)
+            return np.flatnonzero(hits).tolist()
+        xs, ys, ws, hs, alive = self.x, self.y, self.w, self.h, self.alive
+        return [i for i in range(len(xs))
+                if alive[i] and xs[i] < x + w and x < xs[i] + ws[i] and ys[i] < y + h and y < ys[i] + hs[i]]
+
+    # 单个障碍物的位置
+    def position(self, index: int) -> Tuple[int, int]:
+        return int(self.x[index]), int(self.y[index])
+
+    # 水平推动障碍物
+    def push(self, index: int, dx: int) -> int:
+        self.x[index] += dx
+        return int(self.x[index])
+
+    # 移除障碍物（保留下标，之后不再参与碰撞）
+    def remove(self, index: int):
+        self.alive[index] = 0
+
+    def is_alive(self, index: int) -> bool:
+        return bool(self.alive[index])
@@ -0,0 +1,180 @@
+import pygame
+from collections import OrderedDict
+from typing import Callable, Optional, Tuple
+
+# 最多缓存的文字图片数量，超过后按最近最少使用淘汰
+DEFAULT_MAX_TEXTS = 256
+
+# 技能图标的进度帧数：释放中和冷却中各预先画好这么多张，游戏中按进度取一张
+SKILL_ICON_FRAMES = 25
+SKILL_SHADE = (100, 100, 100)   # 进度遮罩的颜色
+
+
+# 文字图片缓存：按 (字体, 文字, 颜色) 缓存 font.render 的结果，整个进程共用一份
+class TextCache:
+    def __init__(self, max_entries: int = DEFAULT_MAX_TEXTS):
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()   # (字体, 文字, 颜色) -> Surface
+
+    # 获取渲染好的文字；调用方共享同一个 Surface，不能直接修改它
+    def render(self, font: pygame.font.Font, text: str, color: Tuple[int, int, int]) -> pygame.Surface:
+        key = (font, text, tuple(color))
+        surface = self._entries.get(key)
+        if surface is not None:
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return surface
+        self.misses += 1
+        surface = font.render(text, True, color)
+        self._entries[key] = surface
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+        return surface
+
+    # 清空缓存
+    def clear(self):
+        self._entries.clear()
+
+
+# 全局文字缓存
+text_cache = TextCache()
+
+
+# 控件还没有设置过值
+_UNSET = object()
+
+
+# 界面上的一行文字：只有显示的值改变时才重新取图，没有变化的帧绘制方可以直接跳过它
+class TextWidget(pygame.sprite.Sprite):
+    def __init__(self, font: pygame.font.Font, position: Tuple[int, int], color=(255, 255, 255),
+                 formatter: Optional[Callable] = None, anchor: str = "topleft"):
+        super().__init__()
+        self.font = font
+        self.position = position
+        self.color = color
+        self.formatter = formatter or str
+        self.anchor = anchor
+        self.value = _UNSET
+        self.visible = True
+        self.image = pygame.Surface((0, 0))
+        self.rect = self.image.get_rect(**{anchor: position})
+
+    # 设置显示的值，值没变时什么也不做；返回是否重新取了图
+    def set(self, value, color=None) -> bool:
+        color = color or self.color
+        if value == self.value and color == self.color:
+            return False
+        self.value = value
+        self.color = color
+        self.image = text_cache.render(self.font, self.formatter(value), color)
+        self.rect = self.image.get_rect(**{self.anchor: self.position})
+        return True
+
+    # 移动到新位置（图片不变）
+    def move_to(self, position: Tuple[int, int]):
+        if position != self.position:
+            self.position = position
+            self.rect = self.image.get_rect(**{self.anchor: position})
+
+
+# 按显示精度量化的剩余时间（0.1 秒），显示相同的时间得到相同的值；
+# 先按 round(x, 1) 取舍，与 f"{x:.1f}" 的显示结果一致
+def tenths(seconds: float) -> int:
+    return round(round(max(0.0, seconds), 1) * 10)
+
+
+# 游戏界面的 HUD：时间、金币、关卡、关卡描述，以及无敌和冻结剩余时间
+class GameHud:
+    def __init__(self, font: pygame.font.Font, level_num: int, description: str, screen_size: Tuple[int, int]):
+        width, height = screen_size
+        self.time = TextWidget(font, (20, 20), formatter=lambda t: f"时间: {t / 10:.1f}秒")
+        self.coins = TextWidget(font, (20, 50), formatter=lambda c: f"金币: {c[0]}/{c[1]}")
+        self.level = TextWidget(font, (width - 120, 20), formatter=lambda n: f"关卡 {n}")
+        self.description = TextWidget(font, (20, height - 40))
+        self.invincible = TextWidget(font, (20, 80), formatter=lambda t: f"无敌时间: {t / 10:.1f}秒")
+        self.freeze = TextWidget(font, (20, 80), (255, 0, 0), formatter=lambda t: f"吃饭中: {t / 10:.1f}秒")
+        self.level.set(level_num)
+        self.description.set(description)
+
+    # 所有控件（作为精灵交给渲染器）
+    def widgets(self):
+        return [self.time, self.coins, self.level, self.description, self.invincible, self.freeze]
+
+    # 按当前游戏状态更新控件，计时器以步数给出（每秒 sim_hz 步）
+    def update(self, remaining_time: float, coins: int, total_coins: int, invincible_timer: int, freeze_timer: int, sim_hz: int):
+        self.time.set(tenths(remaining_time))
+        self.coins.set((coins, total_coins))
+        self.invincible.visible = invincible_timer > 0
+        if self.invincible.visible:
+            self.invincible.set(tenths(invincible_timer / sim_hz))
+        self.freeze.visible = freeze_timer > 0
+        if self.freeze.visible:
+            self.freeze.set(tenths(freeze_timer / sim_hz))
+            self.freeze.move_to((20, 110 if self.invincible.visible else 80))
+
+
+# 技能图标的进度帧：释放中从左往右盖上遮罩，冷却中在灰度图标上从上往下收起遮罩
+def skill_icon_frames(icon: pygame.Surface, count: int = SKILL_ICON_FRAMES):
+    width, height = icon.get_size()
+    gray = pygame.transform.grayscale(icon)
+    active = []
+    cooldown = []
+    for i in range(count):
+        progress = i / count
+        image = icon.copy()
+        pygame.draw.rect(image, SKILL_SHADE, (0, 0, int(width * progress), height))
+        active.append(image)
+        image = gray.copy()
+        pygame.draw.rect(image, SKILL_SHADE, (0, 0, width, int(height * (1 - progress))))
+        cooldown.append(image)
+    return active, cooldown
+
+
+# 技能图标精灵：所有状态的图片在加载技能资源时画好，每帧只是换一张图
+class SkillIcon(pygame.sprite.Sprite):
+    def __init__(self, icon: pygame.Surface, rect: pygame.Rect, count: int = SKILL_ICON_FRAMES):
+        super().__init__()
+        self.ready_image = icon
+        self.active, self.cooldown = skill_icon_frames(icon, count)
+        self.image = icon
+        self.rect = pygame.Rect(rect)
+
+    # 按阶段（"active" 或 "cooldown"）和进度（0 到 1）选一帧，技能可用时 phase 为 None
+    def select(self, phase: Optional[str], progress: float = 0.0):
+        if phase is None:
+            self.image = self.ready_image
+            return
+        frames = self.active if phase == "active" else self.cooldown
+        self.image = frames[max(0, min(len(frames) - 1, int(progress * len(frames))))]
+
+
+# 技能 HUD：技能图标、剩余秒数和“点击释放技能”提示；持续和冷却时间以步数给出（每秒 sim_hz 步）
+class SkillHud:
+    def __init__(self, font: pygame.font.Font, icon: pygame.Surface, rect: pygame.Rect,
+                 duration: int, cooldown: int, sim_hz: int, count: int = SKILL_ICON_FRAMES):
+        self.rect = pygame.Rect(rect)
+        self.duration = duration
+        self.cooldown = cooldown
+        self.sim_hz = sim_hz
+        self.icon = SkillIcon(icon, self.rect, count)
+        self.countdown = TextWidget(font, (self.rect.centerx - 5, self.rect.centery - 8))
+        self.hint = TextWidget(font, (self.rect.right + 10, self.rect.centery), anchor="midleft")
+        self.hint.set("点击释放技能")
+
+    def widgets(self):
+        return [self.icon, self.countdown, self.hint]
+
+    # 按技能状态更新：elapsed 为从释放技能起经过的步数
+    def update(self, ready: bool, elapsed: int):
+        self.hint.visible = ready
+        self.countdown.visible = not ready
+        if ready:
+            self.icon.select(None)
+        elif elapsed < self.duration:
+            self.icon.select("active", elapsed / self.duration)
+            self.countdown.set((self.duration - elapsed) // self.sim_hz + 1)
+        else:
+            self.icon.select("cooldown", (elapsed - self.duration) / (self.cooldown - self.duration))
+            self.countdown.set((self.cooldown - elapsed) // self.sim_hz + 1)
@@ -1,7 +1,9 @@
 import pygame
 import sys
 import os
-from category import Platform, Coin, Goal, Obstacle, Item, SCREEN_WIDTH, SCREEN_HEIGHT
+from category import Platform, Coin, Goal, Obstacle, Item, SCREEN_WIDTH, SCREEN_HEIGHT, BLACK
+from backgrounds import backgrounds
+from level_bake import load_geometry
 
 # 定义 resource_path 函数
 def resource_path(relative_path):
@@ -25,6 +27,9 @@ class Level:
         self.time_limit = 120  # 默认时间限制（秒）
         self.background_path = self.get_background_path()  # 背景图路径
         self.level_description = ""  # 新增属性，用于存储关卡描述
+        self._static_layer = None   # 背景、平台和终点合成的静态图，第一次使用时生成
+        self.static_version = 0     # 静态图每失效一次加 1，绘制方据此判断是否需要整屏重画
+        self.world = None           # 正在运行这一关的模拟核心（World.from_level 时绑定）
         self.setup_level()
 
     # 获取当前关卡的背景图路径，在这里设置背景图路径
@@ -45,23 +50,8 @@ class Level:
 
     # 加载背景图（保持原比例）
     def load_background(self):
-        try:
-            # 使用 self.background_path 加载对应关卡的背景图
-            original_bg = pygame.image.load(self.background_path).convert()
-            bg_ratio = original_bg.get_width() / original_bg.get_height()
-            screen_ratio = SCREEN_WIDTH / SCREEN_HEIGHT
-            if bg_ratio > screen_ratio:
-                new_height = SCREEN_HEIGHT
-                new_width = int(new_height * bg_ratio)
-            else:
-                new_width = SCREEN_WIDTH
-                new_height = int(new_width / bg_ratio)
-            scaled_bg = pygame.transform.scale(original_bg, (new_width, new_height))
-            x_offset = (new_width - SCREEN_WIDTH) // 2
-            y_offset = (new_height - SCREEN_HEIGHT) // 2
-            return scaled_bg.subsurface((x_offset, y_offset, SCREEN_WIDTH, SCREEN_HEIGHT))
-        except:
-            return None
+        # 使用 self.background_path 加载对应关卡的背景图，按比例缩放后居中裁剪
+        return backgrounds.get(self.background_path)
 
     # 根据关卡号设置不同的关卡布局
     def setup_level(self):
@@ -87,6 +77,65 @@ class Level:
         elif self.level_num == 9:
             self.setup_level_9()
 
+        self.rebuild_geometry()
+
+    # 平台不会移动：读取（或现场计算）合并后的碰撞矩形和占用位图，模拟核心由它建立网格索引
+    # 平台精灵只用于绘制，碰撞只检查合并后的矩形
+    def rebuild_geometry(self):
+        self.geometry = load_geometry(self.level_num, [tuple(platform.rect) for platform in self.platforms])
+        if self.world is not None:
+            self.world.set_geometry(self.geometry)
+
+    # 绑定正在运行这一关的模拟核心，之后运行时的平台和终点改动会同步给它
+    def bind_world(self, world):
+        self.world = world
+
+    # 某一点是否在平台内部（先查占用位图，只有部分占用的格子才检查矩形）
+    def solid_at(self, x: float, y: float) -> bool:
+        return self.geometry.solid_at(x, y)
+
+    # 背景、所有平台和终点合成的一张屏幕大小的静态图，动态精灵画在它上面
+    def static_layer(self) -> pygame.Surface:
+        if self._static_layer is None:
+            layer = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT))
+            # 没有设置显示模式时（例如无窗口运行）无法 convert
+            if pygame.display.get_surface() is not None:
+                layer = layer.convert()
+            background = self.load_background()
+            if background:
+                layer.blit(background, (0, 0))
+            else:
+                layer.fill(BLACK)
+            layer.blits([(platform.image, platform.rect) for platform in self.platforms], doreturn=False)
+            if self.goal:
+                layer.blit(self.goal.image, self.goal.rect)
+            self._static_layer = layer
+        return self._static_layer
+
+    # 静态图失效：背景、平台或终点在运行时改变后调用，下次使用时重新合成
+    def invalidate_static(self):
+        self._static_layer = None
+        self.static_version += 1
+
+    # 运行时加入平台：更新碰撞几何（包括已绑定的模拟核心）并让静态图失效
+    def add_platform(self, platform: Platform):
+        self.platforms.add(platform)
+        self.rebuild_geometry()
+        self.invalidate_static()
+
+    # 运行时移除平台
+    def remove_platform(self, platform: Platform):
+        self.platforms.remove(platform)
+        self.rebuild_geometry()
+        self.invalidate_static()
+
+    # 运行时更换终点位置
+    def set_goal(self, goal: Goal):
+        self.goal = goal
+        if self.world is not None:
+            self.world.set_goal(goal.rect if goal else None)
+        self.invalidate_static()
+
     # 教程关卡(第0关）布局
     def setup_tutorial_level(self):
         # 教程关卡
@@ -0,0 +1,225 @@
+import argparse
+import hashlib
+import json
+import os
+import sys
+from typing import Iterable, List, Optional, Sequence, Tuple
+
+# 定义 resource_path 函数
+def resource_path(relative_path):
+    try:
+        base_path = sys._MEIPASS
+    except AttributeError:
+        base_path = os.path.abspath(".")
+    return os.path.join(base_path, relative_path)
+
+# 关卡碰撞数据的输出路径与参数
+LEVELS_DIR = "resource/levels"
+LEVEL_VERSION = 1
+LEVEL_COUNT = 10
+WORLD_SIZE = (800, 600)
+CELL_SIZE = 10          # 占用位图每格的边长（像素）
+
+# 占用位图的格子状态
+EMPTY = 0
+FULL = 1
+PARTIAL = 2
+
+Rect = Tuple[int, int, int, int]   # (x, y, 宽, 高)
+
+
+# 平台矩形列表的指纹，用来判断烘焙结果是否与当前关卡布局一致
+def source_signature(rects: Sequence[Rect]) -> str:
+    return hashlib.sha1(json.dumps([list(rect) for rect in rects]).encode("utf-8")).hexdigest()
+
+
+# 坐标压缩：把矩形并集切成由所有边坐标组成的网格，返回坐标和每格是否被覆盖
+def _compress(rects: Sequence[Rect]):
+    xs = sorted({x for rect in rects for x in (rect[0], rect[0] + rect[2])})
+    ys = sorted({y for rect in rects for y in (rect[1], rect[1] + rect[3])})
+    x_index = {x: i for i, x in enumerate(xs)}
+    y_index = {y: i for i, y in enumerate(ys)}
+    filled = [[False] * (len(xs) - 1) for _ in range(len(ys) - 1)]
+    for x, y, w, h in rects:
+        for row in range(y_index[y], y_index[y + h]):
+            line = filled[row]
+            for col in range(x_index[x], x_index[x + w]):
+                line[col] = True
+    return xs, ys, filled
+
+
+# 贪心合并：先沿一行尽量向右扩展，再整段向下扩展
+def _greedy(xs, ys, filled) -> List[Rect]:
+    rows = len(filled)
+    cols = len(filled[0]) if rows else 0
+    used = [[False] * cols for _ in range(rows)]
+    merged = []
+    for row in range(rows):
+        for col in range(cols):
+            if not filled[row][col] or used[row][col]:
+                continue
+            end_col = col
+            while end_col + 1 < cols and filled[row][end_col + 1] and not used[row][end_col + 1]:
+                end_col += 1
+            end_row = row
+            while end_row + 1 < rows and all(filled[end_row + 1][c] and not used[end_row + 1][c] for c in range(col, end_col + 1)):
+                end_row += 1
+            for r in range(row, end_row + 1):
+                for c in range(col, end_col + 1):
+                    used[r][c] = True
+            merged.append((xs[col], ys[row], xs[end_col + 1] - xs[col], ys[end_row + 1] - ys[row]))
+    return merged
+
+
+# 把重叠或相接的实心矩形合并成覆盖范围完全相同的一组矩形，取行优先、列优先两种结果中较少的
+def merge_solids(rects: Iterable[Rect]) -> List[Rect]:
+    rects = [tuple(rect) for rect in rects if rect[2] > 0 and rect[3] > 0]
+    if not rects:
+        return []
+    xs, ys, filled = _compress(rects)
+    by_rows = _greedy(xs, ys, filled)
+    transposed = [list(column) for column in zip(*filled)]
+    by_cols = [(x, y, w, h) for y, x, h, w in _greedy(ys, xs, transposed)]
+    best = min(by_rows, by_cols, key=len)
+    # 合并后反而更多时（例如十字交叉），保留去重后的原始矩形
+    original = list(dict.fromkeys(rects))
+    if len(original) <= len(best):
+        return original
+    return sorted(best, key=lambda rect: (rect[1], rect[0]))
+
+
+# 粗粒度占用位图：每格为 EMPTY / FULL / PARTIAL，按行存放
+def build_occupancy(rects: Sequence[Rect], cell_size: int = CELL_SIZE, world_size: Tuple[int, int] = WORLD_SIZE) -> bytearray:
+    cols = (world_size[0] + cell_size - 1) // cell_size
+    rows = (world_size[1] + cell_size - 1) // cell_size
+    covered = [0] * (cols * rows)   # 每格被覆盖的面积
+    # 先拆成互不重叠的矩形，面积才能直接累加
+    xs, ys, filled = _compress(rects) if rects else ([], [], [])
+    for x, y, w, h in _greedy(xs, ys, filled):
+        left, top = max(x, 0), max(y, 0)
+        right, bottom = min(x + w, world_size[0]), min(y + h, world_size[1])
+        if left >= right or top >= bottom:
+            continue
+        for row in range(top // cell_size, (bottom - 1) // cell_size + 1):
+            cell_top = row * cell_size
+            overlap_h = min(bottom, cell_top + cell_size) - max(top, cell_top)
+            for col in range(left // cell_size, (right - 1) // cell_size + 1):
+                cell_left = col * cell_size
+                overlap_w = min(right, cell_left + cell_size) - max(left, cell_left)
+                covered[row * cols + col] += overlap_w * overlap_h
+    bitmap = bytearray(cols * rows)
+    for index, area in enumerate(covered):
+        col = index % cols
+        row = index // cols
+        cell_w = min(cell_size, world_size[0] - col * cell_size)
+        cell_h = min(cell_size, world_size[1] - row * cell_size)
+        if area >= cell_w * cell_h:
+            bitmap[index] = FULL
+        elif area > 0:
+            bitmap[index] = PARTIAL
+    return bitmap
+
+
+# 关卡的碰撞几何：合并后的矩形和占用位图
+class LevelGeometry:
+    def __init__(self, rects: Sequence[Rect], bitmap: Optional[bytearray] = None, cell_size: int = CELL_SIZE, world_size: Tuple[int, int] = WORLD_SIZE):
+        self.rects = [tuple(rect) for rect in rects]
+        self.cell_size = cell_size
+        self.world_size = tuple(world_size)
+        self.cols = (world_size[0] + cell_size - 1) // cell_size
+        self.rows = (world_size[1] + cell_size - 1) // cell_size
+        if bitmap is None:
+            bitmap = build_occupancy(self.rects, cell_size, world_size)
+        self.bitmap = bitmap
+        self._solid_sums = self._summed_area()
+
+    # 非空格子数的二维前缀和：任意一块格子区域里有没有非空格子只需查 4 个数
+    def _summed_area(self) -> List[int]:
+        stride = self.cols + 1
+        sums = [0] * (stride * (self.rows + 1))
+        for row in range(self.rows):
+            line = 0
+            for col in range(self.cols):
+                line += self.bitmap[row * self.cols + col] != EMPTY
+                sums[(row + 1) * stride + col + 1] = sums[row * stride + col + 1] + line
+        return sums
+
+    # 由原始平台矩形计算（没有烘焙文件时在运行时使用）
+    @classmethod
+    def from_rects(cls, rects: Sequence[Rect]) -> "LevelGeometry":
+        return cls(merge_solids(rects))
+
+    # 点查询：空格和满格直接由位图得出，只有部分占用的格子才检查矩形
+    def solid_at(self, x: float, y: float) -> bool:
+        if x < 0 or y < 0 or x >= self.world_size[0] or y >= self.world_size[1]:
+            return False
+        state = self.bitmap[int(y) // self.cell_size * self.cols + int(x) // self.cell_size]
+        if state != PARTIAL:
+            return state == FULL
+        for left, top, w, h in self.rects:
+            if left <= x < left + w and top <= y < top + h:
+                return True
+        return False
+
+    # 区域查询：矩形覆盖的格子是否全部为空（这时不可能碰到任何平台，不用再检查矩形）；
+    # 超出世界范围的部分位图没有记录，按不确定处理
+    def region_empty(self, x: int, y: int, w: int, h: int) -> bool:
+        if x < 0 or y < 0 or x + w > self.world_size[0] or y + h > self.world_size[1]:
+            return False
+        size = self.cell_size
+        stride = self.cols + 1
+        sums = self._solid_sums
+        left, right = x // size, (x + w - 1) // size + 1
+        top, bottom = y // size * stride, ((y + h - 1) // size + 1) * stride
+        return sums[bottom + right] - sums[top + right] - sums[bottom + left] + sums[top + left] == 0
+
+    def to_json(self, signature: str) -> dict:
+        return {
+            "v": LEVEL_VERSION,
+            "source": signature,
+            "cell": self.cell_size,
+            "size": list(self.world_size),
+            "rects": [list(rect) for rect in self.rects],
+            "bitmap": self.bitmap.hex(),
+        }
+
+
+# 烘焙文件路径
+def level_file(level_num: int, levels_dir: str = LEVELS_DIR) -> str:
+    return os.path.join(resource_path(levels_dir), f"level_{level_num}.json")
+
+
+# 读取关卡的碰撞几何：烘焙文件存在且与当前布局一致时直接使用，否则在运行时计算
+def load_geometry(level_num: int, rects: Sequence[Rect], levels_dir: str = LEVELS_DIR) -> LevelGeometry:
+    rects = [tuple(rect) for rect in rects]
+    signature = source_signature(rects)
+    try:
+        with open(level_file(level_num, levels_dir), "r", encoding="utf-8") as f:
+            data = json.load(f)
+        if data.get("v") == LEVEL_VERSION and data.get("source") == signature:
+            return LevelGeometry(data["rects"], bytearray.fromhex(data["bitmap"]), data["cell"], data["size"])
+    except (OSError, ValueError, KeyError):
+        pass
+    return LevelGeometry.from_rects(rects)
+
+
+# 烘焙全部关卡
+def bake_levels(levels_dir: str = LEVELS_DIR):
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    from level import Level     # 关卡布局写在代码里，需要构建一次关卡才能拿到平台矩形
+
+    os.makedirs(resource_path(levels_dir), exist_ok=True)
+    for level_num in range(LEVEL_COUNT):
+        rects = [tuple(platform.rect) for platform in Level(level_num).platforms]
+        geometry = LevelGeometry.from_rects(rects)
+        with open(level_file(level_num, levels_dir), "w", encoding="utf-8") as f:
+            json.dump(geometry.to_json(source_signature(rects)), f, separators=(",", ":"))
+        partial = geometry.bitmap.count(PARTIAL)
+        print(f"第{level_num}关: {len(rects)} 个平台 -> {len(geometry.rects)} 个矩形，部分占用格 {partial}/{len(geometry.bitmap)}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="烘焙关卡碰撞几何")
+    parser.add_argument("--output", default=LEVELS_DIR, help="输出目录")
+    args = parser.parse_args()
+    bake_levels(args.output)
@@ -0,0 +1,202 @@
+import pygame
+from typing import Dict, Optional, Tuple
+from category import SCREEN_WIDTH, SCREEN_HEIGHT, WHITE
+from level_bake import LEVEL_COUNT
+
+# 关卡按钮布局：每行5个，共2行
+BUTTON_SIZE = 90
+MARGIN = 20
+START_X = (SCREEN_WIDTH - (5 * BUTTON_SIZE + 4 * MARGIN)) // 2
+START_Y = 160
+
+# 悬停放大动画：缩放在 1.0 到 1.1 之间，按几个固定档位预先画好
+MAX_SCALE = 1.1
+SCALE_STEPS = 6
+GROW_PADDING = (int(BUTTON_SIZE * MAX_SCALE) - BUTTON_SIZE) // 2 + 1    # 放大后超出原位置的像素
+
+BACK_BUTTON = pygame.Rect(SCREEN_WIDTH // 2 - 75, SCREEN_HEIGHT - 80, 150, 50)
+
+
+# 第 level 关按钮的位置
+def button_rect(level: int) -> pygame.Rect:
+    row, col = divmod(level, 5)
+    return pygame.Rect(START_X + col * (BUTTON_SIZE + MARGIN), START_Y + row * (BUTTON_SIZE + MARGIN), BUTTON_SIZE, BUTTON_SIZE)
+
+
+# 把连续的缩放值量化到档位（0 为原始大小）
+def scale_step(scale: float) -> int:
+    return round((scale - 1.0) / (MAX_SCALE - 1.0) * (SCALE_STEPS - 1))
+
+
+def step_scale(step: int) -> float:
+    return 1.0 + (MAX_SCALE - 1.0) * step / (SCALE_STEPS - 1)
+
+
+# 背景图加载失败时使用的竖直渐变，只画一次
+_gradients: Dict[Tuple[int, int], pygame.Surface] = {}
+
+
+def gradient_background(size: Tuple[int, int] = (SCREEN_WIDTH, SCREEN_HEIGHT)) -> pygame.Surface:
+    gradient = _gradients.get(size)
+    if gradient is None:
+        width, height = size
+        gradient = pygame.Surface(size)
+        for y in range(height):
+            color = (0, 0, max(50, int(150 * y / height)))
+            pygame.draw.line(gradient, color, (0, y), (width, y))
+        _gradients[size] = gradient
+    return gradient
+
+
+# 关卡按钮的预渲染图片：按 (悬停, 是否当前关, 档位) 缓存按钮底板，按 (文字, 档位) 缓存缩放后的文字，
+# 按星数缓存星星条
+class LevelTiles:
+    def __init__(self, large_font: pygame.font.Font, font: pygame.font.Font, star_img: Optional[pygame.Surface], lock_img: Optional[pygame.Surface]):
+        self.large_font = large_font
+        self.font = font
+        self.star_img = star_img
+        self.lock_img = lock_img
+        self._plates = {}
+        self._labels = {}
+        self._stars = {}
+        self._locked = None
+
+    # 已解锁关卡的按钮底板
+    def plate(self, hover: bool, current: bool, step: int) -> pygame.Surface:
+        key = (hover, current, step)
+        plate = self._plates.get(key)
+        if plate is None:
+            size = int(BUTTON_SIZE * step_scale(step))
+            button_color = (50, 150, 255) if hover else (30, 100, 200)
+            border_color = (200, 200, 0) if current else (200, 200, 200)
+            plate = pygame.Surface((size, size), pygame.SRCALPHA)
+            pygame.draw.rect(plate, (*button_color, 200), (0, 0, size, size), border_radius=15)
+            pygame.draw.rect(plate, border_color, (0, 0, size, size), width=3, border_radius=15)
+            self._plates[key] = plate
+        return plate
+
+    # 关卡文字（教程关或关卡号），按档位缩放
+    def label(self, level: int, step: int) -> pygame.Surface:
+        key = (level, step)
+        label = self._labels.get(key)
+        if label is None:
+            text = self.large_font.render("教程关" if level == 0 else str(level), True, WHITE)
+            scale = step_scale(step)
+            label = pygame.transform.scale(text, (int(text.get_width() * scale), int(text.get_height() * scale)))
+            self._labels[key] = label
+        return label
+
+    # 星星条（1-3 颗星）
+    def stars(self, count: int) -> Optional[pygame.Surface]:
+        if not self.star_img or count <= 0:
+            return None
+        strip = self._stars.get(count)
+        if strip is None:
+            width, height = self.star_img.get_size()
+            strip = pygame.Surface((20 * (count - 1) + width, height), pygame.SRCALPHA)
+            for s in range(count):
+                strip.blit(self.star_img, (s * 20, 0))
+            self._stars[count] = strip
+        return strip
+
+    # 未解锁关卡：底板和锁图标画在界面底图上
+    def draw_locked(self, surface: pygame.Surface, level: int):
+        rect = button_rect(level)
+        if self._locked is None:
+            plate = pygame.Surface((BUTTON_SIZE, BUTTON_SIZE), pygame.SRCALPHA)
+            pygame.draw.rect(plate, (50, 50, 50, 200), (0, 0, BUTTON_SIZE, BUTTON_SIZE), border_radius=15)
+            pygame.draw.rect(plate, (100, 100, 100), (0, 0, BUTTON_SIZE, BUTTON_SIZE), width=2, border_radius=15)
+            icon = self.lock_img or self.font.render("🔒", True, WHITE)
+            self._locked = (plate, icon)
+        plate, icon = self._locked
+        surface.blit(plate, rect)
+        surface.blit(icon, icon.get_rect(center=rect.center))
+        unlock_text = self.font.render(f"关卡{level + 1}", True, WHITE)
+        surface.blit(unlock_text, unlock_text.get_rect(center=(rect.centerx, rect.bottom + 15)))
+
+
+# 返回按钮的两种状态（渐变底色、白色边框和文字），只画一次
+def back_button_images(font: pygame.font.Font, frame: pygame.Surface) -> Dict[bool, pygame.Surface]:
+    images = {}
+    for hover in (False, True):
+        image = frame.subsurface(BACK_BUTTON).copy()
+        back_color = (200, 50, 50) if hover else (150, 40, 40)
+        for i in range(BACK_BUTTON.height):
+            shade = max(0, min(255, back_color[0] + (i * 10 // BACK_BUTTON.height)))
+            pygame.draw.rect(image, (shade, back_color[1], back_color[2]), (0, i, BACK_BUTTON.width, 1))
+        pygame.draw.rect(image, (255, 255, 255), image.get_rect(), 2, border_radius=5)
+        back_text = font.render("返回", True, WHITE)
+        image.blit(back_text, back_text.get_rect(center=image.get_rect().center))
+        images[hover] = image
+    return images
+
+
+# 关卡选择界面：背景、标题和未解锁的关卡合成一张底图；已解锁关卡按悬停动画的档位变化时才重画
+class LevelSelectView:
+    def __init__(self, tiles: LevelTiles, frame: pygame.Surface, unlocked: int, stars: Dict[int, int], back_images: Dict[bool, pygame.Surface]):
+        self.tiles = tiles
+        self.frame = frame
+        self.unlocked = unlocked        # 已解锁的最高关卡
+        self.stars = stars              # 关卡 -> 星数
+        self.back_images = back_images
+        self.scales = [1.0] * LEVEL_COUNT
+        self._drawn = None              # 上次绘制时每个按钮的状态，None 表示需要整屏重画
+
+    def invalidate(self):
+        self._drawn = None
+
+    # 已解锁关卡的绘制：底板、文字和星星，返回覆盖的区域
+    def _draw_level(self, surface: pygame.Surface, level: int, hover: bool, step: int) -> pygame.Rect:
+        rect = button_rect(level)
+        plate = self.tiles.plate(hover, level == self.unlocked, step)
+        offset = (plate.get_width() - BUTTON_SIZE) // 2
+        area = surface.blit(plate, (rect.x - offset, rect.y - offset))
+        label = self.tiles.label(level, step)
+        surface.blit(label, label.get_rect(center=(rect.centerx, rect.centery - 15)))
+        strip = self.tiles.stars(self.stars.get(level, 0))
+        if strip:
+            surface.blit(strip, (rect.centerx - 30, rect.centery + 15))
+        return area
+
+    # 推进悬停动画并绘制有变化的按钮，返回被点击的关卡号、"back" 或 None
+    def update(self, surface: pygame.Surface, mouse_pos: Tuple[int, int], mouse_down: bool):
+        states = []
+        for level in range(LEVEL_COUNT):
+            if level > self.unlocked:
+                states.append(None)
+                continue
+            hover = button_rect(level).collidepoint(mouse_pos)
+            target = MAX_SCALE if hover else 1.0
+            self.scales[level] = max(1.0, min(MAX_SCALE, self.scales[level] + (target - self.scales[level]) * 0.1))
+            states.append((hover, scale_step(self.scales[level])))
+        back_hover = BACK_BUTTON.collidepoint(mouse_pos)
+        states.append(back_hover)
+
+        if self._drawn is None:
+            surface.blit(self.frame, (0, 0))
+            for level, state in enumerate(states[:LEVEL_COUNT]):
+                if state:
+                    self._draw_level(surface, level, *state)
+            surface.blit(self.back_images[back_hover], BACK_BUTTON)
+            pygame.display.flip()
+        elif states != self._drawn:
+            dirty = []
+            for level, (state, previous) in enumerate(zip(states[:LEVEL_COUNT], self._drawn)):
+                if state and state != previous:
+                    # 先用底图恢复放大到最大时覆盖的区域，再重画
+                    area = button_rect(level).inflate(2 * GROW_PADDING, 2 * GROW_PADDING)
+                    surface.blit(self.frame, area, area)
+                    self._draw_level(surface, level, *state)
+                    dirty.append(area)
+            if back_hover != self._drawn[-1]:
+                dirty.append(surface.blit(self.back_images[back_hover], BACK_BUTTON))
+            pygame.display.update(dirty)
+        self._drawn = states
+
+        if mouse_down:
+            for level in range(min(self.unlocked, LEVEL_COUNT - 1) + 1):
+                if button_rect(level).collidepoint(mouse_pos):
+                    return level
+            if back_hover:
+                return "back"
+        return None
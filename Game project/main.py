@@ -1,10 +1,71 @@
+import argparse
+import os
+import time
+
 import pygame
 
 from game import Game
+from replay import Recording, ReplayError
+
+
+# 快进回放：按录像（或输入脚本）跑完关卡，不等待时钟，打印最终状态
+def run_replays(paths, level_num=None, skin_name=None, render=False):
+    # 无窗口、无声音运行
+    os.environ["SDL_VIDEODRIVER"] = "dummy"
+    os.environ["SDL_AUDIODRIVER"] = "dummy"
+
+    game = Game()
+    game.turbo = True
+    game.turbo_render = render
+    failed = 0
+    for path in paths:
+        try:
+            recording = Recording.load(path)
+        except (OSError, ReplayError) as e:
+            print(f"{path}: 无法读取录像 ({e})")
+            failed += 1
+            continue
+        if level_num is not None:
+            recording.level_num = level_num
+        if skin_name is not None:
+            recording.skin_name = skin_name
+        if recording.sim_hz != game.sim_hz:
+            print(f"{path}: 录像的模拟频率 {recording.sim_hz} 与游戏 {game.sim_hz} 不一致")
+            failed += 1
+            continue
+
+        game.current_level = recording.level_num
+        game.game_state.selected_skin = recording.skin_name
+        game.replay = recording
+        start = time.perf_counter()
+        game.game_screen()
+        elapsed = time.perf_counter() - start
+
+        world = game.last_world
+        goal = world.outcome == "level_complete"
+        status = "到达终点" if goal else f"失败（{world.death_cause}）" if world.outcome else "录像结束"
+        print(f"{path}: 关卡 {recording.level_num} 皮肤 {recording.skin_name} | {status} | "
+              f"金币 {world.coins_collected}/{world.total_coins} | 时间 {world.game_time:.2f}秒 ({world.tick} 步) | "
+              f"耗时 {elapsed * 1000:.0f} ms")
+        if game.current_screen is None:
+            break   # 窗口被关闭
+    pygame.quit()
+    return 1 if failed else 0
+
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="跑酷闯关游戏")
+    parser.add_argument("--replay", nargs="+", metavar="FILE", help="快进回放录像或输入脚本，打印结果后退出")
+    parser.add_argument("--level", type=int, help="回放时使用的关卡（默认取录像中的关卡）")
+    parser.add_argument("--skin", help="回放时使用的皮肤（默认取录像中的皮肤）")
+    parser.add_argument("--render", action="store_true", help="回放时仍然绘制每一帧（用于测量绘制开销）")
+    args = parser.parse_args()
+
+    if args.replay:
+        raise SystemExit(run_replays(args.replay, args.level, args.skin, args.render))
+
     game = Game()
     try:
         game.run()
     finally:
-        pygame.mixer.quit()
\ No newline at end of file
+        pygame.mixer.quit()
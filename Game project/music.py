@@ -0,0 +1,143 @@
+import pygame
+import argparse
+import os
+import shutil
+import subprocess
+import sys
+from typing import Dict, Optional, Tuple
+
+# 定义 resource_path 函数
+def resource_path(relative_path):
+    try:
+        base_path = sys._MEIPASS
+    except AttributeError:
+        base_path = os.path.abspath(".")
+    return os.path.join(base_path, relative_path)
+
+# 各界面的背景音乐：界面 -> (文件路径, 循环次数，-1 为无限循环)
+SCREEN_TRACKS = {
+    "menu": (resource_path("resource/sound/background.mp3"), -1),
+    "level_select": (resource_path("resource/sound/background.mp3"), -1),
+    "skins": (resource_path("resource/sound/background.mp3"), -1),
+    "stats": (resource_path("resource/sound/background.mp3"), -1),
+    "game": (resource_path("resource/sound/xm3698.wav"), -1),
+    "game_over": (resource_path("resource/sound/xm3701.wav"), 0),
+    "level_complete": (resource_path("resource/sound/level_complete.wav"), 0),
+}
+
+CROSSFADE_MS = 400          # 切换曲目时的淡出/淡入时间（毫秒）
+MUSIC_VOLUME = 0.6
+SOUND_DIR = "resource/sound"
+TRANSCODE_MIN_BYTES = 512 * 1024    # 超过这个大小的 WAV 才转码
+TRANSCODE_QUALITY = 4               # Vorbis 质量等级（0-10）
+
+
+# 优先使用转码后的 OGG 文件（比 WAV 更新时），否则使用原文件
+def resolve_track(path: str) -> str:
+    root, ext = os.path.splitext(path)
+    if ext.lower() == ".wav":
+        ogg_path = root + ".ogg"
+        try:
+            if os.path.getmtime(ogg_path) >= os.path.getmtime(path):
+                return ogg_path
+        except OSError:
+            pass
+    return path
+
+
+# 背景音乐播放器：基于 pygame.mixer.music 流式播放，同一时间只有一小段缓冲常驻内存
+class MusicPlayer:
+    def __init__(self, screen_tracks: Dict[str, Tuple[str, int]] = SCREEN_TRACKS, crossfade_ms: int = CROSSFADE_MS, volume: float = MUSIC_VOLUME):
+        self.screen_tracks = screen_tracks
+        self.crossfade_ms = crossfade_ms
+        self.volume = volume
+        self.current = None     # 当前播放的 (路径, 循环次数)
+        self._pending = None    # 淡出结束后要播放的曲目
+        self._switch_at = 0     # 淡出结束的时间（毫秒）
+        self.enabled = True
+
+    # 切换到某个界面对应的音乐，曲目相同时继续播放
+    def play_for_screen(self, screen: Optional[str]):
+        track = self.screen_tracks.get(screen)
+        if track is not None:
+            self.play(*track)
+
+    # 播放曲目：正在播放其他曲目时先淡出，淡出结束后由 update() 淡入新曲目
+    def play(self, path: str, loops: int = -1):
+        if not self.enabled or not pygame.mixer.get_init():
+            return
+        track = (path, loops)
+        if track == self._pending or (track == self.current and self._pending is None and pygame.mixer.music.get_busy()):
+            return
+        if self.current is not None and pygame.mixer.music.get_busy():
+            if self._pending is None:
+                pygame.mixer.music.fadeout(self.crossfade_ms)
+                self._switch_at = pygame.time.get_ticks() + self.crossfade_ms
+            self._pending = track
+        else:
+            self._start(track)
+
+    # 每帧调用，淡出结束后开始播放下一首
+    def update(self):
+        if self._pending is None:
+            return
+        if pygame.mixer.music.get_busy() and pygame.time.get_ticks() < self._switch_at:
+            return
+        track, self._pending = self._pending, None
+        self._start(track)
+
+    # 加载并淡入播放
+    def _start(self, track: Tuple[str, int]):
+        self.current = track
+        try:
+            pygame.mixer.music.load(resolve_track(track[0]))
+        except pygame.error as e:
+            print(f"加载背景音乐失败: {e}")
+            return
+        pygame.mixer.music.set_volume(self.volume)
+        pygame.mixer.music.play(loops=track[1], fade_ms=self.crossfade_ms)
+
+    # 停止背景音乐
+    def stop(self):
+        self._pending = None
+        self.current = None
+        if pygame.mixer.get_init():
+            pygame.mixer.music.stop()
+
+
+# 把体积较大的 WAV 转码成流式播放的 OGG（需要系统安装 ffmpeg）
+def transcode_wavs(sound_dir: str = SOUND_DIR, min_bytes: int = TRANSCODE_MIN_BYTES, quality: int = TRANSCODE_QUALITY) -> int:
+    ffmpeg = shutil.which("ffmpeg")
+    if ffmpeg is None:
+        print("未找到 ffmpeg，无法转码")
+        return 1
+    sound_dir = resource_path(sound_dir)
+    for file_name in sorted(os.listdir(sound_dir)):
+        path = os.path.join(sound_dir, file_name)
+        if not file_name.lower().endswith(".wav") or os.path.getsize(path) < min_bytes:
+            continue
+        ogg_path = os.path.splitext(path)[0] + ".ogg"
+        if resolve_track(path) == ogg_path:
+            continue    # 已经是最新的
+        result = subprocess.run([ffmpeg, "-y", "-loglevel", "error", "-i", path, "-c:a", "libvorbis", "-q:a", str(quality), ogg_path])
+        if result.returncode != 0:
+            print(f"转码失败: {file_name}")
+            return result.returncode
+        print(f"{file_name}: {os.path.getsize(path) / 1024:.0f} KB -> {os.path.getsize(ogg_path) / 1024:.0f} KB")
+    return 0
+
+
+# 全局背景音乐播放器
+music_player = MusicPlayer()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="背景音乐工具")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    transcode_parser = subparsers.add_parser("transcode", help="把较大的 WAV 转码为 OGG")
+    transcode_parser.add_argument("--min-kb", type=int, default=TRANSCODE_MIN_BYTES // 1024, help="只转码超过该大小（KB）的文件")
+    transcode_parser.add_argument("--quality", type=int, default=TRANSCODE_QUALITY, help="Vorbis 质量等级（0-10）")
+    args = parser.parse_args()
+
+    if args.command == "transcode":
+        sys.exit(transcode_wavs(min_bytes=args.min_kb * 1024, quality=args.quality))
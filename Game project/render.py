@@ -0,0 +1,114 @@
+import pygame
+from typing import Dict, List, Optional, Tuple
+
+# 精灵的绘制层（数字大的画在上面）
+LAYER_PICKUPS = 1       # 金币、道具
+LAYER_HAZARDS = 2       # 障碍物
+LAYER_PLAYER = 3        # 玩家
+LAYER_EFFECTS = 4       # 技能动画等特效
+LAYER_HUD = 5           # 界面文字
+
+
+# 脏矩形渲染：静态层只画一次，之后每帧只恢复并重画动态精灵和界面文字覆盖到的区域，
+# 再用 display.update(rects) 只提交这些区域
+class DirtyRenderer:
+    def __init__(self, screen: pygame.Surface, static_layer: pygame.Surface):
+        self.screen = screen
+        self.static_layer = static_layer
+        self.sprites = pygame.sprite.LayeredUpdates()
+        self._drawn = {}            # 精灵 -> 上一帧绘制时的 (位置, 图片)
+        self._overlays = []         # 上一帧界面文字等覆盖层的区域
+        self._frame_overlays = []
+        self._dirty = []
+        self._full = True           # 下一帧整屏重画（第一帧、暂停返回后）
+
+    # 加入动态精灵
+    def add(self, sprites, layer: int):
+        self.sprites.add(sprites, layer=layer)
+
+    # 下一帧整屏重画（屏幕被其他界面覆盖过，或者静态层变了）
+    def invalidate(self, static_layer: Optional[pygame.Surface] = None):
+        if static_layer is not None:
+            self.static_layer = static_layer
+        self._full = True
+
+    # 用静态层恢复一块区域
+    def _restore(self, rect: pygame.Rect):
+        rect = rect.clip(self.screen.get_rect())
+        if rect.width and rect.height:
+            self.screen.blit(self.static_layer, rect, rect)
+            self._dirty.append(rect)
+
+    # 绘制动态精灵：offsets 给出需要偏移绘制的精灵（例如插值后的玩家）
+    def draw_sprites(self, offsets: Optional[Dict[pygame.sprite.Sprite, Tuple[int, int]]] = None):
+        offsets = offsets or {}
+        self._frame_overlays = []
+        if self._full:
+            self.screen.blit(self.static_layer, (0, 0))
+            self._drawn.clear()
+            self._overlays = []
+
+        # 本帧每个可见精灵的位置和图片
+        targets = {}
+        for sprite in self.sprites.sprites():
+            if getattr(sprite, "visible", True):
+                # 图片可能比 rect 大（例如不同宽度的动画帧），按图片实际覆盖的区域计算
+                x, y = sprite.rect.topleft
+                offset = offsets.get(sprite)
+                if offset:
+                    x, y = x + offset[0], y + offset[1]
+                targets[sprite] = (pygame.Rect((x, y), sprite.image.get_size()), sprite.image)
+
+        # 需要恢复的区域：上一帧的覆盖层，移动过、换了图片、被隐藏或被移除的精灵的旧位置，以及要重画的精灵的新位置
+        dirty = list(self._overlays)
+        redraw = []
+        for sprite, (rect, image) in list(self._drawn.items()):
+            if targets.get(sprite) != (rect, image):
+                dirty.append(rect)
+                del self._drawn[sprite]
+        for sprite, (rect, image) in targets.items():
+            if sprite not in self._drawn:
+                dirty.append(rect)
+                redraw.append(sprite)
+
+        # 和恢复区域重叠的精灵也要重画，它的整块区域同样要恢复（半透明的边缘不能叠画两次）
+        pending = [sprite for sprite in targets if sprite in self._drawn]
+        changed = True
+        while changed:
+            changed = False
+            for sprite in list(pending):
+                rect = targets[sprite][0]
+                if rect.collidelist(dirty) >= 0:
+                    pending.remove(sprite)
+                    redraw.append(sprite)
+                    dirty.append(rect)
+                    changed = True
+
+        # 先恢复，再按层从下往上重画
+        self._dirty = []
+        for rect in dirty:
+            self._restore(rect)
+        redraw = set(redraw)
+        for sprite in self.sprites.sprites():
+            if sprite in redraw:
+                rect, image = targets[sprite]
+                self.screen.blit(image, rect)
+                self._drawn[sprite] = targets[sprite]
+
+    # 绘制覆盖层（界面文字、图标），下一帧开始时自动擦除
+    def overlay(self, surface: pygame.Surface, position) -> pygame.Rect:
+        rect = self.screen.blit(surface, position)
+        self._frame_overlays.append(rect)
+        return rect
+
+    # 把本帧改动的区域提交到屏幕
+    def present(self) -> List[pygame.Rect]:
+        if self._full:
+            pygame.display.flip()
+            self._full = False
+            rects = [self.screen.get_rect()]
+        else:
+            rects = self._dirty + self._frame_overlays
+            pygame.display.update(rects)
+        self._overlays = self._frame_overlays
+        return rects
@@ -0,0 +1,183 @@
+import os
+import struct
+import sys
+from typing import Iterator, List, Optional, Tuple
+from simulation import INPUT_LEFT, INPUT_RIGHT, INPUT_JUMP, INPUT_SKILL, SIM_HZ
+
+# 定义 resource_path 函数
+def resource_path(relative_path):
+    try:
+        base_path = sys._MEIPASS
+    except AttributeError:
+        base_path = os.path.abspath(".")
+    return os.path.join(base_path, relative_path)
+
+# 录像文件格式：
+#   文件头  魔数 "GRPL"、版本、关卡号、模拟频率、总步数、皮肤名（长度 + UTF-8）
+#   输入    游程编码：每段一个字节，低 4 位是输入位，高 4 位是重复步数（1-15）；
+#           高 4 位为 0 时后面跟一个 LEB128 变长整数表示步数
+REPLAY_MAGIC = b"GRPL"
+REPLAY_VERSION = 1
+REPLAY_DIR = "saves/replays"
+HEADER = struct.Struct("<4sBBHI")
+
+# 文本脚本中每个输入位对应的字母，例如 "30 R" 表示按住右键 30 步
+INPUT_LETTERS = (("L", INPUT_LEFT), ("R", INPUT_RIGHT), ("J", INPUT_JUMP), ("S", INPUT_SKILL))
+
+
+class ReplayError(ValueError):
+    pass
+
+
+# 一次游戏的输入录像：关卡、皮肤和逐步的输入（以 (输入, 步数) 的游程保存）
+class Recording:
+    def __init__(self, level_num: int, skin_name: str = "default", sim_hz: int = SIM_HZ, runs: Optional[List[Tuple[int, int]]] = None):
+        self.level_num = level_num
+        self.skin_name = skin_name
+        self.sim_hz = sim_hz
+        self.runs = runs if runs is not None else []
+
+    @property
+    def ticks(self) -> int:
+        return sum(count for _, count in self.runs)
+
+    # 记录一步的输入
+    def append(self, inputs: int, count: int = 1):
+        if self.runs and self.runs[-1][0] == inputs:
+            self.runs[-1] = (inputs, self.runs[-1][1] + count)
+        elif count > 0:
+            self.runs.append((inputs, count))
+
+    # 逐步展开的输入
+    def inputs(self) -> Iterator[int]:
+        for inputs, count in self.runs:
+            for _ in range(count):
+                yield inputs
+
+    def to_bytes(self) -> bytes:
+        skin = self.skin_name.encode("utf-8")
+        data = bytearray(HEADER.pack(REPLAY_MAGIC, REPLAY_VERSION, self.level_num, self.sim_hz, self.ticks))
+        data.append(len(skin))
+        data += skin
+        for inputs, count in self.runs:
+            if count < 16:
+                data.append(inputs | count << 4)
+                continue
+            data.append(inputs)
+            while True:
+                byte = count & 0x7F
+                count >>= 7
+                if count:
+                    data.append(byte | 0x80)
+                else:
+                    data.append(byte)
+                    break
+        return bytes(data)
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> "Recording":
+        if len(data) < HEADER.size + 1:
+            raise ReplayError("录像文件不完整")
+        magic, version, level_num, sim_hz, ticks = HEADER.unpack_from(data)
+        if magic != REPLAY_MAGIC:
+            raise ReplayError("不是录像文件")
+        if version != REPLAY_VERSION:
+            raise ReplayError(f"不支持的录像版本: {version}")
+        pos = HEADER.size
+        skin_length = data[pos]
+        if pos + 1 + skin_length > len(data):
+            raise ReplayError("录像数据被截断")
+        try:
+            skin_name = data[pos + 1:pos + 1 + skin_length].decode("utf-8")
+        except UnicodeDecodeError:
+            raise ReplayError("皮肤名不是有效的 UTF-8")
+        pos += 1 + skin_length
+        recording = cls(level_num, skin_name, sim_hz)
+        try:
+            while pos < len(data):
+                byte = data[pos]
+                pos += 1
+                count = byte >> 4
+                if count == 0:
+                    shift = 0
+                    while True:
+                        part = data[pos]
+                        pos += 1
+                        count |= (part & 0x7F) << shift
+                        shift += 7
+                        if not part & 0x80:
+                            break
+                recording.append(byte & 0x0F, count)
+        except IndexError:
+            raise ReplayError("录像数据被截断")
+        if recording.ticks != ticks:
+            raise ReplayError("录像步数与文件头不一致")
+        return recording
+
+    # 文本脚本：注释以 # 开头，"level"/"skin"/"hz" 行设置文件头，其余每行为 "步数 按键"
+    def to_text(self) -> str:
+        lines = [f"level {self.level_num}", f"skin {self.skin_name}", f"hz {self.sim_hz}"]
+        for inputs, count in self.runs:
+            keys = "".join(letter for letter, bit in INPUT_LETTERS if inputs & bit)
+            lines.append(f"{count} {keys or '-'}")
+        return "\n".join(lines) + "\n"
+
+    @classmethod
+    def from_text(cls, text: str) -> "Recording":
+        recording = cls(0)
+        for line_number, line in enumerate(text.splitlines(), 1):
+            line = line.split("#", 1)[0].strip()
+            if not line:
+                continue
+            parts = line.split()
+            try:
+                if parts[0] == "level":
+                    recording.level_num = int(parts[1])
+                elif parts[0] == "skin":
+                    recording.skin_name = parts[1]
+                elif parts[0] == "hz":
+                    recording.sim_hz = int(parts[1])
+                else:
+                    inputs = 0
+                    for letter in (parts[1] if len(parts) > 1 else "-").upper():
+                        if letter == "-":
+                            continue
+                        inputs |= dict(INPUT_LETTERS)[letter]
+                    recording.append(inputs, int(parts[0]))
+            except (IndexError, KeyError, ValueError):
+                raise ReplayError(f"第{line_number}行无法解析: {line}")
+        return recording
+
+    def save(self, path: str):
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(path, "wb") as f:
+            f.write(self.to_bytes())
+
+    # 读取录像：按魔数区分二进制录像和文本脚本
+    @classmethod
+    def load(cls, path: str) -> "Recording":
+        with open(path, "rb") as f:
+            data = f.read()
+        if data.startswith(REPLAY_MAGIC):
+            return cls.from_bytes(data)
+        try:
+            text = data.decode("utf-8")
+        except UnicodeDecodeError:
+            raise ReplayError("录像脚本不是有效的 UTF-8")
+        return cls.from_text(text)
+
+
+# 每个关卡最近一次游戏的录像路径
+def last_run_path(level_num: int) -> str:
+    return resource_path(os.path.join(REPLAY_DIR, f"level_{level_num}_last.rpl"))
+
+
+# 回放：把录像中的输入逐步喂给模拟核心，直到出现结局或输入用完
+def replay(world, recording: Recording):
+    for inputs in recording.inputs():
+        world.step(inputs)
+        if world.outcome:
+            break
+    return world
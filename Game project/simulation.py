@@ -0,0 +1,449 @@
+from typing import Dict, List, Optional, Sequence, Tuple
+from spatial import SpatialGrid
+from hazards import HazardField
+from level_bake import LevelGeometry
+
+# 不依赖 pygame 的游戏逻辑核心：只有矩形、遮罩位图和实体记录，不访问任何 Surface。
+# 游戏界面用它驱动并渲染，也可以在没有显示器的机器上批量运行。
+
+SIM_HZ = 60                 # 模拟频率（每秒步数），速度、重力和各种计时器都按每步设定，因此是固定的
+WORLD_WIDTH = 800
+WORLD_HEIGHT = 600
+
+# 每一步的输入（按位组合）
+INPUT_LEFT = 1
+INPUT_RIGHT = 2
+INPUT_JUMP = 4
+INPUT_SKILL = 8
+
+# 玩家参数
+PLAYER_SPEED = 4
+BOOST_SPEED = 8
+MAX_FALL_SPEED = 20
+ITEM_DURATION = 300         # 道具效果持续的步数（5 秒）
+
+# 皮肤技能
+PUSH_SKIN = "皮肤2"         # 碰到路障会把它推开
+PUSH_OBSTACLE = "obstacle_2"
+PUSH_DISTANCE = 50
+
+# 结局
+OUTCOME_GOAL = "level_complete"
+OUTCOME_FAIL = "game_over"
+
+
+# 与 pygame.Rect 相同的取整方式（四舍五入，.5 远离零）
+def round_half_away(value) -> int:
+    if value >= 0:
+        return int(value + 0.5)
+    return -int(0.5 - value)
+
+
+# 纯数据矩形，碰撞判定与 pygame.Rect 一致，left/right/top/bottom 供网格索引使用
+class Box:
+    __slots__ = ("x", "y", "w", "h")
+
+    def __init__(self, x: int, y: int, w: int, h: int):
+        self.x = x
+        self.y = y
+        self.w = w
+        self.h = h
+
+    @classmethod
+    def of(cls, rect) -> "Box":
+        x, y, w, h = rect
+        return cls(x, y, w, h)
+
+    @property
+    def left(self):
+        return self.x
+
+    @property
+    def top(self):
+        return self.y
+
+    @property
+    def right(self):
+        return self.x + self.w
+
+    @property
+    def bottom(self):
+        return self.y + self.h
+
+    def colliderect(self, other: "Box") -> bool:
+        return (self.w > 0 and self.h > 0 and other.w > 0 and other.h > 0
+                and self.x < other.x + other.w and other.x < self.x + self.w
+                and self.y < other.y + other.h and other.y < self.y + self.h)
+
+    def __iter__(self):
+        return iter((self.x, self.y, self.w, self.h))
+
+    def __repr__(self):
+        return f"Box({self.x}, {self.y}, {self.w}, {self.h})"
+
+
+# 遮罩位图：每行一个整数，第 x 位表示该列像素不透明
+class BitMask:
+    __slots__ = ("width", "height", "rows")
+
+    def __init__(self, width: int, height: int, rows: Sequence[int]):
+        self.width = width
+        self.height = height
+        self.rows = tuple(rows)
+
+    # 从 pygame.mask.Mask（或任何有 get_size/get_at 的对象）转换，只在加载关卡时做一次
+    @classmethod
+    def from_mask(cls, mask) -> "BitMask":
+        width, height = mask.get_size()
+        rows = []
+        for y in range(height):
+            row = 0
+            for x in range(width):
+                if mask.get_at((x, y)):
+                    row |= 1 << x
+            rows.append(row)
+        return cls(width, height, rows)
+
+    # other 的左上角位于 offset 时两张遮罩是否有重叠像素（与 Mask.overlap 的判定一致）
+    def overlap(self, other: "BitMask", offset: Tuple[int, int]) -> bool:
+        dx, dy = offset
+        start = max(0, dy)
+        end = min(self.height, other.height + dy)
+        rows = self.rows
+        other_rows = other.rows
+        for y in range(start, end):
+            row = other_rows[y - dy]
+            if not row:
+                continue
+            if dx >= 0:
+                row <<= dx
+            else:
+                row >>= -dx
+            if rows[y] & row:
+                return True
+        return False
+
+
+# 同一张遮罩只转换一次（保存遮罩对象本身，避免 id 被复用）
+_bitmasks: Dict[int, Tuple[object, BitMask]] = {}
+
+
+def bitmask_of(mask) -> BitMask:
+    entry = _bitmasks.get(id(mask))
+    if entry is None or entry[0] is not mask:
+        entry = (mask, BitMask.from_mask(mask))
+        _bitmasks[id(mask)] = entry
+    return entry[1]
+
+
+# 玩家记录
+class PlayerState:
+    __slots__ = ("box", "vel_x", "vel_y", "speed", "jump_strength", "gravity", "on_ground", "facing_right",
+                 "move_frame", "move_animation_speed", "frame_index", "speed_up_timer", "invincible",
+                 "invincible_timer", "freeze_timer", "freeze_duration", "has_card")
+
+    def __init__(self, box: Box, speed: int = PLAYER_SPEED, jump_strength: float = -15, gravity: float = 0.68, move_animation_speed: int = 10):
+        self.box = box
+        self.vel_x = 0
+        self.vel_y = 0
+        self.speed = speed
+        self.jump_strength = jump_strength
+        self.gravity = gravity
+        self.on_ground = False
+        self.facing_right = True
+        self.move_frame = 0
+        self.move_animation_speed = move_animation_speed
+        self.frame_index = -1           # 当前动画帧：-1 为静止帧，否则为移动帧下标
+        self.speed_up_timer = 0
+        self.invincible = False
+        self.invincible_timer = 0
+        self.freeze_timer = 0
+        self.freeze_duration = 0
+        self.has_card = False
+
+
+# 道具、金币等只需要矩形的记录
+class PickupState:
+    __slots__ = ("box", "kind", "alive", "ref")
+
+    def __init__(self, box: Box, kind: str = "", ref=None):
+        self.box = box
+        self.kind = kind
+        self.alive = True
+        self.ref = ref
+
+
+# 主动技能的规则：持续步数、从释放到可以再次释放的步数，以及技能期间不造成伤害的障碍物类型
+class SkillRule:
+    __slots__ = ("duration", "cooldown", "immune")
+
+    def __init__(self, duration: int, cooldown: int, immune: Sequence[str] = ()):
+        self.duration = duration
+        self.cooldown = cooldown
+        self.immune = frozenset(immune)
+
+    # 由皮肤数据中的技能配置生成，没有配置时返回 None
+    @classmethod
+    def of(cls, config: Optional[Dict]) -> Optional["SkillRule"]:
+        if not config:
+            return None
+        return cls(config["duration"], config["cooldown"], config.get("immune", ()))
+
+
+# 一局游戏的完整状态，每次 step() 推进一步
+class World:
+    def __init__(self, geometry: LevelGeometry, player: PlayerState, player_masks, hazards: HazardField,
+                 items: List[PickupState], coins: List[PickupState], goal: Optional[Box], time_limit: float,
+                 skin_name: str = "default", skill: Optional[SkillRule] = None):
+        self.geometry = geometry        # 合并后的平台矩形和占用位图
+        self.platforms = SpatialGrid.from_rects(Box.of(rect) for rect in geometry.rects)
+        self.player = player
+        # 玩家遮罩：(静止帧遮罩, [移动帧遮罩...])，每项按 [是否朝右] 取
+        self.idle_masks, self.move_masks = player_masks
+        self.hazards = hazards          # 障碍物数组
+        self.items = items
+        self.coins = coins
+        self.goal = goal
+        self.total_coins = len(coins)
+        self.time_limit = time_limit
+        self.skin_name = skin_name
+        self.skill = skill              # 皮肤的主动技能，None 表示没有
+        self.sim_hz = SIM_HZ
+        self.step_time = 1 / SIM_HZ
+        self.tick = 0
+        self.game_time = 0
+        self.skill_ready = True
+        self.skill_start = 0            # 释放技能时的步数
+        self.skill_active = False
+        self.outcome = None             # None 为进行中，否则为 OUTCOME_GOAL / OUTCOME_FAIL
+        self.death_cause = None         # "obstacle" / "timeout" / "fall"
+        self.events = []                # 本步发生的事件（播放音效等由界面处理）
+        self.removed = []               # 本步被移除的实体对应的精灵（ref）
+
+    # 从已经构建好的关卡和玩家精灵生成（只读取矩形、遮罩和参数）；
+    # skill 为技能配置（持续、冷却步数和免疫的障碍物类型），默认使用玩家皮肤的配置
+    @classmethod
+    def from_level(cls, level, player, skill: Optional[Dict] = None) -> "World":
+        state = PlayerState(Box.of(player.rect), player.speed, player.jump_strength, player.gravity, player.move_animation_speed)
+        idle_masks = tuple(bitmask_of(mask) for mask in player.frames.idle.masks)
+        move_masks = [tuple(bitmask_of(mask) for mask in frame.masks) for frame in player.frames.move]
+        hazards = HazardField()
+        for sprite in level.obstacles:
+            index = hazards.add(sprite.rect, sprite.obstacle_type, bitmask_of(sprite.mask), sprite.move_pattern,
+                                sprite.move_speed, sprite.move_distance, ref=sprite)
+            sprite.bind(hazards, index)     # 精灵从数组中读取位置
+        hazards.pack()
+        items = [PickupState(Box.of(sprite.rect), sprite.item_type, sprite) for sprite in level.items]
+        coins = [PickupState(Box.of(sprite.rect), "coin", sprite) for sprite in level.coins]
+        goal = Box.of(level.goal.rect) if level.goal else None
+        world = cls(level.geometry, state, (idle_masks, move_masks), hazards, items, coins, goal,
+                    level.time_limit, player.skin_name, SkillRule.of(skill or player.skill))
+        level.bind_world(world)         # 关卡在运行时改变平台或终点时通知模拟核心
+        return world
+
+    @property
+    def coins_collected(self) -> int:
+        return self.total_coins - len(self.coins)
+
+    # 更换平台的碰撞几何（运行时加入或移除平台后），重新建立网格索引
+    def set_geometry(self, geometry: LevelGeometry):
+        self.geometry = geometry
+        self.platforms = SpatialGrid.from_rects(Box.of(rect) for rect in geometry.rects)
+
+    # 更换终点位置，rect 为 None 时关卡没有终点
+    def set_goal(self, rect):
+        self.goal = Box.of(rect) if rect is not None else None
+
+    # 某一点是否在平台内部（查占用位图，只有部分占用的格子才检查矩形）
+    def solid_at(self, x: float, y: float) -> bool:
+        return self.geometry.solid_at(x, y)
+
+    # 推进一步
+    def step(self, inputs: int = 0):
+        self.events = []
+        self.removed = []
+        self.tick += 1
+        self.game_time = self.tick * self.step_time
+        player = self.player
+
+        # 玩家移动控制
+        if inputs & INPUT_LEFT:
+            player.vel_x = -player.speed
+            player.facing_right = False
+        elif inputs & INPUT_RIGHT:
+            player.vel_x = player.speed
+            player.facing_right = True
+        else:
+            player.vel_x = 0
+        if inputs & INPUT_JUMP and player.on_ground:
+            player.vel_y = player.jump_strength
+            self.events.append("jump")
+
+        # 释放技能
+        if inputs & INPUT_SKILL and self.skill and self.skill_ready:
+            self.skill_ready = False
+            self.skill_start = self.tick
+            self.events.append("skill")
+
+        self._update_player()
+        self.hazards.step()
+        self._check_hazards()
+
+        # 道具
+        for item in self._collide(self.items):
+            self._apply_item(item)
+
+        # 到达终点
+        if self.goal and player.box.colliderect(self.goal):
+            self._finish(OUTCOME_GOAL)
+
+        # 超时或掉落
+        if self.game_time > self.time_limit:
+            self._finish(OUTCOME_FAIL, "timeout")
+        elif player.box.y > WORLD_HEIGHT:
+            self._finish(OUTCOME_FAIL, "fall")
+
+        # 技能计时
+        if not self.skill_ready:
+            elapsed = self.tick - self.skill_start
+            self.skill_active = elapsed < self.skill.duration
+            if elapsed >= self.skill.cooldown:
+                self.skill_ready = True
+
+    # 同一步中后发生的结局覆盖先前的结局（与原来的游戏循环一致）
+    def _finish(self, outcome: str, cause: Optional[str] = None):
+        self.outcome = outcome
+        self.death_cause = cause if outcome == OUTCOME_FAIL else None
+
+    # 玩家物理：冻结、重力、平台碰撞、金币、计时器和动画帧
+    def _update_player(self):
+        player = self.player
+        box = player.box
+        if player.freeze_timer > 0:
+            player.freeze_timer -= 1
+            if player.freeze_timer == 0:
+                player.freeze_duration = 0
+
+        if player.freeze_timer <= 0:
+            player.vel_y += player.gravity
+            if player.vel_y > MAX_FALL_SPEED:
+                player.vel_y = MAX_FALL_SPEED
+
+            vel_x = player.vel_x
+            box.x = round_half_away(box.x + vel_x)
+            self._collide_platforms(vel_x, 0)
+
+            vel_y = player.vel_y
+            box.y = round_half_away(box.y + vel_y)
+            player.on_ground = False
+            self._collide_platforms(0, vel_y)
+
+        # 金币
+        for coin in self._collide(self.coins):
+            self.events.append("coin")
+
+        if player.speed_up_timer > 0:
+            player.speed_up_timer -= 1
+            if player.speed_up_timer == 0:
+                player.speed = PLAYER_SPEED
+
+        if player.invincible_timer > 0:
+            player.invincible_timer -= 1
+            if player.invincible_timer == 0:
+                player.invincible = False
+
+        # 动画帧（碰撞遮罩随帧变化）
+        if player.vel_x != 0:
+            count = len(self.move_masks)
+            if count > 1:
+                player.move_frame = (player.move_frame + 1) % (count * player.move_animation_speed)
+                player.frame_index = player.move_frame // player.move_animation_speed
+            else:
+                player.frame_index = 0
+        else:
+            player.frame_index = -1
+
+    # 平台碰撞：移动范围在占用位图中全是空格时直接返回（空中的玩家不查矩形，也就不会落地）；
+    # 否则只检查网格中与移动范围重叠的平台，按顺序修正位置
+    def _collide_platforms(self, vel_x, vel_y):
+        player = self.player
+        box = player.box
+        back_x = round_half_away(vel_x)
+        back_y = round_half_away(vel_y)
+        sweep = Box(min(box.x, box.x - back_x) - 1, min(box.y, box.y - back_y) - 1,
+                    box.w + abs(back_x) + 2, box.h + abs(back_y) + 2)
+        if self.geometry.region_empty(sweep.x, sweep.y, sweep.w, sweep.h):
+            return
+        for platform in self.platforms.query(sweep):
+            if box.colliderect(platform):
+                if vel_x > 0:
+                    box.x = platform.x - box.w
+                    player.vel_x = 0
+                if vel_x < 0:
+                    box.x = platform.x + platform.w
+                    player.vel_x = 0
+                if vel_y > 0:
+                    box.y = platform.y - box.h
+                    player.vel_y = 0
+                    player.on_ground = True
+                if vel_y < 0:
+                    box.y = platform.y + platform.h
+                    player.vel_y = 0
+
+    # 当前帧的玩家遮罩
+    def player_mask(self) -> BitMask:
+        player = self.player
+        if player.frame_index < 0:
+            return self.idle_masks[player.facing_right]
+        return self.move_masks[player.frame_index][player.facing_right]
+
+    # 危险物：矩形粗筛（整批数组比较）后用遮罩逐像素判断
+    def _check_hazards(self):
+        player = self.player
+        box = player.box
+        mask = self.player_mask()
+        hazards = self.hazards
+        for index in hazards.overlapping(box.x, box.y, box.w, box.h):
+            x, y = hazards.position(index)
+            if not mask.overlap(hazards.masks[index], (x - box.x, y - box.y)):
+                continue
+            obstacle_type = hazards.types[index]
+            if self.skin_name == PUSH_SKIN and obstacle_type == PUSH_OBSTACLE:
+                x = hazards.push(index, PUSH_DISTANCE)
+                self.events.append("push")
+                if x > WORLD_WIDTH:
+                    hazards.remove(index)
+                    self.removed.append(hazards.refs[index])
+            elif self.skill_active and obstacle_type in self.skill.immune:
+                pass
+            elif not player.invincible:
+                self._finish(OUTCOME_FAIL, "obstacle")
+
+    # 与玩家矩形重叠的记录，从列表中移除后返回
+    def _collide(self, records: List) -> List:
+        box = self.player.box
+        hits = [record for record in records if box.colliderect(record.box)]
+        for record in hits:
+            self._remove(records, record)
+        return hits
+
+    def _remove(self, records: List, record):
+        records.remove(record)
+        record.alive = False
+        self.removed.append(record.ref)
+
+    # 道具效果
+    def _apply_item(self, item: PickupState):
+        player = self.player
+        if item.kind == "speed_up":
+            player.speed = BOOST_SPEED
+            player.speed_up_timer = ITEM_DURATION
+        elif item.kind == "invincible":
+            player.invincible = True
+            player.invincible_timer = ITEM_DURATION
+        elif item.kind == "canteen":
+            player.freeze_timer = ITEM_DURATION
+            player.freeze_duration = ITEM_DURATION
+        elif item.kind == "card":
+            player.has_card = True
+        self.events.append("item:" + item.kind)
@@ -0,0 +1,164 @@
+import pygame
+from typing import Dict, Iterable, List, Tuple
+from assets import surface_cache
+
+PLACEHOLDER_COLOR = (255, 100, 100)
+BLINK_ALPHA = 128   # 无敌闪烁时的透明度
+
+
+# 一帧动画的全部变体：朝右/朝左、正常/闪烁，以及对应的碰撞遮罩
+class AnimationFrame:
+    def __init__(self, image: pygame.Surface):
+        left = pygame.transform.flip(image, True, False)
+        right_blink = image.copy()
+        right_blink.set_alpha(BLINK_ALPHA)
+        left_blink = left.copy()
+        left_blink.set_alpha(BLINK_ALPHA)
+        # 按 [是否朝右][是否闪烁] 取图，按 [是否朝右] 取遮罩
+        self.images = ((left, left_blink), (image, right_blink))
+        self.masks = (pygame.mask.from_surface(left), pygame.mask.from_surface(image))
+        self.width = image.get_width()
+
+
+# 皮肤的动画帧表，加载皮肤时构建一次
+class FrameTable:
+    def __init__(self, idle_image: pygame.Surface, move_images: List[pygame.Surface]):
+        self.idle = AnimationFrame(idle_image)
+        self.move = [AnimationFrame(image) for image in move_images]
+        self.width = self.idle.width
+
+
+# 皮肤资源库：游戏中只加载当前选中皮肤的帧，皮肤界面只为可见的皮肤生成小尺寸预览
+class SkinLibrary:
+    def __init__(self, skin_paths: Dict[str, Dict]):
+        self.skin_paths = skin_paths
+        self._frames = {}       # (皮肤名, 高度) -> FrameTable
+        self._previews = {}     # (皮肤名, 尺寸) -> 预览帧列表
+
+    # 皮肤用到的全部图片路径
+    def skin_files(self, skin_name: str) -> List[str]:
+        skin_data = self.skin_paths.get(skin_name, self.skin_paths["default"])
+        files = []
+        for paths in (skin_data["idle"], skin_data["move"]):
+            files.extend(paths if isinstance(paths, list) else [paths])
+        return files
+
+    # 获取皮肤的游戏帧，换皮肤时释放之前皮肤的帧
+    def load(self, skin_name: str, height: int) -> FrameTable:
+        key = (skin_name, height)
+        frames = self._frames.get(key)
+        if frames is None:
+            for loaded_name, loaded_height in list(self._frames):
+                if loaded_name != skin_name:
+                    self.release(loaded_name)
+            frames = FrameTable(*self._load_skin(skin_name, height))
+            self._frames[key] = frames
+        return frames
+
+    # 加载皮肤
+    def _load_skin(self, skin_name: str, height: int):
+        """加载皮肤并按原始比例调整尺寸"""
+        skin_data = self.skin_paths.get(skin_name, self.skin_paths["default"])
+
+        # 加载静止图片
+        try:
+            idle_image = self._load_frame(skin_data["idle"], height)
+        except:
+            try:
+                original_width, original_height = surface_cache.original_size(self.skin_paths["default"]["idle"])
+                if original_height == 0:  # 防止除零错误
+                    ratio = 1
+                else:
+                    ratio = original_width / original_height
+                new_width = int(height * ratio)
+                idle_image = pygame.Surface((new_width, height))
+                idle_image.fill(PLACEHOLDER_COLOR)  # 默认颜色
+            except:
+                idle_image = pygame.Surface((30, height))
+                idle_image.fill(PLACEHOLDER_COLOR)  # 默认颜色
+
+        # 加载移动图片
+        move_images = []
+        try:
+            # 检查移动资源是单个路径还是路径列表
+            if isinstance(skin_data["move"], list):
+                # 处理路径列表
+                for path in skin_data["move"]:
+                    try:
+                        move_images.append(self._load_frame(path, height))
+                    except Exception as e:
+                        print(f"加载移动动画帧失败: {e}")
+                        # 如果加载失败，创建一个默认帧
+                        default_frame = pygame.Surface((30, height))
+                        default_frame.fill(PLACEHOLDER_COLOR)
+                        move_images.append(default_frame)
+            else:
+                # 处理单个路径
+                move_images.append(self._load_frame(skin_data["move"], height))
+        except Exception as e:
+            print(f"加载移动图片失败: {e}")
+            # 如果加载失败，创建一个默认帧
+            default_frame = pygame.Surface((30, height))
+            default_frame.fill(PLACEHOLDER_COLOR)
+            move_images.append(default_frame)
+
+        return idle_image, move_images
+
+    # 从图片缓存（图集）中取出一帧，并按预设高度和原始比例缩放
+    def _load_frame(self, path: str, height: int) -> pygame.Surface:
+        original_width, original_height = surface_cache.original_size(path)
+        if original_height == 0:  # 防止除零错误
+            ratio = 1
+        else:
+            ratio = original_width / original_height
+        new_width = int(height * ratio)
+        return surface_cache.get(path, (new_width, height), smooth=False)
+
+    # 皮肤界面的动画预览帧（小尺寸，按需生成并缓存）
+    def preview_frames(self, skin_name: str, size: Tuple[int, int]) -> List[pygame.Surface]:
+        key = (skin_name, tuple(size))
+        frames = self._previews.get(key)
+        if frames is not None:
+            return frames
+
+        skin_data = self.skin_paths[skin_name]
+        frames = []
+        # 检查移动资源是单张图片还是列表
+        if isinstance(skin_data["move"], list):
+            # 有多个移动帧，加载所有帧
+            for path in skin_data["move"]:
+                try:
+                    frames.append(surface_cache.get(path, size, smooth=False))
+                except:
+                    pass  # 如果加载失败，跳过该帧
+
+        if not frames:
+            # 如果没有动画帧或加载失败，使用静止图像或默认图像
+            try:
+                idle = skin_data["idle"] if isinstance(skin_data["idle"], str) else skin_data["idle"][0]
+                frames.append(surface_cache.get(idle, size, smooth=False))
+            except:
+                # 创建默认帧
+                frame = pygame.Surface(size)
+                frame.fill(PLACEHOLDER_COLOR)
+                frames.append(frame)
+
+        self._previews[key] = frames
+        return frames
+
+    # 离开皮肤界面时释放预览帧和缓存中的原图，keep 中的皮肤保留
+    def release_previews(self, keep: Iterable[str] = ()):
+        keep = set(keep)
+        for key in list(self._previews):
+            if key[0] not in keep:
+                del self._previews[key]
+                for path in self.skin_files(key[0]):
+                    surface_cache.evict(path)
+
+    # 释放某个皮肤的游戏帧以及缓存中的原图
+    def release(self, skin_name: str):
+        for key in list(self._frames):
+            if key[0] == skin_name:
+                del self._frames[key]
+        for path in self.skin_files(skin_name):
+            surface_cache.evict(path)
@@ -0,0 +1,474 @@
+import argparse
+import os
+import sys
+import time
+from typing import Callable, Dict, List, Optional
+from simulation import (World, SIM_HZ, WORLD_HEIGHT, INPUT_LEFT, INPUT_RIGHT, INPUT_JUMP,
+                        PLAYER_SPEED, BOOST_SPEED, MAX_FALL_SPEED, ITEM_DURATION, PUSH_SKIN, PUSH_OBSTACLE,
+                        OUTCOME_GOAL, round_half_away)
+from level_bake import LEVEL_COUNT
+from replay import Recording, replay
+
+# 关卡可解性搜索：在量化后的状态空间里做广度优先搜索（按时间分层），用访问表去重。
+# 搜索使用与模拟核心相同规则的精简物理，找到的路线再交给模拟核心回放验证。
+# 决策每 MACRO_STEPS 步才换一次输入，量化又会合并相近的状态，所以找到的最少步数是真实最少步数的上界，
+# 金币数是真实最多金币的下界（拿到全部金币时就是准确值）。
+
+MACRO_STEPS = 4             # 每个决策保持输入的步数
+POSITION_QUANTUM = 8        # 位置量化（像素）
+VELOCITY_QUANTUM = 4        # 竖直速度量化（像素/步）
+TIMER_QUANTUM = 60          # 道具计时器量化（步）
+PHASE_QUANTUM = 20          # 障碍物巡逻相位量化（步）
+
+# 每个决策可选的输入（跳跃只在落地时有意义）
+GROUND_ACTIONS = (0, INPUT_LEFT, INPUT_RIGHT, INPUT_JUMP, INPUT_JUMP | INPUT_LEFT, INPUT_JUMP | INPUT_RIGHT)
+AIR_ACTIONS = (0, INPUT_LEFT, INPUT_RIGHT)
+
+
+# 搜索结果
+class SolveResult:
+    def __init__(self, level_num: int, skin_name: str):
+        self.level_num = level_num
+        self.skin_name = skin_name
+        self.reachable = False
+        self.min_frames = None          # 找到的最快路线的步数（真实最少步数的上界）
+        self.coins_found = 0            # 找到的路线最多能带到终点的金币（真实最多金币的下界）
+        self.total_coins = 0
+        self.coins_searched = False     # 是否做过金币搜索（否则 coins_found 只是最快路线顺路拿到的）
+        self.states = 0                 # 访问过的量化状态数
+        self.seconds = 0.0
+        self.recording = None           # 最快路线的输入录像
+        self.coin_recording = None      # 金币最多路线的输入录像（与最快路线相同时为 None）
+        self.verified = None            # 模拟核心回放是否得到相同结果
+
+    # 拿到全部金币时下界就是准确的最多金币数
+    @property
+    def coins_exact(self) -> bool:
+        return self.coins_found == self.total_coins
+
+    def to_dict(self) -> Dict:
+        return {
+            "level": self.level_num,
+            "skin": self.skin_name,
+            "reachable": self.reachable,
+            "min_frames": self.min_frames,
+            "coins_found": self.coins_found,
+            "total_coins": self.total_coins,
+            "coins_searched": self.coins_searched,
+            "coins_exact": self.coins_exact,
+            "states": self.states,
+            "seconds": round(self.seconds, 3),
+            "verified": self.verified,
+        }
+
+
+# 障碍物在一个巡逻周期内每一步的位置（只依赖步数，皮肤2推开的路障对它无害，不影响结果）
+def hazard_timeline(world: World):
+    hazards = world.hazards
+    count = len(hazards)
+    start = [hazards.position(i) for i in range(count)]
+    timeline = [start]
+    period = 1
+    if any(hazards.axis[i] for i in range(count)):
+        while True:
+            hazards.step()
+            positions = [hazards.position(i) for i in range(count)]
+            if positions == start and all(hazards.counter[i] == 0 and hazards.direction[i] == 1 for i in range(count)):
+                break
+            timeline.append(positions)
+            period += 1
+    return timeline, period
+
+
+# 精简物理：与 World.step 的规则一一对应，但状态只是一个元组
+class LevelModel:
+    def __init__(self, world: World, skin_name: str):
+        player = world.player
+        self.world = world
+        # 关卡里的平台不多，直接按顺序遍历比网格查询更快（顺序与 World 一致）
+        self.platforms = [tuple(rect) for rect in world.platforms.rects]
+        self.w = player.box.w
+        self.h = player.box.h
+        self.jump_strength = player.jump_strength
+        self.gravity = player.gravity
+        self.move_animation_speed = player.move_animation_speed
+        self.idle_masks = world.idle_masks
+        self.move_masks = world.move_masks
+        self.coins = [tuple(coin.box) for coin in world.coins]
+        self.items = [(tuple(item.box), item.kind) for item in world.items]
+        self.goal = tuple(world.goal) if world.goal else None
+        self.time_limit = world.time_limit      # 时间限制（秒）
+        self.sim_hz = world.sim_hz
+        self.step_time = world.step_time
+        hazards = world.hazards
+        # 对当前皮肤有威胁的障碍物：(宽, 高, 遮罩, 下标)
+        self.hazards = [(int(hazards.w[i]), int(hazards.h[i]), hazards.masks[i], i) for i in range(len(hazards))
+                        if not (skin_name == PUSH_SKIN and hazards.types[i] == PUSH_OBSTACLE)]
+        self.timeline, self.period = hazard_timeline(world)
+
+    # 初始状态：(x, y, vel_y, on_ground, facing_right, move_frame, speed_timer, invincible_timer, freeze_timer, 剩余金币位, 剩余道具位)
+    def initial(self, world: World):
+        box = world.player.box
+        return (box.x, box.y, 0, False, True, 0, 0, 0, 0, (1 << len(self.coins)) - 1, (1 << len(self.items)) - 1)
+
+    # 推进一步，返回 (新状态, 结局)；结局为 None / OUTCOME_GOAL / "dead"
+    def step(self, state, inputs: int, tick: int):
+        x, y, vel_y, on_ground, facing, move_frame, speed_t, inv_t, freeze_t, coins, items = state
+        w, h = self.w, self.h
+        speed = BOOST_SPEED if speed_t > 0 else PLAYER_SPEED
+        if inputs & INPUT_LEFT:
+            vel_x = -speed
+            facing = False
+        elif inputs & INPUT_RIGHT:
+            vel_x = speed
+            facing = True
+        else:
+            vel_x = 0
+        if inputs & INPUT_JUMP and on_ground:
+            vel_y = self.jump_strength
+
+        if freeze_t > 0:
+            freeze_t -= 1
+        if freeze_t <= 0:
+            vel_y += self.gravity
+            if vel_y > MAX_FALL_SPEED:
+                vel_y = MAX_FALL_SPEED
+            move_x = vel_x
+            x = round_half_away(x + move_x)
+            if move_x:
+                for px, py, pw, ph in self.platforms:
+                    if x < px + pw and px < x + w and y < py + ph and py < y + h:
+                        x = px - w if move_x > 0 else px + pw
+                        vel_x = 0
+            move_y = vel_y
+            y = round_half_away(y + move_y)
+            on_ground = False
+            for px, py, pw, ph in self.platforms:
+                if x < px + pw and px < x + w and y < py + ph and py < y + h:
+                    if move_y > 0:
+                        y = py - h
+                        vel_y = 0
+                        on_ground = True
+                    elif move_y < 0:
+                        y = py + ph
+                        vel_y = 0
+
+        # 金币
+        if coins:
+            for i, (cx, cy, cw, ch) in enumerate(self.coins):
+                if coins >> i & 1 and x < cx + cw and cx < x + w and y < cy + ch and cy < y + h:
+                    coins &= ~(1 << i)
+
+        if speed_t > 0:
+            speed_t -= 1
+        if inv_t > 0:
+            inv_t -= 1
+
+        # 动画帧（决定碰撞遮罩）
+        if vel_x != 0:
+            count = len(self.move_masks)
+            if count > 1:
+                move_frame = (move_frame + 1) % (count * self.move_animation_speed)
+                mask = self.move_masks[move_frame // self.move_animation_speed][facing]
+            else:
+                mask = self.move_masks[0][facing]
+        else:
+            mask = self.idle_masks[facing]
+
+        outcome = None
+        # 障碍物
+        if inv_t <= 0:
+            positions = self.timeline[tick % self.period]
+            for hw, hh, hazard_mask, i in self.hazards:
+                hx, hy = positions[i]
+                if x < hx + hw and hx < x + w and y < hy + hh and hy < y + h and mask.overlap(hazard_mask, (hx - x, hy - y)):
+                    outcome = "dead"
+                    break
+
+        # 道具
+        if items:
+            for i, ((ix, iy, iw, ih), kind) in enumerate(self.items):
+                if items >> i & 1 and x < ix + iw and ix < x + w and y < iy + ih and iy < y + h:
+                    items &= ~(1 << i)
+                    if kind == "speed_up":
+                        speed_t = ITEM_DURATION
+                    elif kind == "invincible":
+                        inv_t = ITEM_DURATION
+                    elif kind == "canteen":
+                        freeze_t = ITEM_DURATION
+
+        goal = self.goal
+        if goal and x < goal[0] + goal[2] and goal[0] < x + w and y < goal[1] + goal[3] and goal[1] < y + h:
+            outcome = OUTCOME_GOAL
+        if tick * self.step_time > self.time_limit or y > WORLD_HEIGHT:
+            outcome = "dead"
+
+        return (x, y, vel_y, on_ground, facing, move_frame, speed_t, inv_t, freeze_t, coins, items), outcome
+
+    # 访问表的键：量化后的位置、速度和计时器，以及障碍物相位；
+    # 不含金币，金币搜索在同一个键下另外比较已拿到的金币集合
+    def key(self, state, tick: int):
+        x, y, vel_y, on_ground, facing, move_frame, speed_t, inv_t, freeze_t, coins, items = state
+        phase = (tick % self.period) // PHASE_QUANTUM if self.period > 1 else 0
+        return (x // POSITION_QUANTUM, y // POSITION_QUANTUM, int(vel_y // VELOCITY_QUANTUM), on_ground,
+                -(-speed_t // TIMER_QUANTUM), -(-inv_t // TIMER_QUANTUM), -(-freeze_t // TIMER_QUANTUM), items, phase)
+
+
+def _coin_count(mask: int) -> int:
+    return bin(mask).count("1")
+
+
+# 沿父节点回溯出逐步输入：最后一个决策只保持 last_steps 步
+def _route(parents, actions, node: int, last_steps: int) -> List[int]:
+    chain = []
+    while parents[node] >= 0:
+        chain.append(actions[node])
+        node = parents[node]
+    chain.reverse()
+    inputs = []
+    for index, action in enumerate(chain):
+        steps = last_steps if index == len(chain) - 1 else MACRO_STEPS
+        inputs.append(action)
+        inputs.extend([action & ~INPUT_JUMP] * (steps - 1))
+    return inputs
+
+
+# 展开一个决策：保持输入 MACRO_STEPS 步（跳跃只在第一步按下），遇到结局提前停止。
+# 返回 (结束状态, 结局, 实际步数)
+def _advance(model: LevelModel, state, action: int, tick: int):
+    inputs = action
+    outcome = None
+    for offset in range(1, MACRO_STEPS + 1):
+        state, outcome = model.step(state, inputs, tick + offset)
+        inputs &= ~INPUT_JUMP
+        if outcome:
+            break
+    return state, outcome, offset
+
+
+# 从某个状态出发按时间分层做广度优先搜索，直到到达终点（target="goal"）或拿到新的金币（target="coin"）。
+# accept 可以否决找到的结果（例如拿到金币后已经无法到达终点），搜索会继续寻找下一个。
+# 返回 (逐步输入列表, 结束状态, 结束步数)，到时间限制仍未找到时返回 None
+def search(model: LevelModel, start, start_tick: int = 0, target: str = "goal",
+           accept: Optional[Callable] = None, stats: Optional[Dict] = None):
+    limit = int(model.time_limit * model.sim_hz) + 1
+    coins = start[9]
+    # 节点表：状态、父节点下标、到达该节点的输入
+    states = [start]
+    parents = [-1]
+    actions = [0]
+    visited = {model.key(start, start_tick)}
+    frontier = [0]
+    tick = start_tick
+    found = None
+    while frontier and tick < limit and found is None:
+        next_frontier = []
+        for node in frontier:
+            state = states[node]
+            for action in (GROUND_ACTIONS if state[3] else AIR_ACTIONS):
+                current = state
+                inputs = action
+                outcome = None
+                for offset in range(1, MACRO_STEPS + 1):
+                    current, outcome = model.step(current, inputs, tick + offset)
+                    inputs &= ~INPUT_JUMP   # 跳跃只在第一步按下
+                    if outcome or (target == "coin" and current[9] != coins):
+                        break
+                if outcome == "dead":
+                    continue
+                if outcome == OUTCOME_GOAL or (target == "coin" and current[9] != coins):
+                    # 找金币时不进入终点；被否决的结果也不再继续展开
+                    if (target == "goal") == (outcome == OUTCOME_GOAL) and (accept is None or accept(current, tick + offset)):
+                        states.append(current)
+                        parents.append(node)
+                        actions.append(action)
+                        found = (len(states) - 1, offset)
+                        break
+                    continue
+                key = model.key(current, tick + MACRO_STEPS)
+                if key in visited:
+                    continue
+                visited.add(key)
+                states.append(current)
+                parents.append(node)
+                actions.append(action)
+                next_frontier.append(len(states) - 1)
+            if found is not None:
+                break
+        frontier = next_frontier
+        tick += MACRO_STEPS
+    if stats is not None:
+        stats["states"] = stats.get("states", 0) + len(visited)
+    if found is None:
+        return None
+    node, last_steps = found
+    return _route(parents, actions, node, last_steps), states[node], tick - MACRO_STEPS + last_steps
+
+
+# 贪心收集金币：每次去最近的、拿到后仍能在时限内到达终点的金币。
+# 返回金币最多的 (逐步输入列表, 结束状态, 结束步数)，一个金币都拿不到时返回 None
+def greedy_coins(model: LevelModel, start, stats: Optional[Dict] = None):
+    best = None
+    prefix, state, tick = [], start, 0
+    while state[9]:
+        finish = []
+
+        def reaches_goal(candidate, candidate_tick):
+            route = search(model, candidate, candidate_tick, "goal", stats=stats)
+            finish[:] = [route] if route else []
+            return route is not None
+
+        step = search(model, state, tick, "coin", reaches_goal, stats)
+        if step is None:
+            break
+        prefix = prefix + step[0]
+        state, tick = step[1], step[2]
+        route = finish[0]
+        best = (prefix + route[0], route[1], route[2])
+    return best
+
+
+# 最多金币：在 (状态, 已拿金币集合) 上搜索。同一个键下，已拿金币是之前某个集合的子集的状态被支配，不再展开；
+# 到达终点的路线中取金币最多的，拿到全部金币时立即停止。返回值同 search()
+def search_coins(model: LevelModel, start, stats: Optional[Dict] = None):
+    limit = int(model.time_limit * model.sim_hz) + 1
+    all_coins = (1 << len(model.coins)) - 1
+    states = [start]
+    parents = [-1]
+    actions = [0]
+    visited = {model.key(start, 0): [0]}   # 键 -> 已拿金币集合（互不包含）
+    frontier = [0]
+    tick = 0
+    best = None     # (金币数, 节点, 最后决策的步数, 结束步数)
+    while frontier and tick < limit:
+        next_frontier = []
+        for node in frontier:
+            state = states[node]
+            for action in (GROUND_ACTIONS if state[3] else AIR_ACTIONS):
+                current, outcome, offset = _advance(model, state, action, tick)
+                if outcome == "dead":
+                    continue
+                collected = all_coins & ~current[9]
+                if outcome == OUTCOME_GOAL:
+                    coins = _coin_count(collected)
+                    if best is None or coins > best[0]:
+                        states.append(current)
+                        parents.append(node)
+                        actions.append(action)
+                        best = (coins, len(states) - 1, offset, tick + offset)
+                    continue
+                key = model.key(current, tick + MACRO_STEPS)
+                seen = visited.get(key)
+                if seen is None:
+                    visited[key] = [collected]
+                elif any(collected & ~other == 0 for other in seen):
+                    continue
+                else:
+                    seen[:] = [other for other in seen if other & ~collected] + [collected]
+                states.append(current)
+                parents.append(node)
+                actions.append(action)
+                next_frontier.append(len(states) - 1)
+            if best is not None and best[0] == len(model.coins):
+                break
+        if best is not None and best[0] == len(model.coins):
+            break
+        frontier = next_frontier
+        tick += MACRO_STEPS
+    if stats is not None:
+        stats["states"] = stats.get("states", 0) + sum(len(seen) for seen in visited.values())
+    if best is None:
+        return None
+    _, node, last_steps, end_tick = best
+    return _route(parents, actions, node, last_steps), states[node], end_tick
+
+
+# 把逐步输入保存成录像，并交给模拟核心回放，返回 (录像, 回放后的 World)
+def _verify(level_num: int, skin_name: str, inputs: List[int]):
+    from level import Level
+    from category import Player
+
+    recording = Recording(level_num, skin_name)
+    for mask in inputs:
+        recording.append(mask)
+    level = Level(level_num)
+    world = replay(World.from_level(level, Player(level.player_start_x, level.player_start_y, skin_name)), recording)
+    return recording, world
+
+
+# 搜索一个关卡：
+#   可达性与最少步数  从出生点搜索到终点（步数是上界）
+#   最多金币          collect_coins=True 时先走贪心路线，拿不全时再做带金币集合的搜索（金币数是下界），耗时明显更长
+def solve_level(level_num: int, skin_name: str = "default", verify: bool = True, collect_coins: bool = False) -> SolveResult:
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    from level import Level
+    from category import Player
+
+    start_time = time.perf_counter()
+    result = SolveResult(level_num, skin_name)
+    level = Level(level_num)
+    world = World.from_level(level, Player(level.player_start_x, level.player_start_y, skin_name))
+    model = LevelModel(world, skin_name)
+    start = model.initial(world)
+    result.total_coins = len(model.coins)
+    all_coins = (1 << len(model.coins)) - 1
+    stats = {}
+
+    fastest = search(model, start, stats=stats)
+    if fastest is not None:
+        result.reachable = True
+        result.min_frames = fastest[2]
+        result.coins_found = _coin_count(all_coins & ~fastest[1][9])
+        result.recording, replayed = _verify(level_num, skin_name, fastest[0])
+        verified = replayed.outcome == OUTCOME_GOAL and replayed.tick == result.min_frames
+
+        if collect_coins:
+            result.coins_searched = True
+            # 贪心路线拿到全部金币时已经是最多；否则再做带金币集合的完整搜索
+            richest = greedy_coins(model, start, stats)
+            if richest is None or richest[1][9]:
+                richest = search_coins(model, start, stats)
+            coins = _coin_count(all_coins & ~richest[1][9]) if richest else 0
+            if coins > result.coins_found:
+                result.coins_found = coins
+                result.coin_recording, replayed = _verify(level_num, skin_name, richest[0])
+                verified = verified and replayed.outcome == OUTCOME_GOAL and replayed.coins_collected == coins
+        if verify:
+            result.verified = verified
+
+    result.states = stats.get("states", 0)
+    result.seconds = time.perf_counter() - start_time
+    return result
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="关卡可解性搜索")
+    parser.add_argument("levels", nargs="*", type=int, help="要搜索的关卡（默认全部）")
+    parser.add_argument("--skin", default="default", help="玩家皮肤")
+    parser.add_argument("--coins", action="store_true", help="同时搜索能带到终点的最多金币（慢很多）")
+    parser.add_argument("--save-dir", help="把每关最快路线（和金币最多的路线）保存为录像（可用 main.py --replay 回放）")
+    args = parser.parse_args()
+
+    failed = 0
+    total_start = time.perf_counter()
+    for level_num in args.levels or range(LEVEL_COUNT):
+        result = solve_level(level_num, args.skin, collect_coins=args.coins)
+        if result.reachable:
+            status = f"可通关 | 最少 ≤{result.min_frames} 步 ({result.min_frames / SIM_HZ:.2f}秒)"
+            if not result.coins_searched:
+                status += f" | 最快路线金币 {result.coins_found}/{result.total_coins}"
+            elif result.coins_exact:
+                status += f" | 最多金币 {result.coins_found}/{result.total_coins}"
+            else:
+                status += f" | 最多金币 ≥{result.coins_found}/{result.total_coins}"
+            status += " | 回放验证通过" if result.verified else " | 回放验证失败"
+        else:
+            status = "无法通关"
+            failed += 1
+        print(f"第{level_num}关: {status} | {result.states} 个状态, {result.seconds:.2f}秒")
+        if args.save_dir and result.recording:
+            result.recording.save(os.path.join(args.save_dir, f"level_{level_num}_{args.skin}.rpl"))
+        if args.save_dir and result.coin_recording:
+            result.coin_recording.save(os.path.join(args.save_dir, f"level_{level_num}_{args.skin}_coins.rpl"))
+    print(f"总耗时 {time.perf_counter() - total_start:.2f}秒")
+    sys.exit(1 if failed else 0)
@@ -0,0 +1,105 @@
+import pygame
+import os
+import sys
+from typing import Dict, Tuple
+
+# 定义 resource_path 函数
+def resource_path(relative_path):
+    try:
+        base_path = sys._MEIPASS
+    except AttributeError:
+        base_path = os.path.abspath(".")
+    return os.path.join(base_path, relative_path)
+
+# 音效列表：名称 -> (文件路径, 分类)
+SOUND_EFFECTS = {
+    "manbo": (resource_path("resource/sound/manbo.mp3"), "player"),     # 皮肤1 跳跃
+    "ji": (resource_path("resource/sound/ji.mp3"), "item"),             # 拾取鸡哥
+    "dayun": (resource_path("resource/sound/dayun.mp3"), "obstacle"),   # 皮肤2 推开路障
+}
+
+# 每个分类预留的声道数量
+CATEGORY_CHANNELS = {
+    "player": 2,
+    "item": 2,
+    "obstacle": 2,
+}
+
+
+# 音效库：每个音效只解码一次，每个分类使用固定的一组预留声道
+class SoundBank:
+    def __init__(self, effects: Dict[str, Tuple[str, str]] = SOUND_EFFECTS, category_channels: Dict[str, int] = CATEGORY_CHANNELS):
+        self.effects = effects
+        self.category_channels = category_channels
+        self._sounds = {}       # 名称 -> Sound（加载失败为 None）
+        self._pools = {}        # 分类 -> 声道元组
+        self._next = {}         # 分类 -> 下一次使用的声道下标
+        self._ready = False
+
+    # 初始化声道并解码全部音效（在游戏启动时调用）
+    def preload(self):
+        if not self._setup_channels():
+            return
+        for name in self.effects:
+            self._load(name)
+
+    # 预留声道：分类依次占用前面的声道，自动分配的声音不会抢占它们
+    def _setup_channels(self) -> bool:
+        if self._ready:
+            return True
+        if not pygame.mixer.get_init():
+            return False
+        total = sum(self.category_channels.values())
+        if pygame.mixer.get_num_channels() < total + 2:
+            pygame.mixer.set_num_channels(total + 2)
+        pygame.mixer.set_reserved(total)
+        channel_id = 0
+        for category, count in self.category_channels.items():
+            self._pools[category] = tuple(pygame.mixer.Channel(channel_id + i) for i in range(count))
+            self._next[category] = 0
+            channel_id += count
+        self._ready = True
+        return True
+
+    # 解码单个音效
+    def _load(self, name: str):
+        try:
+            sound = pygame.mixer.Sound(self.effects[name][0])
+        except (pygame.error, FileNotFoundError) as e:
+            print(f"加载音效失败: {name} {e}")
+            sound = None
+        self._sounds[name] = sound
+        return sound
+
+    # 播放音效：优先使用分类中空闲的声道，全部占用时轮流覆盖最早的声道
+    def play(self, name: str):
+        if not self._ready and not self._setup_channels():
+            return
+        if name in self._sounds:
+            sound = self._sounds[name]
+        else:
+            sound = self._load(name)    # 第一次使用时才解码
+        if sound is None:
+            return
+        category = self.effects[name][1]
+        pool = self._pools[category]
+        start = self._next[category]
+        count = len(pool)
+        for offset in range(count):
+            index = (start + offset) % count
+            if not pool[index].get_busy():
+                break
+        else:
+            index = start
+        self._next[category] = (index + 1) % count
+        pool[index].play(sound)
+
+    # 停止所有音效
+    def stop_all(self):
+        for pool in self._pools.values():
+            for channel in pool:
+                channel.stop()
+
+
+# 全局音效库
+sound_bank = SoundBank()
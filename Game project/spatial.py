@@ -0,0 +1,64 @@
+from typing import Iterable, List
+
+# 默认网格大小（像素）
+DEFAULT_CELL_SIZE = 64
+
+
+# 静态物体的均匀网格索引：建立一次，按矩形查询只返回所在格子里的物体
+class SpatialGrid:
+    """rect 只需要有 left/top/right/bottom 属性（pygame.Rect 即可），查询结果保持插入顺序"""
+
+    def __init__(self, cell_size: int = DEFAULT_CELL_SIZE):
+        self.cell_size = cell_size
+        self.rects = []         # 按插入顺序保存的矩形
+        self._cells = {}        # (格子x, 格子y) -> 矩形下标列表
+        self._marks = []        # 去重用的查询编号，避免每次查询新建集合
+        self._query_id = 0
+
+    # 由一组矩形建立索引
+    @classmethod
+    def from_rects(cls, rects: Iterable, cell_size: int = DEFAULT_CELL_SIZE) -> "SpatialGrid":
+        grid = cls(cell_size)
+        for rect in rects:
+            grid.insert(rect)
+        return grid
+
+    def __len__(self):
+        return len(self.rects)
+
+    # 矩形覆盖的格子范围
+    def _cell_range(self, rect):
+        size = self.cell_size
+        return rect.left // size, rect.top // size, (rect.right - 1) // size, (rect.bottom - 1) // size
+
+    # 加入一个矩形
+    def insert(self, rect):
+        index = len(self.rects)
+        self.rects.append(rect)
+        self._marks.append(0)
+        left, top, right, bottom = self._cell_range(rect)
+        for cx in range(left, right + 1):
+            for cy in range(top, bottom + 1):
+                self._cells.setdefault((cx, cy), []).append(index)
+
+    # 返回与 rect 所在格子相同的矩形（候选），按插入顺序排列
+    def query(self, rect) -> List:
+        self._query_id += 1
+        query_id = self._query_id
+        marks = self._marks
+        cells = self._cells
+        found = []
+        left, top, right, bottom = self._cell_range(rect)
+        for cx in range(left, right + 1):
+            for cy in range(top, bottom + 1):
+                indices = cells.get((cx, cy))
+                if indices is None:
+                    continue
+                for index in indices:
+                    if marks[index] != query_id:
+                        marks[index] = query_id
+                        found.append(index)
+        if len(found) > 1:
+            found.sort()
+        rects = self.rects
+        return [rects[index] for index in found]
@@ -0,0 +1,59 @@
+import os
+import random
+import sys
+
+GAME_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, GAME_DIR)
+
+import pytest
+from hazards import HazardField
+
+pytest.importorskip("numpy")
+
+MOVE_PATTERNS = [None, "horizontal", "vertical"]
+
+
+# 用同一随机种子摆放障碍物，use_numpy 决定使用数组还是列表
+def make_field(use_numpy: bool, count: int = 200, seed: int = 0) -> HazardField:
+    rng = random.Random(seed)
+    field = HazardField(use_numpy)
+    for index in range(count):
+        rect = (rng.randrange(0, 760), rng.randrange(0, 560), rng.randrange(10, 60), rng.randrange(10, 60))
+        field.add(rect, f"obstacle_{index % 3 + 1}", None, rng.choice(MOVE_PATTERNS), rng.randrange(1, 6), rng.randrange(20, 200))
+    field.pack(min_hazards=0)
+    return field
+
+
+def test_numpy_and_list_backends_agree():
+    packed, plain = make_field(True), make_field(False)
+    assert packed._packed and not plain._packed
+    rng = random.Random(1)
+    for step in range(500):
+        packed.step()
+        plain.step()
+        box = (rng.randrange(-50, 800), rng.randrange(-50, 600), rng.randrange(1, 120), rng.randrange(1, 120))
+        hits = plain.overlapping(*box)
+        assert packed.overlapping(*box) == hits
+        # 推动和移除命中的障碍物，两种实现之后也要保持一致
+        if hits and step % 7 == 0:
+            assert packed.push(hits[0], 5) == plain.push(hits[0], 5)
+        if hits and step % 31 == 0:
+            packed.remove(hits[-1])
+            plain.remove(hits[-1])
+        assert [packed.position(i) for i in range(len(plain))] == [plain.position(i) for i in range(len(plain))]
+    assert [packed.is_alive(i) for i in range(len(plain))] == [plain.is_alive(i) for i in range(len(plain))]
+
+
+def test_add_after_pack_keeps_state():
+    packed, plain = make_field(True, 20), make_field(False, 20)
+    for _ in range(50):
+        packed.step()
+        plain.step()
+    for field in (packed, plain):
+        field.add((100, 100, 20, 20), "obstacle_1", None, "horizontal", 3, 60)
+        field.pack(min_hazards=0)
+    for _ in range(50):
+        packed.step()
+        plain.step()
+    assert [packed.position(i) for i in range(21)] == [plain.position(i) for i in range(21)]
+    assert packed.overlapping(0, 0, 800, 600) == plain.overlapping(0, 0, 800, 600)
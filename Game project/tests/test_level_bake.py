@@ -0,0 +1,76 @@
+import os
+import sys
+
+GAME_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, GAME_DIR)
+
+import pytest
+from level_bake import LevelGeometry, merge_solids, EMPTY
+
+WORLD = (60, 40)
+CELL = 10
+
+# 重叠、相接、十字交叉以及贴着格子边和世界边界的矩形
+LAYOUTS = {
+    "overlapping": [(5, 5, 20, 10), (15, 8, 20, 20), (30, 0, 10, 12)],
+    "touching": [(0, 30, 20, 10), (20, 30, 20, 10), (20, 20, 20, 10), (40, 20, 20, 10)],
+    "cross": [(20, 0, 10, 40), (0, 15, 60, 10)],
+    "cell_edges": [(9, 9, 2, 2), (30, 10, 10, 10), (49, 0, 11, 1), (59, 39, 1, 1)],
+}
+
+
+# 矩形并集覆盖的像素
+def pixels(rects):
+    return {(px, py) for x, y, w, h in rects for px in range(x, x + w) for py in range(y, y + h)}
+
+
+# 暴力判断：区域覆盖的每个格子里都没有任何平台像素
+def brute_region_empty(solid, x, y, w, h):
+    if x < 0 or y < 0 or x + w > WORLD[0] or y + h > WORLD[1]:
+        return False
+    left, top = x // CELL * CELL, y // CELL * CELL
+    right, bottom = ((x + w - 1) // CELL + 1) * CELL, ((y + h - 1) // CELL + 1) * CELL
+    return not any((px, py) in solid for px in range(left, right) for py in range(top, bottom))
+
+
+@pytest.mark.parametrize("name", sorted(LAYOUTS))
+def test_merge_solids_keeps_coverage(name):
+    rects = LAYOUTS[name]
+    merged = merge_solids(rects)
+    assert pixels(merged) == pixels(rects)
+    assert len(merged) <= len(set(rects))
+
+
+def test_merge_solids_joins_touching_rects():
+    assert merge_solids([(0, 0, 10, 10), (10, 0, 10, 10), (0, 10, 20, 5)]) == [(0, 0, 20, 15)]
+
+
+@pytest.mark.parametrize("name", sorted(LAYOUTS))
+def test_region_empty_matches_brute_force(name):
+    geometry = LevelGeometry(merge_solids(LAYOUTS[name]), cell_size=CELL, world_size=WORLD)
+    solid = pixels(LAYOUTS[name])
+    for w, h in ((1, 1), (3, 7), (10, 10), (11, 4)):
+        for x in range(-2, WORLD[0] - w + 3):
+            for y in range(-2, WORLD[1] - h + 3):
+                expected = brute_region_empty(solid, x, y, w, h)
+                assert geometry.region_empty(x, y, w, h) == expected, (x, y, w, h)
+                # 判为空的区域里一定没有平台
+                if expected:
+                    assert not any((px, py) in solid for px in range(x, x + w) for py in range(y, y + h))
+
+
+def test_solid_at_matches_rects():
+    rects = LAYOUTS["cell_edges"] + LAYOUTS["cross"]
+    geometry = LevelGeometry(merge_solids(rects), cell_size=CELL, world_size=WORLD)
+    solid = pixels(rects)
+    for x in range(WORLD[0]):
+        for y in range(WORLD[1]):
+            assert geometry.solid_at(x, y) == ((x, y) in solid)
+    assert not geometry.solid_at(-1, 0) and not geometry.solid_at(WORLD[0], 0)
+
+
+def test_empty_level_has_empty_bitmap():
+    geometry = LevelGeometry(merge_solids([]), cell_size=CELL, world_size=WORLD)
+    assert all(state == EMPTY for state in geometry.bitmap)
+    assert geometry.region_empty(0, 0, *WORLD)
+    assert not geometry.region_empty(-1, 0, 5, 5)
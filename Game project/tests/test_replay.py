@@ -0,0 +1,61 @@
+import os
+import sys
+
+GAME_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, GAME_DIR)
+
+import pytest
+from replay import Recording, ReplayError, HEADER
+from simulation import INPUT_LEFT, INPUT_RIGHT, INPUT_JUMP, INPUT_SKILL
+
+# 短游程、恰好 15/16 步的边界以及需要多字节 LEB128 的长游程
+SCRIPT = """level 7
+skin 皮肤3
+hz 60
+3 R
+15 RJ
+16 -
+200 L
+1 S
+20000 RJS
+"""
+
+
+def test_text_bytes_text_round_trip():
+    recording = Recording.from_text(SCRIPT)
+    assert recording.runs[-1] == (INPUT_RIGHT | INPUT_JUMP | INPUT_SKILL, 20000)
+    decoded = Recording.from_bytes(recording.to_bytes())
+    assert (decoded.level_num, decoded.skin_name, decoded.sim_hz) == (7, "皮肤3", 60)
+    assert decoded.runs == recording.runs
+    assert decoded.to_text() == SCRIPT
+
+
+def test_adjacent_equal_inputs_are_merged():
+    recording = Recording(0)
+    for inputs in [INPUT_LEFT] * 10 + [INPUT_LEFT] * 10 + [0]:
+        recording.append(inputs)
+    assert recording.runs == [(INPUT_LEFT, 20), (0, 1)]
+    assert list(Recording.from_bytes(recording.to_bytes()).inputs()) == list(recording.inputs())
+
+
+@pytest.mark.parametrize("cut", [1, HEADER.size, HEADER.size + 3, -1, -3])
+def test_truncated_bytes_raise_replay_error(cut):
+    data = Recording.from_text(SCRIPT).to_bytes()
+    with pytest.raises(ReplayError):
+        Recording.from_bytes(data[:cut])
+
+
+def test_skin_name_must_fit_and_decode():
+    data = bytearray(Recording(1, "ab").to_bytes())
+    data[HEADER.size] = 200
+    with pytest.raises(ReplayError):
+        Recording.from_bytes(bytes(data))
+    data = bytearray(Recording(1, "ab").to_bytes())
+    data[HEADER.size + 1] = 0xFF
+    with pytest.raises(ReplayError):
+        Recording.from_bytes(bytes(data))
+
+
+def test_bad_text_raises_replay_error():
+    with pytest.raises(ReplayError):
+        Recording.from_text("level 1\n10 X\n")
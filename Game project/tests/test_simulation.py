@@ -0,0 +1,79 @@
+import os
+import sys
+
+# 无窗口运行；资源路径相对于游戏目录
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+GAME_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, GAME_DIR)
+
+import pygame
+import pytest
+from category import Player, Platform, Goal
+from level import Level
+from simulation import World, INPUT_RIGHT, INPUT_SKILL, OUTCOME_GOAL
+
+
+@pytest.fixture
+def tutorial(monkeypatch):
+    monkeypatch.chdir(GAME_DIR)
+    pygame.init()
+    pygame.display.set_mode((1, 1))
+    level = Level(0)
+    world = World.from_level(level, Player(level.player_start_x, level.player_start_y))
+    yield level, world
+    pygame.quit()
+
+
+# 向右走若干步，返回玩家的最终位置
+def walk_right(world: World, steps: int = 60) -> int:
+    for _ in range(steps):
+        world.step(INPUT_RIGHT)
+    return world.player.box.x
+
+
+def test_platform_added_at_runtime_blocks_player(tutorial):
+    level, world = tutorial
+    level.add_platform(Platform(150, 450, 20, 100))
+    walk_right(world)
+    assert world.player.box.right == 150
+    assert world.solid_at(155, 500)
+
+
+def test_platform_removed_at_runtime_no_longer_blocks(tutorial):
+    level, world = tutorial
+    wall = Platform(150, 450, 20, 100)
+    level.add_platform(wall)
+    walk_right(world, 30)
+    level.remove_platform(wall)
+    assert walk_right(world, 30) > 150
+    assert not world.solid_at(155, 500)
+
+
+def test_goal_moved_at_runtime_ends_level(tutorial):
+    level, world = tutorial
+    box = world.player.box
+    level.set_goal(Goal(box.x, box.y))
+    world.step()
+    assert world.outcome == OUTCOME_GOAL
+
+
+def test_skill_rule_comes_from_skin_config(tutorial):
+    level, _ = tutorial
+    world = World.from_level(level, Player(level.player_start_x, level.player_start_y),
+                             skill={"duration": 2, "cooldown": 4, "immune": ["obstacle_1"]})
+    world.step(INPUT_SKILL)
+    assert world.skill_active and not world.skill_ready
+    world.step()
+    world.step()
+    assert not world.skill_active and not world.skill_ready
+    world.step()
+    assert not world.skill_ready
+    world.step()
+    assert world.skill_ready
+
+
+def test_skin_without_skill_cannot_activate(tutorial):
+    _, world = tutorial
+    world.step(INPUT_SKILL)
+    assert world.skill is None and world.skill_ready and "skill" not in world.events
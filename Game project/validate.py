@@ -0,0 +1,148 @@
+import os
+import argparse
+import json
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Dict, List, Optional
+
+from replay import Recording, ReplayError
+from simulation import World, SIM_HZ, OUTCOME_GOAL
+from level_bake import LEVEL_COUNT
+
+# 批量验证：每个 (关卡, 皮肤) 组合是一个独立任务，交给进程池并行运行，
+# 结果合并成一份 JSON 报告。总耗时约等于最慢的那个组合。
+
+SCRIPT_SUFFIXES = (".rpl", ".txt")
+
+
+# 无窗口、无声音运行：命令行入口和进程池的子进程在导入 pygame 之前调用，只影响当前进程
+def use_headless_drivers():
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+    os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")   # 标准输出只留给 JSON 报告
+
+
+# 查找 (关卡, 皮肤) 的输入脚本：先找按皮肤区分的，再找整关通用的
+def find_script(script_dir: Optional[str], level_num: int, skin_name: str) -> Optional[str]:
+    if not script_dir:
+        return None
+    for name in (f"level_{level_num}_{skin_name}", f"level_{level_num}"):
+        for suffix in SCRIPT_SUFFIXES:
+            path = os.path.join(script_dir, name + suffix)
+            if os.path.exists(path):
+                return path
+    return None
+
+
+# 单个组合的冒烟测试：建关卡、按皮肤生成玩家、喂入脚本输入，直到到达终点、死亡或超时。
+# 没有脚本时使用搜索器找到的最快路线。脚本用完后不再按键，继续运行到出现结局
+def validate_pair(level_num: int, skin_name: str, script_dir: Optional[str] = None) -> Dict:
+    start_time = time.perf_counter()
+    result = {"level": level_num, "skin": skin_name, "script": None}
+    try:
+        from level import Level
+        from category import Player
+
+        script = find_script(script_dir, level_num, skin_name)
+        if script:
+            recording = Recording.load(script)
+            result["script"] = script
+            if recording.sim_hz != SIM_HZ:
+                raise ReplayError(f"录像的模拟频率 {recording.sim_hz} 与游戏 {SIM_HZ} 不一致")
+        else:
+            from solver import solve_level
+            recording = solve_level(level_num, skin_name, verify=False, collect_coins=False).recording
+            result["script"] = "solver"
+        inputs = list(recording.inputs()) if recording else []
+
+        level = Level(level_num)
+        world = World.from_level(level, Player(level.player_start_x, level.player_start_y, skin_name))
+        limit = int(world.time_limit * world.sim_hz) + 1
+        while not world.outcome and world.tick < limit:
+            world.step(inputs[world.tick] if world.tick < len(inputs) else 0)
+
+        if world.outcome == OUTCOME_GOAL:
+            result["status"] = "goal"
+        elif world.outcome and world.death_cause == "timeout":
+            result["status"] = "timeout"
+        elif world.outcome:
+            result["status"] = "death"
+        else:
+            result["status"] = "timeout"
+        result.update({
+            "cause": world.death_cause,
+            "ticks": world.tick,
+            "script_ticks": len(inputs),
+            "game_time": round(world.game_time, 3),
+            "coins": world.coins_collected,
+            "total_coins": world.total_coins,
+        })
+    except (OSError, ReplayError, KeyError, ValueError) as e:
+        result["status"] = "error"
+        result["error"] = f"{type(e).__name__}: {e}"
+    result["seconds"] = round(time.perf_counter() - start_time, 3)
+    return result
+
+
+# 把所有组合分发到进程池，按完成顺序收集结果，最后按 (关卡, 皮肤) 排序合并
+def run_matrix(levels: List[int], skins: List[str], script_dir: Optional[str] = None, workers: Optional[int] = None) -> Dict:
+    start_time = time.perf_counter()
+    tasks = [(level_num, skin_name) for level_num in levels for skin_name in skins]
+    results = []
+    with ProcessPoolExecutor(max_workers=workers, initializer=use_headless_drivers) as pool:
+        futures = {pool.submit(validate_pair, level_num, skin_name, script_dir): (level_num, skin_name)
+                   for level_num, skin_name in tasks}
+        for future in as_completed(futures):
+            level_num, skin_name = futures[future]
+            try:
+                result = future.result()
+            except Exception as e:  # 子进程崩溃也要记录下来，不能让整批验证中断
+                result = {"level": level_num, "skin": skin_name, "status": "error", "error": f"{type(e).__name__}: {e}"}
+            print(f"第{result['level']}关 {result['skin']}: {result['status']}", file=sys.stderr)
+            results.append(result)
+
+    order = {skin_name: index for index, skin_name in enumerate(skins)}
+    results.sort(key=lambda r: (r["level"], order[r["skin"]]))
+    summary = {}
+    for result in results:
+        summary[result["status"]] = summary.get(result["status"], 0) + 1
+    return {
+        "levels": levels,
+        "skins": skins,
+        "workers": workers or os.cpu_count(),
+        "wall_seconds": round(time.perf_counter() - start_time, 3),
+        "slowest_seconds": max((r.get("seconds", 0) for r in results), default=0),
+        "summary": summary,
+        "results": results,
+    }
+
+
+# 命令行入口
+def main():
+    use_headless_drivers()
+    from category import Player
+
+    parser = argparse.ArgumentParser(description="批量验证所有关卡和皮肤")
+    parser.add_argument("--levels", nargs="+", type=int, help="要验证的关卡（默认全部）")
+    parser.add_argument("--skins", nargs="+", help="要验证的皮肤（默认全部）")
+    parser.add_argument("--scripts", help="输入脚本目录（level_N_皮肤.rpl/.txt 或 level_N.rpl/.txt），缺少脚本的组合使用搜索器的路线")
+    parser.add_argument("--workers", type=int, help="进程数（默认 CPU 核数）")
+    parser.add_argument("--output", help="报告输出文件（默认打印到标准输出）")
+    args = parser.parse_args()
+
+    report = run_matrix(args.levels or list(range(LEVEL_COUNT)), args.skins or list(Player.SKIN_PATHS),
+                        args.scripts, args.workers)
+    text = json.dumps(report, ensure_ascii=False, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(text + "\n")
+    else:
+        print(text)
+    print(f"共 {len(report['results'])} 个组合, 耗时 {report['wall_seconds']:.2f}秒, 最慢单项 {report['slowest_seconds']:.2f}秒",
+          file=sys.stderr)
+    sys.exit(0 if report["summary"].get("goal", 0) == len(report["results"]) else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,122 @@
+import pygame
+from typing import Dict, List, Optional, Tuple
+from category import WHITE, GREEN, BLUE
+
+# 按钮的三种状态
+NORMAL = "normal"
+HOVER = "hover"
+PRESSED = "pressed"
+STATES = (NORMAL, HOVER, PRESSED)
+
+
+# 按钮外观：每种状态的主体、边框、文字和阴影颜色
+class ButtonStyle:
+    def __init__(self, states: Dict[str, Dict], radius: int = 0, border_width: int = 2, shadow_offset: int = 0):
+        self.states = states
+        self.radius = radius
+        self.border_width = border_width
+        self.shadow_offset = shadow_offset
+
+
+# 主菜单的圆角按钮（阴影画在显示表面上时不透明，这里直接使用不透明颜色，外观与原来一致）
+ROUNDED_STYLE = ButtonStyle({
+    NORMAL: {"body": (50, 120, 220), "border": (220, 220, 220), "text": WHITE, "shadow": (0, 0, 0)},
+    HOVER: {"body": (70, 140, 240), "border": WHITE, "text": WHITE, "shadow": (0, 0, 0)},
+    PRESSED: {"body": (40, 110, 200), "border": WHITE, "text": (230, 230, 230), "shadow": (0, 0, 0)},
+}, radius=12, shadow_offset=3)
+
+# 暂停和结算界面的方形按钮：平时绿色，悬停和按下时蓝色
+FLAT_STYLE = ButtonStyle({
+    NORMAL: {"body": GREEN, "border": WHITE, "text": WHITE},
+    HOVER: {"body": BLUE, "border": WHITE, "text": WHITE},
+    PRESSED: {"body": BLUE, "border": WHITE, "text": WHITE},
+})
+
+
+# 按钮：三种状态的图片在创建时画好，之后每次绘制只是一次 blit
+class Button:
+    def __init__(self, text: str, font: pygame.font.Font, rect: pygame.Rect, style: ButtonStyle = FLAT_STYLE, action=None):
+        self.text = text
+        self.rect = pygame.Rect(rect)
+        self.style = style
+        self.action = action
+        offset = style.shadow_offset
+        self.area = pygame.Rect(self.rect.x, self.rect.y, self.rect.width + offset, self.rect.height + offset)
+        self.images = {state: self._render(font, style.states[state]) for state in STATES}
+
+    def _render(self, font: pygame.font.Font, colors: Dict) -> pygame.Surface:
+        style = self.style
+        image = pygame.Surface(self.area.size, pygame.SRCALPHA)
+        body = pygame.Rect(0, 0, self.rect.width, self.rect.height)
+        if style.shadow_offset and colors.get("shadow"):
+            pygame.draw.rect(image, colors["shadow"], body.move(style.shadow_offset, style.shadow_offset), border_radius=style.radius)
+        pygame.draw.rect(image, colors["body"], body, border_radius=style.radius)
+        pygame.draw.rect(image, colors["border"], body, style.border_width, border_radius=style.radius)
+        text = font.render(self.text, True, colors["text"])
+        image.blit(text, text.get_rect(center=body.center))
+        return image
+
+    # 按鼠标位置和左键状态得到按钮状态
+    def state_at(self, mouse_pos: Tuple[int, int], mouse_down: bool) -> str:
+        if not self.rect.collidepoint(mouse_pos):
+            return NORMAL
+        return PRESSED if mouse_down else HOVER
+
+    def draw(self, surface: pygame.Surface, state: str = NORMAL) -> pygame.Rect:
+        return surface.blit(self.images[state], self.area)
+
+
+# 一列竖直居中排列的按钮
+def button_column(items: List[Tuple[str, int, object]], font: pygame.font.Font, size: Tuple[int, int],
+                  screen_width: int, style: ButtonStyle = FLAT_STYLE) -> List[Button]:
+    width, height = size
+    return [Button(text, font, pygame.Rect((screen_width - width) // 2, y, width, height), style, action)
+            for text, y, action in items]
+
+
+# 半透明的整屏遮罩，按 (尺寸, 颜色) 缓存
+_overlays: Dict[Tuple, pygame.Surface] = {}
+
+
+def dim_overlay(size: Tuple[int, int], color=(0, 0, 0, 180)) -> pygame.Surface:
+    key = (tuple(size), tuple(color))
+    overlay = _overlays.get(key)
+    if overlay is None:
+        overlay = pygame.Surface(size, pygame.SRCALPHA)
+        overlay.fill(color)
+        _overlays[key] = overlay
+    return overlay
+
+
+# 按钮菜单：背景、标题等不变的部分预先合成一张底图；只有按钮状态改变时才重画那几个按钮，
+# 没有变化的帧不绘制也不提交画面
+class ButtonMenu:
+    def __init__(self, frame: pygame.Surface, buttons: List[Button]):
+        self.frame = frame
+        self.buttons = buttons
+        self._states = None     # 上次绘制时各按钮的状态，None 表示需要整屏重画
+
+    # 下次更新时整屏重画（例如窗口被遮挡后重新显示）
+    def invalidate(self):
+        self._states = None
+
+    # 按当前鼠标状态绘制有变化的部分，返回被按下的按钮（没有时为 None）
+    def update(self, surface: pygame.Surface, mouse_pos: Tuple[int, int], mouse_down: bool) -> Optional[Button]:
+        states = [button.state_at(mouse_pos, mouse_down) for button in self.buttons]
+        if self._states is None:
+            surface.blit(self.frame, (0, 0))
+            for button, state in zip(self.buttons, states):
+                button.draw(surface, state)
+            pygame.display.flip()
+        elif states != self._states:
+            dirty = []
+            for button, state, previous in zip(self.buttons, states, self._states):
+                if state != previous:
+                    surface.blit(self.frame, button.area, button.area)
+                    dirty.append(button.draw(surface, state))
+            pygame.display.update(dirty)
+        self._states = states
+        for button, state in zip(self.buttons, states):
+            if state == PRESSED:
+                return button
+        return None